@@ -0,0 +1,223 @@
+# benchmark.py
+"""Benchmark crawler throughput, phase latency and memory against the local fixture server"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from fixture_server import FixtureServer
+from insta_crawler.metrics import METRICS
+
+# Phases shown in the per-run latency table, in crawl order
+REPORT_PHASES = ('driver_startup', 'login', 'check_login', 'search_profile', 'page_load',
+                 'extract_profile', 'crawl_profile', 'http_fetch')
+
+class PeakRssSampler:
+    """Track the peak memory of this process and its children (Chrome) in a thread"""
+
+    def __init__(self, interval=0.2):
+        from insta_crawler.driver_pool import process_tree_rss
+
+        self.interval = interval
+        self.sample = lambda: process_tree_rss(os.getpid())
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while True:
+            rss = self.sample()
+            if rss is not None:
+                self.peak = max(self.peak or 0.0, rss)
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+def measure(setup, crawl, teardown=None):
+    """Run one benchmark and return its report
+
+    setup() builds the crawler (not timed, but its memory counts), crawl(state)
+    returns the profile dicts, teardown(state) cleans up.
+    """
+    METRICS.reset()
+    with PeakRssSampler() as sampler:
+        state = setup()
+        try:
+            start = time.perf_counter()
+            crawled = sum(1 for profile_info in crawl(state) if profile_info)
+            elapsed = time.perf_counter() - start
+        finally:
+            if teardown:
+                teardown(state)
+
+    phases = METRICS.summary()['phases']
+    return {
+        'crawled': crawled,
+        'elapsed': elapsed,
+        'rate': crawled / elapsed if elapsed else 0.0,
+        'peak_rss_mb': sampler.peak,
+        'phases': {phase: phases[phase] for phase in REPORT_PHASES if phase in phases},
+    }
+
+def print_report(label, report, baseline=None):
+    """Print throughput, speedup, peak RSS and phase percentiles for one run"""
+    speedup = report['rate'] / baseline if baseline else 1.0
+    rss = f"{report['peak_rss_mb']:.0f} MB" if report['peak_rss_mb'] is not None else "n/a"
+    print(f"  {label:<12} {report['rate']:8.2f} profiles/s  speedup x{speedup:.2f}  peak RSS {rss}")
+    for phase, stats in report['phases'].items():
+        print(f"    {phase:<16} p50 {stats['p50'] * 1000:7.1f} ms  p95 {stats['p95'] * 1000:7.1f} ms"
+              f"  p99 {stats['p99'] * 1000:7.1f} ms  n={stats['count']}")
+
+def bench_single(server_url, usernames, timeout):
+    """One browser crawling profiles one after another"""
+    from insta_crawler.crawler import InstagramCrawler
+
+    return measure(lambda: InstagramCrawler(timeout=timeout, base_url=server_url),
+                   lambda crawler: (info for _, info in crawler.crawl_profiles(usernames)),
+                   lambda crawler: crawler.close())
+
+def bench_pool(server_url, usernames, workers, timeout):
+    """Crawl usernames with a CrawlerPool of the given size"""
+    from insta_crawler.crawler_pool import CrawlerPool
+
+    def setup():
+        pool = CrawlerPool(workers=workers, timeout=timeout, base_url=server_url)
+        pool.start()
+        return pool
+
+    return measure(setup, lambda pool: pool.crawl(usernames), lambda pool: pool.close())
+
+def bench_tabs(server_url, usernames, tabs, timeout):
+    """Crawl usernames with one browser and the given number of tabs"""
+    from insta_crawler.crawler import InstagramCrawler
+
+    def crawl(crawler):
+        if tabs > 1:
+            results = crawler.crawl_profiles_in_tabs(usernames, tabs=tabs)
+        else:
+            results = crawler.crawl_profiles(usernames)
+        return (info for _, info in results)
+
+    return measure(lambda: InstagramCrawler(timeout=timeout, base_url=server_url,
+                                            page_load_strategy='none'),
+                   crawl, lambda crawler: crawler.close())
+
+def bench_async(server_url, usernames, browsers, timeout):
+    """Crawl usernames with the asyncio front end and up to browsers browsers"""
+    from insta_crawler.async_crawler import crawl_profiles
+
+    return measure(lambda: None,
+                   lambda _: (info for _, info in crawl_profiles(
+                       usernames, base_url=server_url, timeout=timeout, max_browsers=browsers)))
+
+def bench_http(server_url, usernames, timeout):
+    """Fetch usernames over the HTTP fast path only"""
+    from insta_crawler.http_fetcher import ProfileFetcher
+
+    return measure(lambda: ProfileFetcher(base_url=server_url, timeout=timeout,
+                                          use_browser_fallback=False),
+                   lambda fetcher: (info for _, info in fetcher.crawl_profiles(usernames)),
+                   lambda fetcher: fetcher.close())
+
+def run_scaling(mode, counts, profiles, latency, timeout):
+    """Report how a mode scales with its worker/tab/browser count"""
+    bench = {'pool': bench_pool, 'tabs': bench_tabs, 'async': bench_async}[mode]
+    usernames = [f"fixture_user_{index}" for index in range(profiles)]
+
+    print(f"📈 {mode} scaling: {profiles} profiles, {latency * 1000:.0f} ms server latency")
+    reports = {}
+    with FixtureServer(latency=latency) as server:
+        baseline = None
+        for count in counts:
+            report = bench(server.url, usernames, count, timeout)
+            baseline = baseline or report['rate']
+            print_report(f"{mode}={count}", report, baseline)
+            reports[f"{mode}={count}"] = report
+    return reports
+
+def run_single(mode, profiles, latency, timeout):
+    """Report a mode that has no concurrency knob"""
+    bench = {'single': bench_single, 'http': bench_http}[mode]
+    usernames = [f"fixture_user_{index}" for index in range(profiles)]
+
+    print(f"⚡ {mode}: {profiles} profiles, {latency * 1000:.0f} ms server latency")
+    with FixtureServer(latency=latency) as server:
+        report = bench(server.url, usernames, timeout)
+    print_report(mode, report)
+    return {mode: report}
+
+# Times cli.main in a fresh interpreter and writes the seconds to stderr
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+from insta_crawler from insta_crawler import cli
+try:
+    cli.main(sys.argv[1:])
+except SystemExit:
+    pass
+sys.stderr.write(repr(time.perf_counter() - start))
+"""
+
+def run_imports(repeat=5):
+    """Report the start-up cost of each CLI subcommand ('<command> --help' in a fresh interpreter)"""
+    from insta_crawler.cli import COMMANDS
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    def median_startup(args):
+        samples = []
+        for _ in range(repeat):
+            result = subprocess.run([sys.executable, "-c", IMPORT_PROBE, *args], cwd=here,
+                                    capture_output=True, text=True, check=False)
+            samples.append(float(result.stderr.strip().splitlines()[-1]))
+        return statistics.median(samples)
+
+    print(f"⏱️ Subcommand start-up ('--help'), median of {repeat} runs")
+    reports = {}
+    for command in ["", *COMMANDS]:
+        elapsed = median_startup([command, "--help"] if command else ["--help"])
+        print(f"  {command or '(top level)':<14} {elapsed * 1000:7.1f} ms")
+        reports[f"import:{command or 'top'}"] = {'elapsed': elapsed}
+    return reports
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawler benchmarks against a local fixture site")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="pool sizes, tab counts or async browser counts to compare")
+    parser.add_argument("--profiles", type=int, default=40, help="profiles per run")
+    parser.add_argument("--latency", type=float, default=0.2,
+                        help="fixture response latency in seconds")
+    parser.add_argument("--timeout", type=float, default=10, help="crawler wait budget")
+    parser.add_argument("--mode", nargs="+",
+                        choices=["single", "pool", "tabs", "async", "http", "imports"],
+                        default=["pool"], help="crawler modes to benchmark ('imports': CLI start-up)")
+    parser.add_argument("--json", help="also write every report here, for comparing runs")
+    args = parser.parse_args(argv)
+
+    reports = {}
+    for mode in args.mode:
+        if mode == "imports":
+            reports.update(run_imports())
+        elif mode in ("single", "http"):
+            reports.update(run_single(mode, args.profiles, args.latency, args.timeout))
+        else:
+            reports.update(run_scaling(mode, args.workers, args.profiles, args.latency, args.timeout))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump(reports, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+# conftest.py
+"""Shared test fixtures"""
+
+import pytest
+
+class FakeClock:
+    """Manually advanced clock; sleeping just moves time forward
+
+    Pass clock.time (or the clock itself) where a time.time-like callable
+    is expected, and clock.sleep for time.sleep.
+    """
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    __call__ = time
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
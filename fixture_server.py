@@ -0,0 +1,590 @@
+# fixture_server.py
+"""Local HTTP server with canned Instagram-like pages for offline crawler runs"""
+
+import argparse
+import base64
+import hashlib
+import html
+import json
+import os
+import secrets
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+SEARCH_BOX = """
+<nav>
+  <input placeholder="Search" aria-label="Search input">
+  <div id="search-results"></div>
+</nav>
+<script>
+  document.querySelector("input[placeholder='Search']").addEventListener("input", function (event) {
+    var name = event.target.value.trim();
+    document.getElementById("search-results").innerHTML =
+      name ? '<a href="/' + name + '/">' + name + '</a>' : "";
+  });
+</script>
+"""
+
+HOME_PAGE = """<!DOCTYPE html>
+<html><head><title>Instagram</title></head>
+<body>{search_box}<main><svg aria-label="Home"></svg></main>{prompt}</body></html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Login - Instagram</title></head>
+<body><main>
+  <form method="post" action="/accounts/login/">
+    <input name="username" aria-label="Phone number, username, or email">
+    <input name="password" type="password" aria-label="Password">
+    <button type="submit">Log in</button>
+  </form>
+  {error}
+</main></body></html>
+"""
+
+LOGIN_ERROR = '<p data-testid="login-error-message">Sorry, your password was incorrect.</p>'
+
+CHALLENGE_PAGE = """<!DOCTYPE html>
+<html><head><title>Enter Security Code - Instagram</title></head>
+<body><main>
+  <form method="post" action="/challenge/">
+    <input name="verificationCode" inputmode="numeric" aria-label="Security Code">
+    <button type="submit">Confirm</button>
+  </form>
+  {error}
+</main></body></html>
+"""
+
+CHALLENGE_ERROR = '<div role="alert">Please check the security code and try again.</div>'
+
+# "Save your login info?" prompt shown after a successful login
+SAVE_LOGIN_PAGE = """<!DOCTYPE html>
+<html><head><title>Instagram</title></head>
+<body>{search_box}<main>
+  <svg aria-label="Home"></svg>
+  <h2>Save your login info?</h2>
+  <form method="get" action="/"><input type="hidden" name="prompt" value="notifications">
+    <button type="submit">Save Info</button></form>
+  <form method="get" action="/"><input type="hidden" name="prompt" value="notifications">
+    <button type="submit">Not Now</button></form>
+</main></body></html>
+"""
+
+NOTIFICATIONS_PROMPT = """
+<div role="dialog" aria-label="Turn on Notifications">
+  <h2>Turn on Notifications</h2>
+  <form method="get" action="/"><button type="submit">Turn On</button></form>
+  <form method="get" action="/"><button type="submit">Not Now</button></form>
+</div>
+"""
+
+PROFILE_PAGE = """<!DOCTYPE html>
+<html><head><title>{full_name} (@{username})</title>
+<meta property="og:description" content="{followers} Followers, {following} Following, {posts} Posts - See Instagram photos and videos from {full_name} (@{username})">
+<meta name="description" content="{followers} Followers, {following} Following, {posts} Posts - {full_name} (@{username}) on Instagram: &quot;{bio}&quot;">
+</head>
+<body>{search_box}
+<main>
+  <header>
+    <img src="/static/{username}.jpg?efg=fixture" alt="{username}'s profile picture">
+    <h2>{username}</h2>
+    <h1>{full_name}</h1>
+    <ul>
+      <li><a href="/{username}/"><span>{posts}</span> posts</a></li>
+      <li><a href="/{username}/followers/"><span>{followers}</span> followers</a></li>
+      <li><a href="/{username}/following/"><span>{following}</span> following</a></li>
+    </ul>
+    <div class="_aa_c"><span>{bio}</span></div>
+    <a href="https://example.com/{username}" rel="me nofollow noopener">example.com/{username}</a>
+  </header>
+</main>
+<script>fetch("/api/v1/users/web_profile_info/?username={username}");</script>
+</body></html>
+"""
+
+NOT_FOUND_PAGE = """<!DOCTYPE html>
+<html><head><title>Page Not Found</title></head>
+<body>{search_box}<main><h2>Sorry, this page isn't available.</h2></main></body></html>
+"""
+
+FOLLOW_DIALOG = """
+<div role="dialog" aria-label="{kind}" data-username="{username}" data-kind="{kind}" data-total="{total}">
+  <h2>{kind}</h2>
+  <div class="follow-list" style="height: 400px; overflow-y: auto;">
+    <div class="follow-rows" style="position: relative;"></div>
+  </div>
+</div>
+"""
+
+# Virtualised list like Instagram's: only rows near the viewport are in the
+# DOM, and further pages are fetched from the API when scrolled near the end
+FOLLOW_DIALOG_SCRIPT = """
+<script>
+(function () {
+  var ROW_HEIGHT = 50, OVERSCAN = 5;
+  var dialog = document.querySelector("div[role='dialog'][data-kind]");
+  var scroller = dialog.querySelector(".follow-list");
+  var rows = scroller.firstElementChild;
+  var total = parseInt(dialog.dataset.total, 10);
+  var handles = [], rendered = {}, loading = false;
+
+  function render() {
+    rows.style.height = handles.length * ROW_HEIGHT + "px";
+    var first = Math.max(0, Math.floor(scroller.scrollTop / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(handles.length,
+                        Math.ceil((scroller.scrollTop + scroller.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+    Object.keys(rendered).forEach(function (key) {
+      if (key < first || key >= last) {
+        rows.removeChild(rendered[key]);
+        delete rendered[key];
+      }
+    });
+    for (var i = first; i < last; i++) {
+      if (!rendered[i]) {
+        var row = document.createElement("div");
+        row.style.cssText = "position: absolute; top: " + i * ROW_HEIGHT + "px; height: " + ROW_HEIGHT + "px";
+        row.innerHTML = '<a href="/' + handles[i] + '/">' + handles[i] + '</a>';
+        rows.appendChild(row);
+        rendered[i] = row;
+      }
+    }
+  }
+
+  function loadMore() {
+    if (loading || handles.length >= total) {
+      return;
+    }
+    loading = true;
+    fetch("/api/v1/friendships/" + dialog.dataset.username + "/" + dialog.dataset.kind +
+          "/?max_id=" + handles.length)
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        handles = handles.concat(data.users.map(function (user) { return user.username; }));
+        loading = false;
+        render();
+      });
+  }
+
+  scroller.addEventListener("scroll", function () {
+    render();
+    if (scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight - ROW_HEIGHT * 3) {
+      loadMore();
+    }
+  });
+  loadMore();
+})();
+</script>
+"""
+
+# Rows returned per follower/following API page
+FOLLOW_PAGE_SIZE = 24
+
+# Profile post grid, filled from the feed API like the follower dialog
+POST_GRID = """
+<div class="post-grid" data-username="{username}" data-total="{total}" style="position: relative;"></div>
+"""
+
+# Virtualised grid like Instagram's: rows of three tiles, only rows near the
+# viewport are in the DOM (a row is rebuilt when it gains tiles), and more
+# posts are fetched from the feed API when the page is scrolled near the end
+POST_GRID_SCRIPT = """
+<script>
+(function () {
+  var ROW_HEIGHT = 300, COLUMNS = 3, OVERSCAN = 1;
+  var grid = document.querySelector(".post-grid");
+  var total = parseInt(grid.dataset.total, 10);
+  var posts = [], rendered = {}, loading = false;
+
+  function tile(post) {
+    var link = document.createElement("a");
+    link.href = "/p/" + post.code + "/";
+    link.style.cssText = "display: inline-block; width: 33%; height: " + ROW_HEIGHT + "px";
+    var image = document.createElement("img");
+    image.alt = post.caption.text;
+    link.appendChild(image);
+    var time = document.createElement("time");
+    time.setAttribute("datetime", new Date(post.taken_at * 1000).toISOString());
+    link.appendChild(time);
+    link.insertAdjacentHTML("beforeend", "<ul><li><span>" + post.like_count + "</span></li><li><span>" +
+                            post.comment_count + "</span></li></ul>");
+    return link;
+  }
+
+  function render() {
+    var rowCount = Math.ceil(posts.length / COLUMNS);
+    grid.style.height = rowCount * ROW_HEIGHT + "px";
+    var top = window.scrollY - grid.offsetTop;
+    var first = Math.max(0, Math.floor(top / ROW_HEIGHT) - OVERSCAN);
+    var last = Math.min(rowCount, Math.ceil((top + window.innerHeight) / ROW_HEIGHT) + OVERSCAN);
+    Object.keys(rendered).forEach(function (key) {
+      var tiles = Math.min(COLUMNS, posts.length - key * COLUMNS);
+      if (key < first || key >= last || rendered[key].childNodes.length !== tiles) {
+        grid.removeChild(rendered[key]);
+        delete rendered[key];
+      }
+    });
+    for (var i = first; i < last; i++) {
+      if (!rendered[i]) {
+        var row = document.createElement("div");
+        row.style.cssText = "position: absolute; width: 100%; top: " + i * ROW_HEIGHT + "px";
+        posts.slice(i * COLUMNS, (i + 1) * COLUMNS).forEach(function (post) { row.appendChild(tile(post)); });
+        grid.appendChild(row);
+        rendered[i] = row;
+      }
+    }
+  }
+
+  function loadMore() {
+    if (loading || posts.length >= total) {
+      return;
+    }
+    loading = true;
+    fetch("/api/v1/feed/user/" + grid.dataset.username + "/?max_id=" + posts.length)
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        posts = posts.concat(data.items);
+        loading = false;
+        render();
+      });
+  }
+
+  window.addEventListener("scroll", function () {
+    render();
+    if (window.scrollY + window.innerHeight >= document.documentElement.scrollHeight - ROW_HEIGHT * 2) {
+      loadMore();
+    }
+  });
+  loadMore();
+})();
+</script>
+"""
+
+# Posts returned per feed API page
+POST_PAGE_SIZE = 12
+
+# Taken-at time of a fixture profile's newest post (2025-01-01 UTC); each
+# older post is six hours earlier, pinned posts are a year older still
+POSTS_EPOCH = 1735689600
+
+def count_value(text):
+    """Turn a fixture count string like "61,510" into an int"""
+    return int(text.replace(',', ''))
+
+def profile_json(profile):
+    """Render a profile in the shape of the web_profile_info API response"""
+    return json.dumps({'data': {'user': {
+        'username': profile['username'],
+        'full_name': profile['full_name'],
+        'biography': profile['bio'],
+        'external_url': f"https://example.com/{profile['username']}",
+        'profile_pic_url': f"/static/{profile['username']}.jpg?efg=fixture",
+        'edge_owner_to_timeline_media': {'count': count_value(profile['posts'])},
+        'edge_followed_by': {'count': count_value(profile['followers'])},
+        'edge_follow': {'count': count_value(profile['following'])},
+    }}})
+
+def make_profile(username):
+    """Build deterministic profile data for a username"""
+    seed = sum(ord(char) for char in username)
+    return {
+        'username': username,
+        'full_name': username.replace('_', ' ').title(),
+        'posts': str(seed % 900 + 10),
+        'followers': f"{seed % 90 + 1},{seed % 1000:03d}",
+        'following': str(seed % 700 + 5),
+        'bio': f"Fixture bio for {username}",
+    }
+
+def follow_json(username, kind, start, total):
+    """Render one page of a follower/following list like the friendships API"""
+    end = min(start + FOLLOW_PAGE_SIZE, total)
+    users = [{'username': f"{username}_{kind}_{index}"} for index in range(start, end)]
+    return json.dumps({'users': users, 'next_max_id': str(end) if end < total else None})
+
+def fixture_post(username, index, pinned=0):
+    """Post index of a profile's grid, in the shape of a v1 feed API item
+
+    The first pinned posts are old ones pinned above the newer posts.
+    """
+    if index < pinned:
+        code, taken_at = f"{username}_pin_{index}", POSTS_EPOCH - (365 + index) * 86400
+    else:
+        number = index - pinned
+        code, taken_at = f"{username}_{number}", POSTS_EPOCH - number * 6 * 3600
+    return {'code': code, 'taken_at': taken_at, 'caption': {'text': f"Post {code}"},
+            'like_count': 100 + index, 'comment_count': index, 'product_type': 'feed'}
+
+def feed_json(username, start, total, pinned=0):
+    """Render one page of a profile's posts like the user feed API"""
+    end = min(start + POST_PAGE_SIZE, total)
+    items = [fixture_post(username, index, pinned) for index in range(start, end)]
+    return json.dumps({'items': items, 'more_available': end < total,
+                       'next_max_id': str(end) if end < total else None})
+
+def cassette_name(method, path):
+    """File name a recorded response is stored under"""
+    return hashlib.sha1(f"{method} {path}".encode('utf-8')).hexdigest() + ".json"
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve canned home, login, challenge, profile, dialog and not-found pages"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_page(self, status, body, content_type="text/html; charset=utf-8", headers=()):
+        data = body.encode('utf-8') if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def redirect(self, location, headers=()):
+        self.send_page(302, "", headers=(("Location", location), *headers))
+
+    def read_form(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        return {key: values[0] for key, values in form.items()}
+
+    def replay(self, method):
+        """Serve a recorded response if there is one; returns True if it did"""
+        cassette = self.server.cassette
+        if not cassette:
+            return False
+        if self.server.record_from:
+            self.record(method)
+            return True
+
+        try:
+            with open(os.path.join(cassette, cassette_name(method, self.path)), encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return False
+        body = base64.b64decode(entry['body']) if entry.get('base64') else entry['body']
+        self.send_page(entry['status'], body, entry['content_type'])
+        return True
+
+    def record(self, method):
+        """Proxy the request to the upstream site and save the response"""
+        server = self.server
+        request = urllib.request.Request(server.record_from.rstrip('/') + self.path, method=method)
+        for name in ('User-Agent', 'Accept', 'Accept-Language', 'Cookie', 'X-IG-App-ID'):
+            if self.headers.get(name):
+                request.add_header(name, self.headers[name])
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                status, content_type, data = response.status, response.headers.get('Content-Type', ''), response.read()
+        except urllib.error.HTTPError as e:
+            status, content_type, data = e.code, e.headers.get('Content-Type', ''), e.read()
+
+        entry = {'method': method, 'path': self.path, 'status': status, 'content_type': content_type}
+        try:
+            entry['body'] = data.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body'], entry['base64'] = base64.b64encode(data).decode('ascii'), True
+        os.makedirs(server.cassette, exist_ok=True)
+        with open(os.path.join(server.cassette, cassette_name(method, self.path)), 'w', encoding='utf-8') as file:
+            json.dump(entry, file, ensure_ascii=False, indent=2)
+        self.send_page(status, data, content_type or "application/octet-stream")
+
+    def do_POST(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        path = self.path.partition('?')[0].strip('/')
+        if path == "accounts/login":
+            form = self.read_form()
+            username = form.get('username', '')
+            if not username or server.accounts.get(username) != form.get('password'):
+                self.send_page(200, LOGIN_PAGE.format(error=LOGIN_ERROR))
+                return
+            cookie = ("Set-Cookie", f"sessionid={secrets.token_hex(16)}; Path=/; Max-Age=86400")
+            if username in server.challenge_users:
+                self.redirect("/challenge/", (cookie,))
+            else:
+                self.redirect("/accounts/onetap/", (cookie,))
+            return
+
+        if path == "challenge":
+            if self.read_form().get('verificationCode') == server.verification_code:
+                self.redirect("/accounts/onetap/")
+            else:
+                self.send_page(200, CHALLENGE_PAGE.format(error=CHALLENGE_ERROR))
+            return
+
+        self.send_page(404, NOT_FOUND_PAGE.format(search_box=SEARCH_BOX))
+
+    def do_GET(self):
+        server = self.server
+        server.requested.append(self.path)
+        if server.latency:
+            time.sleep(server.latency)
+        if self.replay('GET'):
+            return
+
+        path, _, query = self.path.partition('?')
+        path = path.strip('/')
+        params = parse_qs(query)
+        if not path:
+            prompt = NOTIFICATIONS_PROMPT if params.get('prompt') == ['notifications'] else ""
+            self.send_page(200, HOME_PAGE.format(search_box=SEARCH_BOX, prompt=prompt))
+            return
+
+        if path == "accounts/login":
+            self.send_page(200, LOGIN_PAGE.format(error=""))
+            return
+        if path == "challenge":
+            self.send_page(200, CHALLENGE_PAGE.format(error=""))
+            return
+        if path == "accounts/onetap":
+            self.send_page(200, SAVE_LOGIN_PAGE.format(search_box=SEARCH_BOX))
+            return
+
+        if path.startswith("api/v1/friendships/"):
+            parts = path.split('/')
+            if len(parts) < 5 or parts[3] in server.missing:
+                self.send_page(404, '{"status": "fail"}', "application/json")
+            else:
+                start = int(params.get('max_id', ['0'])[0] or 0)
+                body = follow_json(parts[3], parts[4], start, server.follow_count)
+                self.send_page(200, body, "application/json")
+            return
+
+        if path.startswith("api/v1/feed/user/"):
+            username = path.split('/')[4] if path.count('/') >= 4 else ''
+            if not username or username in server.missing:
+                self.send_page(404, '{"status": "fail"}', "application/json")
+            else:
+                start = int(params.get('max_id', ['0'])[0] or 0)
+                body = feed_json(username, start, server.post_count, server.pinned_posts)
+                self.send_page(200, body, "application/json")
+            return
+
+        if path == "api/v1/users/web_profile_info":
+            username = parse_qs(query).get('username', [''])[0]
+            if not username or username in server.missing:
+                self.send_page(404, '{"status": "fail"}', "application/json")
+            else:
+                profile = server.profiles.get(username) or make_profile(username)
+                self.send_page(200, profile_json(profile), "application/json")
+            return
+
+        if path.startswith("static/"):
+            self.send_page(200, b"", "image/jpeg")
+            return
+
+        username = path.split('/', 1)[0]
+        if username in server.missing:
+            self.send_page(404, NOT_FOUND_PAGE.format(search_box=SEARCH_BOX))
+            return
+
+        profile = server.profiles.get(username) or make_profile(username)
+        fields = {key: html.escape(value) for key, value in profile.items()}
+        page = PROFILE_PAGE.format(search_box=SEARCH_BOX, **fields)
+        if server.post_count:
+            grid = POST_GRID.format(username=html.escape(username), total=server.post_count)
+            page = page.replace("</main>", grid + "</main>").replace("</body>", POST_GRID_SCRIPT + "</body>")
+
+        kind = path.split('/')[1] if '/' in path else ''
+        if kind in ('followers', 'following'):
+            dialog = FOLLOW_DIALOG.format(username=username, kind=kind, total=server.follow_count)
+            page = page.replace("</body>", dialog + FOLLOW_DIALOG_SCRIPT + "</body>")
+        self.send_page(200, page)
+
+class FixtureServer:
+    """Threaded fixture server running in the background
+
+    latency adds a fixed delay (seconds) to every response; usernames in
+    missing get the not-found page, every other name gets a generated
+    profile unless one is given in profiles. accounts maps usernames to
+    passwords the login form accepts; users in challenge_users must then
+    enter verification_code. Follower and following dialogs list
+    follow_count generated handles. Profile pages have a grid of
+    post_count generated posts, the first pinned_posts of them pinned.
+
+    With cassette set to a directory, GET responses recorded there are
+    replayed and anything not recorded falls back to the canned pages.
+    Adding record_from (e.g. the real site) proxies every GET to it once
+    and records the responses into the cassette instead.
+
+    requested lists the path of every GET, so tests can check what the
+    browser actually fetched.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, profiles=None, missing=(),
+                 accounts=None, challenge_users=(), verification_code="123456",
+                 follow_count=200, post_count=30, pinned_posts=2, cassette=None, record_from=None):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency
+        self.httpd.profiles = dict(profiles or {})
+        self.httpd.missing = set(missing)
+        self.httpd.accounts = dict(accounts if accounts is not None else {'fixture_user': 'fixture_pass'})
+        self.httpd.challenge_users = set(challenge_users)
+        self.httpd.verification_code = verification_code
+        self.httpd.follow_count = follow_count
+        self.httpd.post_count = post_count
+        self.httpd.pinned_posts = pinned_posts
+        self.httpd.cassette = cassette
+        self.httpd.record_from = record_from
+        self.httpd.requested = []
+        self.thread = None
+
+    @property
+    def requested(self):
+        return self.httpd.requested
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve canned Instagram-like pages locally")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="delay per response in seconds")
+    parser.add_argument("--missing", nargs="*", default=(), help="usernames that get the not-found page")
+    parser.add_argument("--challenge", nargs="*", default=(),
+                        help="accounts that must pass the verification code challenge")
+    parser.add_argument("--cassette", help="directory of recorded responses to replay")
+    parser.add_argument("--record-from", help="proxy to this site and record into --cassette")
+    args = parser.parse_args(argv)
+
+    if args.record_from and not args.cassette:
+        parser.error("--record-from needs --cassette")
+
+    with FixtureServer(port=args.port, latency=args.latency, missing=args.missing,
+                       challenge_users=args.challenge, cassette=args.cassette,
+                       record_from=args.record_from) as server:
+        mode = f"recording {args.record_from}" if args.record_from else "serving fixtures"
+        print(f"🧪 Fixture server {mode} at {server.url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
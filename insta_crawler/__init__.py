@@ -0,0 +1,6 @@
+# __init__.py
+"""Selenium and HTTP crawler for public Instagram profiles
+
+Submodules are not imported here, so importing the package stays cheap and
+never loads Selenium; see cli.py for the insta-crawler command.
+"""
@@ -0,0 +1,6 @@
+# __main__.py
+"""python -m insta_crawler: same as the insta-crawler command"""
+
+from .cli import main
+
+main()
@@ -0,0 +1,177 @@
+# async_crawler.py
+"""asyncio front end that runs many profile lookups concurrently"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from .crawler import InstagramCrawler, DEFAULT_TIMEOUT, INSTAGRAM_URL
+from .defaults import MissingProfile
+
+logger = logging.getLogger(__name__)
+
+class AsyncInstagramCrawler:
+    """Async versions of login, search_profile and get_profile_info
+
+    Selenium calls block, so each one runs on a dedicated thread pool while
+    the event loop keeps other lookups moving. Browsers are leased from an
+    idle queue, so a driver only ever serves one coroutine at a time, and
+    are launched on demand up to max_browsers. All lookups share a global
+    semaphore (max_concurrency) and a per-host semaphore (per_host_limit).
+    With http_first, lookups try the requests-based ProfileFetcher before
+    leasing a browser, which lets far more of them be in flight at once.
+    """
+
+    def __init__(self, max_concurrency=16, per_host_limit=8, max_browsers=4,
+                 timeout=DEFAULT_TIMEOUT, headless=True, base_url=INSTAGRAM_URL,
+                 http_first=False, session_store=None):
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.max_browsers = max_browsers
+        self.timeout = timeout
+        self.headless = headless
+        self.base_url = base_url.rstrip('/')
+        self.credentials = None
+        self.session_store = session_store
+        self.crawlers = []
+        self.fetcher = None
+
+        if http_first:
+            from .http_fetcher import ProfileFetcher
+            self.fetcher = ProfileFetcher(base_url=self.base_url, timeout=timeout,
+                                          pool_size=per_host_limit, use_browser_fallback=False)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="async_crawler")
+        # Created on first use: before Python 3.10 asyncio primitives bind to
+        # the loop current at creation, which is not the one asyncio.run starts
+        self._global_semaphore = None
+        self._host_semaphores = {}
+        self._idle_queue = None
+        self._launched = 0
+
+    @property
+    def _semaphore(self):
+        if self._global_semaphore is None:
+            self._global_semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._global_semaphore
+
+    @property
+    def _idle(self):
+        if self._idle_queue is None:
+            self._idle_queue = asyncio.Queue()
+        return self._idle_queue
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def _run(self, func, *args):
+        """Run a blocking call on the crawler thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _host_semaphore(self, url):
+        """Return the concurrency cap shared by every request to url's host"""
+        host = urlsplit(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _launch_crawler(self):
+        """Start one browser and bring it to a usable session (blocking)"""
+        crawler = InstagramCrawler(timeout=self.timeout, headless=self.headless,
+                                   base_url=self.base_url, session_store=self.session_store)
+        if self.credentials and crawler.login(*self.credentials):
+            crawler.handle_login_challenges()
+        else:
+            crawler.visit_instagram()
+        return crawler
+
+    async def _lease(self):
+        """Take an idle browser, launching a new one if under max_browsers"""
+        if self._idle.empty() and self._launched < self.max_browsers:
+            self._launched += 1
+            try:
+                crawler = await self._run(self._launch_crawler)
+            except BaseException:
+                self._launched -= 1
+                raise
+            self.crawlers.append(crawler)
+            return crawler
+        return await self._idle.get()
+
+    async def _with_browser(self, method, *args):
+        """Call an InstagramCrawler method on a leased browser"""
+        async with self._semaphore, self._host_semaphore(self.base_url):
+            crawler = await self._lease()
+            try:
+                return await self._run(getattr(crawler, method), *args)
+            finally:
+                self._idle.put_nowait(crawler)
+
+    async def login(self, username, password):
+        """Log every browser in; browsers launched later log in automatically"""
+        self.credentials = (username, password)
+
+        if not self.crawlers:
+            crawler = await self._lease()
+            self._idle.put_nowait(crawler)
+            return crawler.is_logged_in
+
+        # Wait for every browser to come back idle so none is mid-lookup
+        crawlers = [await self._idle.get() for _ in range(len(self.crawlers))]
+        try:
+            results = await asyncio.gather(
+                *(self._run(crawler.login, username, password) for crawler in crawlers))
+            await asyncio.gather(*(self._run(crawler.handle_login_challenges)
+                                   for crawler, ok in zip(crawlers, results) if ok))
+        finally:
+            for crawler in crawlers:
+                self._idle.put_nowait(crawler)
+        return all(results)
+
+    async def search_profile(self, username):
+        """Check that a profile can be opened through the search box"""
+        return await self._with_browser('search_profile', username)
+
+    async def get_profile_info(self, username):
+        """Return the get_profile_info dict for username"""
+        if self.fetcher:
+            profile_url = f"{self.base_url}/{username}/"
+            async with self._semaphore, self._host_semaphore(profile_url):
+                profile_info = await self._run(self.fetcher.fetch_profile, username)
+            if profile_info or isinstance(profile_info, MissingProfile):
+                return profile_info
+
+        return await self._with_browser('crawl_profile', username)
+
+    async def crawl_profiles(self, usernames):
+        """Crawl usernames concurrently, returning (username, profile_info) in input order"""
+        async def crawl_one(username):
+            try:
+                return username, await self.get_profile_info(username)
+            except Exception as e:
+                logger.error(f"❌ Error crawling profile '{username}': {e}")
+                return username, {}
+
+        usernames = [name.strip().lstrip('@') for name in usernames if name.strip()]
+        return await asyncio.gather(*(crawl_one(username) for username in usernames))
+
+    async def close(self):
+        """Close every browser and the worker threads"""
+        await asyncio.gather(*(self._run(crawler.close) for crawler in self.crawlers))
+        self.crawlers = []
+        if self.fetcher:
+            self.fetcher.close()
+        self._executor.shutdown(wait=False)
+
+def crawl_profiles(usernames, **options):
+    """Synchronous helper: crawl usernames with an AsyncInstagramCrawler"""
+    async def run():
+        async with AsyncInstagramCrawler(**options) as crawler:
+            return await crawler.crawl_profiles(usernames)
+    return asyncio.run(run())
@@ -0,0 +1,49 @@
+# cli.py
+"""insta-crawler command line entry point
+
+Each subcommand's module is imported only when that subcommand runs, so
+offline parsing, cache queries and --help never load the browser stack.
+"""
+
+import argparse
+import importlib
+import sys
+
+# name -> (module, function, keyword arguments, help)
+COMMANDS = {
+    'crawl': ('crawler', 'main', {},
+              "crawl profiles in a browser (interactive when no usernames are given)"),
+    'batch': ('crawler', 'main', {'batch': True},
+              "crawl a list of usernames to an output file, journal or cache"),
+    'parse-offline': ('profile_parser', 'main', {},
+                      "extract profiles from saved HTML snapshots"),
+    'creds': ('login_utils', 'main', {},
+              "save, show or delete the encrypted login credentials"),
+    'cache': ('profile_cache', 'main', {},
+              "inspect or clear a SQLite profile cache"),
+    'schedule': ('scheduler', 'main', {},
+                 "show a re-crawl schedule's freshness and upcoming visits"),
+    'driver': ('driver_manifest', 'main', {},
+               "install or show the cached chromedriver"),
+}
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="insta-crawler", description="Instagram profile crawler",
+        epilog="Run 'insta-crawler <command> --help' for the options of a command.")
+    subparsers = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (_, _, _, help_text) in COMMANDS.items():
+        # Options are parsed by the command itself, so --help reaches it too
+        subparsers.add_parser(name, help=help_text, add_help=False)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args, rest = build_parser().parse_known_args(argv)
+
+    module_name, function_name, options, _ = COMMANDS[args.command]
+    command = getattr(importlib.import_module(f".{module_name}", __package__), function_name)
+    return command(rest, prog=f"insta-crawler {args.command}", **options)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# crawl_state.py
+"""On-disk crawl journal so interrupted batches resume where they stopped"""
+
+import json
+import sqlite3
+import time
+
+from .defaults import MissingProfile
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+MISSING = 'missing'
+
+class CrawlJournal:
+    """SQLite journal of usernames and their crawl status
+
+    Every username is pending, done (with its result), missing (the profile
+    does not exist) or failed (with an error and a retry time). Each update
+    is committed immediately, so after a crash or KeyboardInterrupt a
+    restarted batch only redoes the handles that were not finished. Failed
+    handles are retried with exponential backoff until max_attempts is
+    reached; missing ones are final. Without wait_for_retries, crawl()
+    returns instead of sleeping until the next retry, leaving it to a rerun.
+    """
+
+    def __init__(self, path, max_attempts=3, backoff=30.0, backoff_factor=2.0,
+                 wait_for_retries=True, clock=time.time, sleep=time.sleep):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_factor = backoff_factor
+        self.wait_for_retries = wait_for_retries
+        self.clock = clock
+        self.sleep = sleep
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_journal (
+                    username TEXT PRIMARY KEY,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    updated_at REAL,
+                    error TEXT,
+                    result TEXT
+                )""")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, usernames):
+        """Record usernames as pending; handles already in the journal keep their state"""
+        rows = ((username.strip().lstrip('@'),) for username in usernames if username.strip())
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO crawl_journal (username) VALUES (?)", rows)
+
+    def due(self, limit=None):
+        """Usernames to crawl now: pending ones and failures whose backoff has passed"""
+        sql = """
+            SELECT username FROM crawl_journal
+            WHERE status = ? OR (status = ? AND attempts < ? AND next_attempt_at <= ?)
+            ORDER BY rowid"""
+        params = [PENDING, FAILED, self.max_attempts, self.clock()]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [row[0] for row in self.connection.execute(sql, params)]
+
+    def next_retry_at(self):
+        """Earliest retry time of a failed username, or None if nothing is left to retry"""
+        row = self.connection.execute(
+            "SELECT MIN(next_attempt_at) FROM crawl_journal WHERE status = ? AND attempts < ?",
+            (FAILED, self.max_attempts)).fetchone()
+        return row[0]
+
+    def mark_done(self, username, result):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE crawl_journal SET status = ?, attempts = attempts + 1, updated_at = ?, "
+                "error = NULL, result = ? WHERE username = ?",
+                (DONE, self.clock(), json.dumps(result, ensure_ascii=False), username))
+
+    def mark_missing(self, username):
+        with self.connection:
+            self.connection.execute(
+                "UPDATE crawl_journal SET status = ?, attempts = attempts + 1, updated_at = ?, "
+                "error = ? WHERE username = ?",
+                (MISSING, self.clock(), "profile not found", username))
+
+    def mark_failed(self, username, error):
+        now = self.clock()
+        attempts = self.connection.execute(
+            "SELECT attempts FROM crawl_journal WHERE username = ?", (username,)).fetchone()[0] + 1
+        next_attempt_at = now + self.backoff * self.backoff_factor ** (attempts - 1)
+        with self.connection:
+            self.connection.execute(
+                "UPDATE crawl_journal SET status = ?, attempts = ?, next_attempt_at = ?, "
+                "updated_at = ?, error = ? WHERE username = ?",
+                (FAILED, attempts, next_attempt_at, now, error, username))
+
+    def counts(self):
+        """Number of usernames per status"""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0, MISSING: 0}
+        for status, count in self.connection.execute(
+                "SELECT status, COUNT(*) FROM crawl_journal GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def results(self):
+        """Yield (username, profile_info) for every completed username"""
+        cursor = self.connection.execute(
+            "SELECT username, result FROM crawl_journal WHERE status = ? ORDER BY rowid", (DONE,))
+        for username, result in cursor:
+            yield username, json.loads(result)
+
+    def crawl(self, crawl_profiles, usernames=(), batch_size=100, wait_for_retries=None):
+        """Crawl every unfinished username, recording each outcome as it arrives
+
+        crawl_profiles is any callable with the InstagramCrawler.crawl_profiles
+        contract (usernames in, (username, profile_info) pairs out). Completed
+        handles are skipped; a MissingProfile result is recorded as missing,
+        any other empty result counts as a failure and is retried after its
+        backoff. wait_for_retries defaults to the journal's setting. Yields
+        the same pairs as crawl_profiles.
+        """
+        self.add(usernames)
+        if wait_for_retries is None:
+            wait_for_retries = self.wait_for_retries
+
+        while True:
+            batch = self.due(batch_size)
+            if not batch:
+                retry_at = self.next_retry_at()
+                if retry_at is None or not wait_for_retries:
+                    return
+                self.sleep(max(0.0, retry_at - self.clock()))
+                continue
+
+            for username, profile_info in crawl_profiles(batch):
+                if profile_info:
+                    self.mark_done(username, profile_info)
+                elif isinstance(profile_info, MissingProfile):
+                    self.mark_missing(username)
+                else:
+                    self.mark_failed(username, "no profile information")
+                yield username, profile_info
+
+    def close(self):
+        self.connection.close()
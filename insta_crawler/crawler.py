@@ -0,0 +1,1478 @@
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+import sys
+import argparse
+import time
+from collections import OrderedDict, deque
+from contextlib import nullcontext, redirect_stdout
+from functools import partial
+from datetime import datetime, timezone
+import getpass
+import os
+import json
+import base64
+import logging
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+from .defaults import DEFAULT_TIMEOUT, INSTAGRAM_URL, MissingProfile
+from .login_utils import SessionStore, load_document
+from .driver_manifest import resolve_chromedriver
+from .profile_parser import PROFILE_FIELDS, EXTRACT_FIELDS_SCRIPT, parse_posts_json, parse_profile_json
+from .sinks import SINK_FORMATS, make_record, normalize_count, open_sink
+from .crawl_state import CrawlJournal
+from .profile_cache import ProfileCache, SqliteCacheStore
+from .metrics import METRICS, SUCCESS, FAILURE, TIMEOUT, configure_logging
+from .selector_registry import SELECTORS, FIND_FIRST_SCRIPT
+
+# Suppress various logging messages
+os.environ['WDM_LOG'] = '0'
+logging.getLogger('selenium').setLevel(logging.WARNING)
+logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+logger = logging.getLogger(__name__)
+
+# Ways of opening a profile page, fastest first
+NAVIGATION_STRATEGIES = ('direct', 'search')
+
+# Text of Instagram's "profile does not exist" page
+NOT_FOUND_TEXT = "Sorry, this page isn't available"
+
+# Returns 'not_found', 'profile' or null while the page is still settling
+# (or, when an expected path is given, while the tab is not on that path yet)
+PROFILE_PAGE_STATE_SCRIPT = """
+const notFoundText = arguments[0];
+const expectedPath = arguments[1];
+if (expectedPath && !location.pathname.startsWith(expectedPath)) {
+    return null;
+}
+const navigation = performance.getEntriesByType('navigation')[0];
+if (navigation && navigation.responseStatus === 404) {
+    return 'not_found';
+}
+if (document.title.includes('Page Not Found')) {
+    return 'not_found';
+}
+for (const node of document.querySelectorAll('main h2, main span')) {
+    if (node.textContent.includes(notFoundText)) {
+        return 'not_found';
+    }
+}
+if (document.querySelector('header h2')) {
+    return 'profile';
+}
+return null;
+"""
+
+# Requests dropped in lean mode: media, fonts and third-party trackers. CDP
+# patterns match the whole URL and CDN media URLs carry query strings
+# (".../x.mp4?efg=..."), so every pattern ends in a wildcard.
+DEFAULT_BLOCKED_URLS = (
+    "*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    "*.mp4*", "*.m4v*", "*.webm*", "*.mp3*", "*.m4a*",
+    "*.woff*", "*.woff2*", "*.ttf*", "*.otf*",
+    "*facebook.net*", "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+)
+
+# Small fixed viewport that still gets the desktop layout
+LEAN_WINDOW_SIZE = "1024,768"
+
+# Follower/following list dialog
+FOLLOW_DIALOG_SELECTOR = "div[role='dialog']"
+
+# Scrolls the follow dialog by arguments[1] px (or to arguments[2] px when
+# given) and returns the rows rendered since the last call; rows are marked
+# with the handle they were read as, so recycled row nodes are picked up
+# again once they show a new handle.
+HARVEST_FOLLOW_DIALOG_SCRIPT = """
+const dialog = document.querySelector(arguments[0]);
+if (!dialog) {
+    return null;
+}
+let scroller = dialog;
+for (const node of dialog.querySelectorAll('div')) {
+    if (node.scrollHeight > node.clientHeight + 10 && getComputedStyle(node).overflowY !== 'visible') {
+        scroller = node;
+        break;
+    }
+}
+const handles = [];
+for (const link of scroller.querySelectorAll("a[href^='/']")) {
+    const match = link.getAttribute('href').match(/^\\/([A-Za-z0-9._]+)\\/?$/);
+    if (match && link.dataset.harvested !== match[1]) {
+        link.dataset.harvested = match[1];
+        handles.push(match[1]);
+    }
+}
+if (arguments[2] !== null && arguments[2] !== undefined) {
+    scroller.scrollTop = arguments[2];
+} else if (arguments[1]) {
+    scroller.scrollTop = scroller.scrollTop + arguments[1];
+}
+return {
+    handles: handles,
+    scrollTop: scroller.scrollTop,
+    scrollHeight: scroller.scrollHeight,
+    clientHeight: scroller.clientHeight
+};
+"""
+
+# Largest scroll step through a follow dialog or post grid, as a share of
+# the viewport. A virtualised list only renders the viewport plus a few
+# overscan rows, so a longer jump would skip rows that are never rendered.
+SCROLL_STEP = 0.8
+
+# Handles kept in a follow list cursor so a resumed harvest skips the rows
+# that overlap the previous run's last step
+CURSOR_RECENT_HANDLES = 100
+
+# Posts Instagram may pin above newer ones at the top of the grid
+PINNED_POSTS = 3
+
+# Reads post tiles rendered since the last call and scrolls the page by
+# arguments[0] px; tiles are marked with their shortcode once read
+HARVEST_POST_GRID_SCRIPT = """
+const posts = [];
+for (const link of document.querySelectorAll("main a[href*='/p/'], main a[href*='/reel/']")) {
+    const match = link.getAttribute('href').match(/\\/(p|reel)\\/([A-Za-z0-9_-]+)/);
+    if (!match || link.dataset.harvested === match[2]) {
+        continue;
+    }
+    link.dataset.harvested = match[2];
+    const image = link.querySelector('img');
+    const time = link.querySelector('time');
+    const counts = Array.from(link.querySelectorAll('li span, ul span'), span => span.textContent.trim());
+    posts.push({
+        shortcode: match[2],
+        type: match[1] === 'reel' ? 'reel' : 'post',
+        url: new URL(link.getAttribute('href'), location.href).href,
+        caption: image ? image.getAttribute('alt') : null,
+        taken_at: time ? time.getAttribute('datetime') : null,
+        likes: counts.length > 0 ? counts[0] : null,
+        comments: counts.length > 1 ? counts[1] : null
+    });
+}
+if (arguments[0]) {
+    window.scrollBy(0, arguments[0]);
+}
+const scroller = document.scrollingElement || document.documentElement;
+return {
+    posts: posts,
+    scrollTop: scroller.scrollTop,
+    scrollHeight: scroller.scrollHeight,
+    clientHeight: window.innerHeight
+};
+"""
+
+# Profile API the page calls with ?username=
+PROFILE_API_PATH = "/api/v1/users/web_profile_info"
+
+# Response URLs whose JSON carries profile or post data
+CAPTURE_URL_PATTERNS = (
+    PROFILE_API_PATH,
+    "/api/v1/feed/user/",
+    "/graphql/query",
+    "/api/graphql",
+)
+
+# Selectors that indicate a failed login attempt
+LOGIN_ERROR_SELECTOR = "div[role='alert'], .error-message, p[data-testid='login-error-message']"
+
+# Elements only shown to a logged-in user (failing ones tried last, see SelectorRegistry)
+LOGGED_IN_SELECTORS = ("svg[aria-label='Home']", "a[href='/']", "input[placeholder*='Search']")
+
+# Instagram's search box, across markup variants
+SEARCH_INPUT_SELECTORS = ("input[placeholder*='Search']", "input[aria-label*='Search']",
+                          "input[placeholder*='search']")
+
+# Verification code input of the two-factor challenge
+TWO_FACTOR_SELECTOR = "input[name='verificationCode']"
+
+# Buttons that dismiss post-login interstitials: "Save your login info?",
+# "Turn on Notifications" and cookie banners (matched case-insensitively)
+DISMISS_BUTTON_TEXTS = (
+    "Not Now",
+    "Decline optional cookies",
+    "Only allow essential cookies",
+)
+
+# One pass of the dialog engine: reports a two-factor challenge, otherwise
+# clicks one dismiss button per dialog and returns the texts it clicked.
+# Clicked buttons are marked so later passes skip them while a click is
+# still being processed.
+DISMISS_INTERSTITIALS_SCRIPT = """
+const [texts, challengeSelector] = arguments;
+if (document.querySelector(challengeSelector)) {
+    return {challenge: true, dismissed: []};
+}
+const wanted = new Set(texts.map(text => text.toLowerCase()));
+const handled = new Set();
+const dismissed = [];
+for (const button of document.querySelectorAll("button, [role='button']")) {
+    const text = button.textContent.trim().toLowerCase();
+    const container = button.closest("[role='dialog'], form") || document;
+    if (!wanted.has(text) || button.dataset.dismissed || handled.has(container)) {
+        continue;
+    }
+    button.dataset.dismissed = "1";
+    handled.add(container);
+    button.click();
+    dismissed.push(text);
+}
+return {challenge: false, dismissed: dismissed};
+"""
+
+class InstagramCrawler:
+    def __init__(self, timeout=DEFAULT_TIMEOUT, headless=True, user_data_dir=None,
+                 base_url=INSTAGRAM_URL, session_store=None, snapshot_dir=None,
+                 navigation=NAVIGATION_STRATEGIES, lean=True, blocked_urls=DEFAULT_BLOCKED_URLS,
+                 page_load_strategy='normal', capture_network=False, selectors=None):
+        """Initialize the Instagram crawler with Chrome driver
+        
+        timeout is the per-operation budget in seconds shared by every
+        condition-based wait (form loads, redirects, profile rendering).
+        user_data_dir gives the browser its own Chrome profile directory so
+        several crawlers can run side by side with separate sessions.
+        session_store (a login_utils.SessionStore) lets login() reuse a saved
+        session instead of submitting the login form every time.
+        snapshot_dir, if set, keeps the HTML of every crawled profile so it can
+        be re-parsed offline with profile_parser.parse_snapshot_dir.
+        navigation lists how profiles are opened, in order: 'direct' (profile
+        URL, the fast path) and/or 'search' (the search box UI).
+        lean turns off images, media and fonts, blocks the blocked_urls
+        patterns, fixes a small viewport and caps renderer processes; only
+        the DOM text is needed for extraction.
+        page_load_strategy is Chrome's 'normal', 'eager' or 'none'; the
+        multi-tab mode needs 'none' so navigations can overlap. navigate()
+        still waits for each new document, so login and session restore
+        behave the same under 'none'.
+        capture_network turns on Chrome's performance log so the profile and
+        post JSON the page downloads is parsed directly (see capture_profile).
+        selectors is the SelectorRegistry that moves selectors which keep
+        missing behind their fallbacks; crawlers share the process-wide one
+        by default.
+        """
+        self.driver = None
+        self.is_logged_in = False
+        self.timeout = timeout
+        self.headless = headless
+        self.user_data_dir = user_data_dir
+        self.base_url = base_url.rstrip('/')
+        self.session_store = session_store
+        self.snapshot_dir = snapshot_dir
+        self.navigation = tuple(navigation)
+        self.lean = lean
+        self.blocked_urls = list(blocked_urls)
+        self.page_load_strategy = page_load_strategy
+        self.capture_network = capture_network
+        self.selectors = selectors or SELECTORS
+        self.pending_responses = {}
+        self.username = None
+        self.pages_loaded = 0
+        self.setup_driver()
+    
+    @METRICS.timed('page_load')
+    def navigate(self, url):
+        """Load url in the current tab, counting page loads for recycling
+        
+        Returns once the new document replaced the old one, so later waits
+        never pass on the previous page when page_load_strategy is 'none'.
+        """
+        self.pages_loaded += 1
+        if self.page_load_strategy == 'none':
+            load_document(self.driver, url, self.timeout)
+        else:
+            self.driver.get(url)
+    
+    def reset_state(self):
+        """Get the browser ready for the next job while keeping the session
+        
+        Closes every tab but one and parks it on about:blank; cookies and
+        local storage stay, so a logged-in browser stays logged in.
+        """
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+        self.driver.get("about:blank")
+    
+    def wait(self, timeout=None, poll_frequency=0.5):
+        """Return a WebDriverWait bounded by the per-operation timeout budget"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        return WebDriverWait(self.driver, self.timeout if timeout is None else timeout,
+                             poll_frequency=poll_frequency)
+    
+    def wait_for_page_ready(self, timeout=None):
+        """Wait until the current document has finished loading"""
+        self.wait(timeout).until(
+            lambda driver: driver.execute_script("return document.readyState") == "complete"
+        )
+    
+    @METRICS.timed('driver_startup')
+    def setup_driver(self):
+        """Set up Chrome driver with basic options"""
+        from selenium.webdriver.chrome.service import Service
+        try:
+            # Chrome options for better performance and stealth
+            chrome_options = webdriver.ChromeOptions()
+            chrome_options.add_argument("--no-sandbox")
+            chrome_options.add_argument("--disable-dev-shm-usage")
+            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            chrome_options.add_experimental_option('useAutomationExtension', False)
+            chrome_options.page_load_strategy = self.page_load_strategy
+            
+            # Suppress logging messages
+            chrome_options.add_argument("--log-level=3")  # Suppress INFO, WARNING, ERROR
+            chrome_options.add_argument("--disable-logging")
+            chrome_options.add_argument("--disable-logging-redirect")
+            chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+            chrome_options.add_argument("--silent")
+            
+            # Run without a browser window when requested
+            if self.headless:
+                chrome_options.add_argument("--headless=new")
+            
+            # Keep each crawler's cookies and cache in its own profile directory
+            if self.user_data_dir:
+                chrome_options.add_argument(f"--user-data-dir={self.user_data_dir}")
+            
+            # Record network events so JSON responses can be read back
+            if self.capture_network:
+                chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+            
+            # Lean mode: load only what DOM extraction needs
+            if self.lean:
+                self.add_lean_options(chrome_options)
+            
+            # Set up the driver from the cached binary (see driver_manifest.py)
+            service = Service(resolve_chromedriver())
+            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            self.setup_network()
+            
+            # Execute script to avoid detection
+            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            
+            logger.info("✅ Chrome driver initialized successfully")
+            
+        except Exception as e:
+            logger.error(f"❌ Error setting up driver: {e}")
+            sys.exit(1)
+    
+    def restore_session(self, username):
+        """Reuse a saved session for username if the server still accepts it"""
+        if not self.session_store:
+            return False
+        
+        if not self.session_store.restore_session(self.driver, self.base_url, username, self.timeout):
+            return False
+        
+        if self.is_session_valid():
+            logger.info("✅ Restored saved session")
+            self.username = username
+            self.is_logged_in = True
+            return True
+        
+        logger.warning("⚠️ Saved session expired")
+        self.session_store.delete_session()
+        return False
+    
+    def is_session_valid(self):
+        """Load the home page once and check it is the logged-in version"""
+        self.navigate(self.base_url)
+        try:
+            self.wait().until(
+                lambda driver: driver.find_elements(By.NAME, "username")
+                or driver.find_elements(By.CSS_SELECTOR, "svg[aria-label='Home']")
+            )
+        except TimeoutException:
+            return False
+        return not self.driver.find_elements(By.NAME, "username")
+    
+    def save_session(self):
+        """Save the current logged-in session for later runs"""
+        if self.session_store and self.is_logged_in and self.username:
+            self.session_store.save_session(self.driver, self.username)
+    
+    def setup_network(self):
+        """Enable network events and URL blocking in the current tab
+        
+        CDP commands only reach the current target, so every new tab needs
+        this too (see open_tabs).
+        """
+        if self.capture_network or (self.lean and self.blocked_urls):
+            self.driver.execute_cdp_cmd("Network.enable", {})
+        
+        # Drop blocked requests before they leave the browser
+        if self.lean and self.blocked_urls:
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_urls})
+    
+    def add_lean_options(self, chrome_options):
+        """Turn off images, media and fonts and keep the browser small"""
+        chrome_options.add_argument(f"--window-size={LEAN_WINDOW_SIZE}")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--autoplay-policy=user-gesture-required")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-remote-fonts")
+        chrome_options.add_argument("--renderer-process-limit=2")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.geolocation": 2,
+        })
+    
+    @METRICS.timed('login')
+    def login(self, username, password, code_provider=None):
+        """Login to Instagram with username and password
+        
+        A saved session for username is restored and checked first; the full
+        login form is only used when there is none or it has expired. A
+        two-factor challenge is passed with code_provider (see
+        handle_login_challenges).
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+        if self.restore_session(username):
+            return True
+        
+        self.username = username
+        try:
+            logger.info("🔐 Attempting to login...")
+            
+            # Navigate to login page
+            self.navigate(f"{self.base_url}/accounts/login/")
+            
+            # Wait for login form to become interactive
+            username_field = self.wait().until(
+                EC.element_to_be_clickable((By.NAME, "username"))
+            )
+            password_field = self.wait().until(
+                EC.element_to_be_clickable((By.NAME, "password"))
+            )
+            
+            # Clear fields and enter credentials
+            username_field.clear()
+            username_field.send_keys(username)
+            
+            password_field.clear()
+            password_field.send_keys(password)
+            
+            # Find and click login button once it is enabled
+            login_button = self.wait().until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, "button[type='submit']"))
+            )
+            login_button.click()
+            
+            # Wait for login to process: either we leave the login page or an error shows up
+            try:
+                self.wait().until(
+                    lambda driver: "login" not in driver.current_url
+                    or driver.find_elements(By.CSS_SELECTOR, LOGIN_ERROR_SELECTOR)
+                )
+            except TimeoutException:
+                pass
+            
+            # A two-factor challenge has to be passed before the login is complete
+            if self.driver.find_elements(By.CSS_SELECTOR, TWO_FACTOR_SELECTOR):
+                return self.handle_login_challenges(code_provider)
+            
+            # Check if login was successful
+            if self.check_login_success():
+                logger.info("✅ Login successful!")
+                self.is_logged_in = True
+                self.save_session()
+                return True
+            else:
+                logger.error("❌ Login failed - check credentials")
+                return False
+                
+        except TimeoutException:
+            logger.error("❌ Login timeout - page took too long to load")
+            METRICS.set_outcome(TIMEOUT)
+            return False
+        except Exception as e:
+            logger.error(f"❌ Login error: {e}")
+            return False
+    
+    @METRICS.timed('check_login')
+    def check_login_success(self):
+        """Check if login was successful by looking for indicators"""
+        try:
+            # Check if we're redirected to home page or if there are error messages
+            current_url = self.driver.current_url
+            
+            # If still on login page, check for error messages
+            if "login" in current_url:
+                try:
+                    # Look for error messages
+                    error_elements = self.driver.find_elements(By.CSS_SELECTOR, LOGIN_ERROR_SELECTOR)
+                    if error_elements:
+                        error_text = error_elements[0].text
+                        logger.error(f"❌ Login error: {error_text}")
+                        return False
+                except:
+                    pass
+                
+                # Still on login page without clear error - likely failed
+                return False
+            
+            # Look for home page indicators
+            return self.find_first('logged_in', LOGGED_IN_SELECTORS) is not None
+                
+        except Exception as e:
+            logger.error(f"❌ Error checking login status: {e}")
+            return False
+    
+    def handle_login_challenges(self, code_provider=None, settle_timeout=1.0, max_passes=10):
+        """Pass a two-factor challenge and dismiss post-login interstitials
+        
+        Each pass is one injected script that either reports a two-factor
+        challenge or clicks the dismiss button of every known interstitial
+        ("Save your login info?", notifications, cookie banners). Passes
+        repeat on a short condition wait until none shows up for
+        settle_timeout seconds. A challenge is handed to code_provider, a
+        callable returning the verification code (default: ask on the
+        terminal).
+        """
+        code_provider = code_provider or prompt_verification_code
+        try:
+            logger.debug("🔍 Checking for login challenges...")
+            
+            for _ in range(max_passes):
+                try:
+                    state = self.wait(settle_timeout, poll_frequency=0.1).until(
+                        lambda driver: self.dismiss_interstitials()
+                    )
+                except TimeoutException:
+                    return True
+                
+                if state['challenge']:
+                    if not self.submit_verification_code(code_provider()):
+                        return False
+                else:
+                    logger.debug(f"✅ Dismissed {', '.join(state['dismissed'])}")
+            
+            logger.warning("⚠️ Interstitials kept appearing, continuing anyway")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error handling login challenges: {e}")
+            return False
+    
+    def dismiss_interstitials(self):
+        """Run one pass of the dialog engine; returns its state, or None if nothing was found"""
+        try:
+            state = self.driver.execute_script(DISMISS_INTERSTITIALS_SCRIPT,
+                                               DISMISS_BUTTON_TEXTS, TWO_FACTOR_SELECTOR)
+        except WebDriverException:
+            # The page was navigating away; the next pass sees the new one
+            return None
+        if state and (state['challenge'] or state['dismissed']):
+            return state
+        return None
+    
+    def submit_verification_code(self, verification_code):
+        """Enter a two-factor code and confirm the login went through"""
+        from selenium.webdriver.support import expected_conditions as EC
+        logger.info("📱 Two-factor authentication detected")
+        verification_code = (verification_code or "").strip()
+        if not verification_code:
+            return False
+        
+        code_field = self.driver.find_element(By.CSS_SELECTOR, TWO_FACTOR_SELECTOR)
+        code_field.send_keys(verification_code)
+        
+        # Click confirm button and wait for the challenge form to go away
+        self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
+        try:
+            self.wait().until(EC.staleness_of(code_field))
+        except TimeoutException:
+            pass
+        
+        if not self.check_login_success():
+            return False
+        self.is_logged_in = True
+        self.save_session()
+        return True
+    
+    def visit_instagram(self):
+        """Navigate to Instagram homepage"""
+        try:
+            logger.info("🌐 Visiting Instagram...")
+            self.navigate(self.base_url)
+            
+            # Wait for page to load
+            self.wait_for_page_ready()
+            
+            logger.info("✅ Instagram loaded successfully")
+            
+        except Exception as e:
+            logger.error(f"❌ Error visiting Instagram: {e}")
+    
+    @METRICS.timed('search_profile')
+    def search_profile(self, username):
+        """Search for a specific Instagram profile"""
+        from selenium.webdriver.support import expected_conditions as EC
+        try:
+            logger.debug(f"🔍 Searching for profile: {username}")
+            
+            # Look for search input (Instagram's search box)
+            search_input = self.find_first('search_input', SEARCH_INPUT_SELECTORS, interactable=True)
+            
+            if not search_input:
+                logger.error("❌ Could not find search input")
+                return False
+            
+            # Clear and enter username
+            search_input.clear()
+            search_input.send_keys(username)
+            
+            # Open the matching result as soon as it renders, otherwise press Enter
+            profile_path = f"/{username}/"
+            try:
+                result_link = self.wait().until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, f"a[href='{profile_path}']"))
+                )
+                result_link.click()
+            except TimeoutException:
+                search_input.send_keys(Keys.RETURN)
+            
+            # Wait until we have actually landed on the profile page
+            try:
+                self.wait().until(EC.url_contains(profile_path))
+            except TimeoutException:
+                logger.error(f"❌ Search did not open profile: {username}")
+                METRICS.set_outcome(TIMEOUT)
+                return False
+            
+            logger.debug(f"✅ Search opened profile: {username}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error searching for profile: {e}")
+            return False
+    
+    @METRICS.timed('extract_profile')
+    def get_profile_info(self, fields=PROFILE_FIELDS):
+        """Extract profile information from current page
+        
+        All fields in the declarative spec (see profile_parser.PROFILE_FIELDS)
+        are read with a single execute_script call, so adding fields does not
+        add WebDriver round-trips.
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+        try:
+            logger.debug("📊 Extracting profile information...")
+            
+            # Wait for profile header to render
+            try:
+                self.wait().until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "h2"))
+                )
+            except TimeoutException:
+                logger.warning("⚠️ Profile header did not render in time")
+            
+            spec = self.selectors.order_fields(fields)
+            result = self.driver.execute_script(EXTRACT_FIELDS_SCRIPT, spec) or {}
+            values = result.get('values', {})
+            matched = result.get('matched', {})
+            
+            profile_info = {}
+            for name, field in spec.items():
+                # An absent 'exists' marker is an answer, not a broken selector
+                if matched.get(name) or field.get('attr') != 'exists':
+                    self.selectors.record(name, field['selectors'], matched.get(name))
+                value = values.get(name)
+                profile_info[name] = "Not found" if value is None else value
+            
+            return profile_info
+            
+        except Exception as e:
+            logger.error(f"❌ Error extracting profile info: {e}")
+            return {}
+    
+    def find_first(self, field, candidates, timeout=None, interactable=False):
+        """Wait for the first of several candidate selectors to match an element
+        
+        All candidates are checked in one script call per poll, in the
+        order self.selectors gives, and the outcome is recorded there.
+        Returns the element, or None if none matched within the timeout.
+        """
+        ordered = self.selectors.order(field, candidates)
+        try:
+            element, selector = self.wait(timeout).until(
+                lambda driver: driver.execute_script(FIND_FIRST_SCRIPT, ordered, interactable)
+            )
+        except TimeoutException:
+            self.selectors.record(field, ordered, None)
+            return None
+        self.selectors.record(field, ordered, selector)
+        return element
+    
+    def profile_page_state(self, expected_path=None):
+        """Classify the current page as 'profile', 'not_found' or None (not settled yet)
+        
+        Uses the navigation's HTTP status and DOM markers from one script call
+        instead of scanning page_source.
+        """
+        return self.driver.execute_script(PROFILE_PAGE_STATE_SCRIPT, NOT_FOUND_TEXT, expected_path)
+    
+    def wait_for_profile_page(self, expected_path=None):
+        """Wait until the page (at expected_path, if given) is a profile or a not-found page
+        
+        Returns True for a profile, False for not found, None if neither
+        showed up within the timeout (e.g. a login wall).
+        """
+        try:
+            state = self.wait().until(lambda driver: self.profile_page_state(expected_path))
+        except TimeoutException:
+            return None
+        return state == 'profile'
+    
+    def open_profile_direct(self, username):
+        """Navigate straight to the profile URL"""
+        self.navigate(f"{self.base_url}/{username}/")
+        return self.wait_for_profile_page(f"/{username}/")
+    
+    def open_profile_search(self, username):
+        """Open the profile through the search box UI"""
+        if not self.search_profile(username):
+            return None
+        return self.wait_for_profile_page(f"/{username}/")
+    
+    def open_profile(self, username):
+        """Open a profile page using the configured navigation strategies
+        
+        Strategies are tried in order until one gives a definite answer.
+        Returns True if the profile page is open, False if it does not exist,
+        or None if it could not be reached.
+        """
+        for strategy in self.navigation:
+            if strategy == 'search':
+                found = self.open_profile_search(username)
+            else:
+                found = self.open_profile_direct(username)
+            
+            if found is not None:
+                if not found:
+                    logger.warning(f"❌ Profile '{username}' not found", extra={'username': username})
+                return found
+            logger.warning(f"🔄 Navigation via {strategy} failed for '{username}'",
+                           extra={'username': username, 'strategy': strategy})
+        
+        # No strategy settled within the timeout
+        METRICS.set_outcome(TIMEOUT)
+        return None
+    
+    def drain_network_json(self, url_patterns=CAPTURE_URL_PATTERNS):
+        """Yield (url, status, data) for JSON responses finished since the last call
+        
+        Reads Chrome's performance log: responses are remembered when their
+        headers arrive and their body is fetched over CDP once loading has
+        finished.
+        """
+        for entry in self.driver.get_log('performance'):
+            try:
+                message = json.loads(entry['message'])['message']
+            except (KeyError, ValueError):
+                continue
+            method = message.get('method')
+            params = message.get('params', {})
+            
+            if method == 'Network.responseReceived':
+                response = params.get('response', {})
+                if 'json' in response.get('mimeType', '') and any(
+                        pattern in response.get('url', '') for pattern in url_patterns):
+                    self.pending_responses[params['requestId']] = (response['url'], response.get('status'))
+            
+            elif method == 'Network.loadingFinished' and params.get('requestId') in self.pending_responses:
+                url, status = self.pending_responses.pop(params['requestId'])
+                try:
+                    body = self.driver.execute_cdp_cmd('Network.getResponseBody',
+                                                       {'requestId': params['requestId']})
+                    text = body['body']
+                    if body.get('base64Encoded'):
+                        text = base64.b64decode(text).decode('utf-8')
+                    yield url, status, json.loads(text)
+                except (WebDriverException, ValueError):
+                    continue
+    
+    def capture_profile(self, username):
+        """Open a profile and read its data from the JSON responses the page loads
+        
+        Returns (profile_info, posts, found). Polls the network log instead
+        of waiting for the page to render, and stops early once the page has
+        settled or the profile API answered with an error (a missing
+        profile, or a page that embeds its data instead). profile_info is
+        None if no profile JSON showed up; found then says whether the
+        loaded page is a profile (True), a not-found page (False) or unknown
+        (None), so the caller can read the DOM without navigating again.
+        """
+        # Discard events from earlier pages
+        self.driver.get_log('performance')
+        self.pending_responses.clear()
+        
+        self.navigate(f"{self.base_url}/{username}/")
+        
+        profile_path = f"/{username}/"
+        profile_info = None
+        posts = []
+        page_state = None
+        api_failed = False
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
+            for url, status, data in self.drain_network_json():
+                posts.extend(parse_posts_json(data))
+                parsed = parse_profile_json(data)
+                if parsed and parsed.get('username', '').lower() == username.lower():
+                    profile_info = parsed
+                elif status != 200 and PROFILE_API_PATH in url and f"username={username}".lower() in url.lower():
+                    api_failed = True
+            if profile_info or page_state or api_failed:
+                break
+            
+            # Once the page settles, drain the log one last time and stop
+            page_state = self.profile_page_state(profile_path)
+            if not page_state:
+                time.sleep(0.05)
+        
+        if profile_info:
+            return profile_info, posts, True
+        if page_state:
+            return None, posts, page_state == 'profile'
+        if api_failed:
+            return None, posts, self.wait_for_profile_page(profile_path)
+        return None, posts, None
+    
+    @METRICS.timed('crawl_profile')
+    def crawl_profile(self, username):
+        """Open a profile and extract its information
+        
+        Returns the get_profile_info dict, a MissingProfile if the profile
+        does not exist, or {} if the page could not be loaded. With capture_network the profile JSON is used when it arrives, and
+        the rendered page is only read as a fallback (without loading it
+        again when capture already saw it settle).
+        """
+        found = None
+        if self.capture_network:
+            profile_info, _, found = self.capture_profile(username)
+            if profile_info:
+                if self.snapshot_dir:
+                    self.save_snapshot(username)
+                return profile_info
+            if found is False:
+                logger.warning(f"❌ Profile '{username}' not found", extra={'username': username})
+                return MissingProfile()
+        
+        if not found:
+            found = self.open_profile(username)
+            if found is False:
+                return MissingProfile()
+            if not found:
+                return {}
+        
+        profile_info = self.get_profile_info()
+        if self.snapshot_dir:
+            self.save_snapshot(username)
+        return profile_info
+    
+    def save_snapshot(self, username):
+        """Save the current page HTML for offline re-extraction"""
+        try:
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            path = os.path.join(self.snapshot_dir, f"{username}.html")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(self.driver.page_source)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save snapshot for '{username}': {e}")
+    
+    def crawl_profiles(self, usernames):
+        """Crawl a list of profiles reusing this browser session
+        
+        Yields (username, profile_info) for each handle as soon as it is
+        extracted. A failing profile yields an empty dict instead of
+        stopping the batch.
+        """
+        for username in usernames:
+            username = username.strip().lstrip('@')
+            if not username:
+                continue
+            
+            try:
+                profile_info = self.crawl_profile(username)
+            except Exception as e:
+                logger.error(f"❌ Error crawling profile '{username}': {e}", extra={'username': username})
+                profile_info = {}
+            
+            yield username, profile_info
+    
+    def harvest_follow_dialog(self, step=0, scroll_to=None):
+        """Collect newly rendered dialog rows and scroll by step px (or to scroll_to), in one round-trip"""
+        return self.driver.execute_script(HARVEST_FOLLOW_DIALOG_SCRIPT, FOLLOW_DIALOG_SELECTOR,
+                                          step, scroll_to)
+    
+    def iter_follow_list(self, username, kind, cursor=None, idle_scrolls=5,
+                         settle_timeout=2.0, dedupe_window=10000):
+        """Stream handles from a profile's followers or following dialog
+        
+        The dialog is a virtualised list, so it is scrolled in adaptive steps
+        (growing while new rows keep appearing, shrinking when they do not,
+        never more than SCROLL_STEP of its height) and only rows
+        rendered since the previous step are read. Handles are deduplicated
+        against a bounded window of recent ones, keeping memory flat for very
+        large lists. cursor is a dict updated in place with the scroll
+        position, count and last few handles; pass the same dict (e.g.
+        reloaded from disk) to resume an interrupted harvest.
+        """
+        from selenium.webdriver.support import expected_conditions as EC
+        cursor = {} if cursor is None else cursor
+        cursor.setdefault('scroll_top', 0)
+        cursor.setdefault('count', 0)
+        
+        self.navigate(f"{self.base_url}/{username}/{kind}/")
+        try:
+            self.wait().until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, FOLLOW_DIALOG_SELECTOR))
+            )
+        except TimeoutException:
+            logger.error(f"❌ Could not open {kind} list for '{username}'")
+            return
+        
+        state = self.harvest_follow_dialog()
+        max_step = (state['clientHeight'] or 600) * SCROLL_STEP
+        step = max_step
+        
+        # Jump straight to the saved position; the list grows as it is
+        # scrolled, so keep jumping until it is long enough. Rows read on the
+        # way were reported by the previous run.
+        resume_at = cursor['scroll_top']
+        if resume_at:
+            while state['scrollTop'] < resume_at:
+                before = state['scrollTop']
+                state = self.harvest_follow_dialog(scroll_to=resume_at)
+                if state['scrollTop'] == before:
+                    state = self.wait_for_dialog_growth(state, settle_timeout)
+                    if state['scrollTop'] == before:
+                        break
+            state = dict(state, handles=[])
+        
+        # The cursor keeps the last handles (trimmed in place, JSON friendly)
+        tail = cursor['recent'] = list(cursor.get('recent', []))[-CURSOR_RECENT_HANDLES:]
+        recent = OrderedDict.fromkeys(tail)
+        idle = 0
+        while idle < idle_scrolls:
+            new_handles = 0
+            for handle in state['handles']:
+                if handle == username or handle in recent:
+                    continue
+                recent[handle] = None
+                if len(recent) > dedupe_window:
+                    recent.popitem(last=False)
+                new_handles += 1
+                cursor['count'] += 1
+                tail.append(handle)
+                if len(tail) > 2 * CURSOR_RECENT_HANDLES:
+                    del tail[:-CURSOR_RECENT_HANDLES]
+                yield handle
+            cursor['scroll_top'] = state['scrollTop']
+            
+            if new_handles:
+                idle = 0
+                step = min(step * 1.25, max_step)
+            else:
+                idle += 1
+                step = max(step / 2, (state['clientHeight'] or 600) / 4)
+            
+            state = self.harvest_follow_dialog(int(step))
+            if not state['handles']:
+                state = self.wait_for_dialog_growth(state, settle_timeout)
+    
+    def wait_for_dialog_growth(self, state, timeout):
+        """Poll the dialog until new rows render or the list grows, up to timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            latest = self.harvest_follow_dialog()
+            if latest['handles'] or latest['scrollHeight'] != state['scrollHeight']:
+                return latest
+        return state
+    
+    def get_followers(self, username, cursor=None):
+        """Yield the handles following username (see iter_follow_list)"""
+        return self.iter_follow_list(username, 'followers', cursor)
+    
+    def get_following(self, username, cursor=None):
+        """Yield the handles username follows (see iter_follow_list)"""
+        return self.iter_follow_list(username, 'following', cursor)
+    
+    def harvest_post_grid(self, step=0):
+        """Collect newly rendered post tiles and scroll by step px, in one round-trip"""
+        return self.driver.execute_script(HARVEST_POST_GRID_SCRIPT, step)
+    
+    def wait_for_grid_growth(self, state, timeout):
+        """Poll the grid until new tiles render or the page grows, up to timeout"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.1)
+            latest = self.harvest_post_grid()
+            if latest['posts'] or latest['scrollHeight'] != state['scrollHeight']:
+                return latest
+        return state
+    
+    def iter_posts(self, username, limit=None, since=None, idle_scrolls=4, settle_timeout=2.0,
+                   dedupe_window=10000):
+        """Stream post records from a profile's grid, newest first
+        
+        The grid is scrolled lazily and only tiles loaded since the previous
+        step are read, so records are yielded one at a time as they appear.
+        Stops after limit posts, or on reaching since: a datetime (posts
+        older than it) or the shortcode of the newest post from the previous
+        crawl. The first PINNED_POSTS tiles never trigger the since stop,
+        since pinned posts can be older than the ones below them. The grid
+        is virtualised and remounts tiles, so shortcodes are deduplicated
+        against a bounded window like in iter_follow_list.
+        Each record has shortcode, type, url, caption, taken_at, likes and
+        comments; fields the grid does not render are None.
+        """
+        if limit is not None and limit <= 0:
+            return
+        if not self.open_profile(username):
+            return
+        
+        since_shortcode = since if isinstance(since, str) else None
+        since_time = since if isinstance(since, datetime) else None
+        if since_time is not None and since_time.tzinfo is None:
+            since_time = since_time.replace(tzinfo=timezone.utc)
+        
+        state = self.harvest_post_grid()
+        step = (state['clientHeight'] or 800) * SCROLL_STEP
+        position = yielded = 0
+        recent = OrderedDict()
+        idle = 0
+        
+        while idle < idle_scrolls:
+            new_posts = 0
+            for post in state['posts']:
+                if post['shortcode'] in recent:
+                    continue
+                recent[post['shortcode']] = None
+                if len(recent) > dedupe_window:
+                    recent.popitem(last=False)
+                new_posts += 1
+                position += 1
+                if since_shortcode and post['shortcode'] == since_shortcode and position > PINNED_POSTS:
+                    return
+                
+                taken_at = parse_timestamp(post['taken_at'])
+                if since_time and taken_at and taken_at < since_time:
+                    if position > PINNED_POSTS:
+                        return
+                    continue
+                if since_shortcode and post['shortcode'] == since_shortcode:
+                    continue
+                
+                yield {
+                    'username': username,
+                    'shortcode': post['shortcode'],
+                    'type': post['type'],
+                    'url': post['url'],
+                    'caption': post['caption'],
+                    'taken_at': taken_at.isoformat() if taken_at else None,
+                    'likes': normalize_count(post['likes']) if post['likes'] else None,
+                    'comments': normalize_count(post['comments']) if post['comments'] else None,
+                }
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+            
+            idle = 0 if new_posts else idle + 1
+            state = self.harvest_post_grid(int(step))
+            if not state['posts']:
+                state = self.wait_for_grid_growth(state, settle_timeout)
+    
+    def open_tabs(self, count):
+        """Make sure the browser has at least count tabs and return their handles"""
+        while len(self.driver.window_handles) < count:
+            self.driver.switch_to.new_window('tab')
+            self.setup_network()
+        return self.driver.window_handles[:count]
+    
+    def start_tab_navigation(self, handle, username):
+        """Start loading a profile in a tab without waiting for it"""
+        self.driver.switch_to.window(handle)
+        self.pages_loaded += 1
+        self.driver.execute_script("window.location.href = arguments[0];",
+                                   f"{self.base_url}/{username}/")
+    
+    def crawl_profiles_in_tabs(self, usernames, tabs=4, poll_interval=0.05):
+        """Crawl profiles with several page loads in flight across tabs
+        
+        All tabs share this browser's cookies, so one login serves them all.
+        Each tab is handed the next username as soon as its current one is
+        extracted. Yields (username, profile_info) in completion order; a
+        missing profile yields a MissingProfile and one that does not settle
+        within the timeout yields {}.
+        Navigations only overlap when the crawler was created with
+        page_load_strategy='none', otherwise chromedriver waits for each load.
+        """
+        pending = deque(name.strip().lstrip('@') for name in usernames if name.strip())
+        active = {}
+        
+        for handle in self.open_tabs(min(tabs, len(pending)) or 1):
+            if not pending:
+                break
+            username = pending.popleft()
+            self.start_tab_navigation(handle, username)
+            active[handle] = (username, time.monotonic())
+        
+        while active:
+            progressed = False
+            for handle, (username, started_at) in list(active.items()):
+                try:
+                    self.driver.switch_to.window(handle)
+                    state = self.profile_page_state(f"/{username}/")
+                    if state is None and time.monotonic() - started_at < self.timeout:
+                        continue
+                    
+                    if state == 'profile':
+                        profile_info = self.get_profile_info()
+                        if self.snapshot_dir:
+                            self.save_snapshot(username)
+                        outcome = SUCCESS if profile_info else FAILURE
+                    else:
+                        logger.warning(f"❌ Profile '{username}' not found" if state else
+                                       f"⚠️ Profile '{username}' did not load in time",
+                                       extra={'username': username})
+                        profile_info = MissingProfile() if state else {}
+                        outcome = FAILURE if state else TIMEOUT
+                except Exception as e:
+                    logger.error(f"❌ Error crawling profile '{username}': {e}", extra={'username': username})
+                    profile_info = {}
+                    outcome = FAILURE
+                
+                METRICS.record('crawl_profile', time.monotonic() - started_at, outcome)
+                progressed = True
+                del active[handle]
+                yield username, profile_info
+                
+                if pending:
+                    username = pending.popleft()
+                    self.start_tab_navigation(handle, username)
+                    active[handle] = (username, time.monotonic())
+            
+            if not progressed:
+                time.sleep(poll_interval)
+    
+    def close(self):
+        """Close the browser driver"""
+        if self.driver:
+            self.driver.quit()
+            logger.debug("🔒 Browser closed")
+
+def parse_timestamp(value):
+    """Parse an ISO 8601 timestamp (as in <time datetime>) into an aware datetime, or None"""
+    if not value:
+        return None
+    try:
+        timestamp = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+def read_usernames(path):
+    """Read usernames from a file, one per line (blank lines and # comments skipped)"""
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def print_profile_info(profile_info):
+    """Print a profile information block"""
+    print("\n" + "="*50)
+    print("PROFILE INFORMATION")
+    print("="*50)
+    for key, value in profile_info.items():
+        print(f"{key.capitalize()}: {value}")
+    print("="*50)
+
+def prompt_verification_code():
+    """Ask for a two-factor verification code on the terminal"""
+    return input("Enter verification code from your phone: ").strip()
+
+def prompt_login(crawler):
+    """Ask whether to login and prepare the browser session accordingly
+    
+    The password is only asked for when there is no saved session for the
+    username or it has expired.
+    """
+    login_choice = input("Do you want to login? (y/n): ").strip().lower()
+    
+    if login_choice == 'y':
+        # Get login credentials
+        username = input("Enter your Instagram username: ").strip()
+        if not username:
+            print("❌ Username is required")
+            return False
+        
+        if crawler.restore_session(username):
+            return True
+        
+        password = getpass.getpass("Enter your Instagram password: ")
+        if not password:
+            print("❌ Password is required")
+            return False
+        
+        # Attempt login
+        if crawler.login(username, password):
+            # Handle any post-login challenges
+            crawler.handle_login_challenges()
+        else:
+            logger.warning("❌ Login failed. Continuing without login...")
+            crawler.visit_instagram()
+    else:
+        # Visit Instagram without login
+        crawler.visit_instagram()
+    
+    return True
+
+def parse_args(argv=None, batch=False, prog=None):
+    """Parse command line arguments; batch requires usernames, a --file, a --journal or --recrawl"""
+    parser = argparse.ArgumentParser(prog=prog, description="Instagram Profile Crawler")
+    parser.add_argument("usernames", nargs="*",
+                        help="profiles to crawl in one browser session (interactive mode if omitted)")
+    parser.add_argument("-f", "--file", dest="usernames_file",
+                        help="file with one username per line to crawl in one browser session")
+    parser.add_argument("--login", action="store_true",
+                        help="ask for credentials before a batch crawl")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="per-operation wait budget in seconds")
+    parser.add_argument("--no-session-cache", dest="session_cache", action="store_false",
+                        help="always submit the login form instead of reusing a saved session")
+    parser.add_argument("--snapshot-dir",
+                        help="save each crawled profile page here for offline re-parsing")
+    parser.add_argument("-o", "--output",
+                        help="stream profiles to this file ('-' for stdout) instead of printing them")
+    parser.add_argument("--format", choices=sorted(SINK_FORMATS),
+                        help="output format (default: from the --output extension)")
+    parser.add_argument("--journal",
+                        help="SQLite crawl journal; a rerun skips finished usernames and retries failures")
+    parser.add_argument("--retry-backoff", type=float, default=30.0,
+                        help="seconds before a failed username in the --journal is first retried "
+                             "(doubling after each attempt)")
+    parser.add_argument("--no-wait-retries", dest="wait_retries", action="store_false",
+                        help="exit instead of waiting for --journal retries; a rerun picks them up")
+    parser.add_argument("--recrawl",
+                        help="SQLite re-crawl schedule: crawl only the tracked usernames that are "
+                             "due, each revisited as often as it changes (run it e.g. hourly)")
+    parser.add_argument("--recrawl-budget", type=int, default=60,
+                        help="most profiles crawled per run (an hour's budget) with --recrawl")
+    parser.add_argument("--cache",
+                        help="SQLite profile cache; profiles crawled within --cache-ttl are not re-crawled")
+    parser.add_argument("--cache-ttl", type=float, default=3600,
+                        help="seconds a cached profile stays fresh")
+    parser.add_argument("--navigation", nargs="+", choices=NAVIGATION_STRATEGIES,
+                        default=list(NAVIGATION_STRATEGIES),
+                        help="how to open profiles, in order of preference")
+    parser.add_argument("--headed", dest="headless", action="store_false",
+                        help="show the browser window instead of running headless")
+    parser.add_argument("--full-browser", dest="lean", action="store_false",
+                        help="load images, media and fonts instead of the lean DOM-only mode")
+    parser.add_argument("--tabs", type=int, default=1,
+                        help="load this many profiles at once in tabs of one browser")
+    parser.add_argument("--capture-network", action="store_true",
+                        help="read profile data from the page's JSON responses instead of rendered text")
+    parser.add_argument("--http", action="store_true",
+                        help="fetch public profiles over HTTP, using the browser only as a fallback")
+    parser.add_argument("-v", "--verbose", action="count", default=0,
+                        help="log more detail (-v adds per-phase timing spans)")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only log warnings and errors")
+    parser.add_argument("--log-json", action="store_true",
+                        help="write log records as JSON lines")
+    parser.add_argument("--metrics-json",
+                        help="write per-phase latency percentiles and outcome counts here on exit")
+    parser.add_argument("--metrics-port", type=int,
+                        help="serve Prometheus metrics on this port at /metrics while crawling")
+    parser.add_argument("--selector-state",
+                        help="JSON file of learnt selector order and per-selector hit/miss "
+                             "stats; loaded at start and updated on exit")
+    args = parser.parse_args(argv)
+    if batch and not (args.usernames or args.usernames_file or args.journal or args.recrawl):
+        parser.error("a batch needs usernames, a --file, a --journal or --recrawl")
+    if args.journal and args.recrawl:
+        parser.error("--journal and --recrawl cannot be combined")
+    if args.recrawl_budget < 1:
+        parser.error("--recrawl-budget must be at least 1")
+    return args
+
+def batch_results(crawl_profiles, usernames, journal=None):
+    """Run crawl_profiles over usernames, through the crawl journal if one is given"""
+    if journal:
+        return journal.crawl(crawl_profiles, usernames)
+    return crawl_profiles(usernames)
+
+def run_batch(crawler, usernames, login=False, sink=None, journal=None, cache=None, tabs=1):
+    """Crawl a batch of usernames and report each profile as it is extracted"""
+    if login:
+        if not prompt_login(crawler):
+            return
+    else:
+        crawler.visit_instagram()
+    
+    if cache:
+        crawl_profiles = cache.crawl_profiles
+    elif tabs > 1:
+        crawl_profiles = partial(crawler.crawl_profiles_in_tabs, tabs=tabs)
+    else:
+        crawl_profiles = crawler.crawl_profiles
+    print_batch(batch_results(crawl_profiles, usernames, journal), sink)
+
+def print_batch(results, sink=None):
+    """Report each (username, profile_info) result and a batch summary
+    
+    With a sink, profiles are streamed to it as records instead of being
+    printed as PROFILE INFORMATION blocks.
+    """
+    crawled = failed = 0
+    for username, profile_info in results:
+        if profile_info:
+            crawled += 1
+            if sink:
+                sink.write(make_record(username, profile_info))
+                logger.info(f"✅ Saved profile '{username}'", extra={'username': username})
+            else:
+                print_profile_info(profile_info)
+        else:
+            failed += 1
+            logger.warning(f"⚠️ No profile information for '{username}'", extra={'username': username})
+    
+    # Logged, not printed: with '-o -' stdout carries only the records
+    logger.info(f"📦 Batch finished: {crawled} crawled, {failed} failed",
+                extra={'crawled': crawled, 'failed': failed})
+
+def main(argv=None, batch=False, prog=None):
+    """Main function to run the crawler"""
+    args = parse_args(argv, batch, prog)
+    configure_logging(-1 if args.quiet else args.verbose, json_lines=args.log_json)
+    metrics_server = METRICS.serve_prometheus(args.metrics_port) if args.metrics_port else None
+    if args.selector_state:
+        SELECTORS.load(args.selector_state)
+    
+    usernames = list(args.usernames)
+    if args.usernames_file:
+        usernames.extend(read_usernames(args.usernames_file))
+    
+    sink = open_sink(args.output, args.format) if args.output else None
+    journal = (CrawlJournal(args.journal, backoff=args.retry_backoff, wait_for_retries=args.wait_retries)
+               if args.journal else None)
+    if args.recrawl:
+        from .scheduler import RecrawlScheduler
+        
+        # The schedule takes the journal's place: it decides what is crawled and when
+        journal = RecrawlScheduler(args.recrawl, budget_per_hour=args.recrawl_budget)
+    # With '-o -' stdout carries only the records: prompts and profile blocks go to stderr
+    console = redirect_stdout(sys.stderr) if args.output == '-' else nullcontext()
+    try:
+        with console:
+            run(args, usernames, sink, journal)
+    finally:
+        if sink:
+            sink.close()
+        if args.recrawl:
+            logger.info(f"🗓️ Re-crawl schedule: {journal.publish_metrics()}")
+            journal.close()
+        elif journal:
+            logger.info(f"📒 Journal: {journal.counts()}")
+            journal.close()
+        if args.metrics_json:
+            with open(args.metrics_json, 'w', encoding='utf-8') as file:
+                file.write(METRICS.to_json())
+        if metrics_server:
+            metrics_server.shutdown()
+        if args.selector_state:
+            SELECTORS.save(args.selector_state)
+
+def open_cache(args, lookup):
+    """Put a disk-backed ProfileCache in front of lookup when --cache is given"""
+    if not args.cache:
+        return None
+    return ProfileCache(lookup, ttl=args.cache_ttl, store=SqliteCacheStore(args.cache))
+
+def close_cache(cache):
+    """Report cache counters and close its store"""
+    if cache:
+        logger.info(f"🗄️ Cache: {cache.stats_summary()}")
+        cache.store.close()
+
+def run(args, usernames, sink=None, journal=None):
+    """Run the crawler mode selected on the command line"""
+    if args.http:
+        if not usernames and not journal:
+            logger.error("❌ --http needs usernames on the command line, a --file or a --journal")
+            return
+        
+        from .http_fetcher import ProfileFetcher
+        with ProfileFetcher(timeout=args.timeout) as fetcher:
+            cache = open_cache(args, fetcher.get_profile_info)
+            crawl_profiles = cache.crawl_profiles if cache else fetcher.crawl_profiles
+            print_batch(batch_results(crawl_profiles, usernames, journal), sink)
+            close_cache(cache)
+        return
+    
+    session_store = SessionStore() if args.session_cache else None
+    crawler = InstagramCrawler(timeout=args.timeout, headless=args.headless, lean=args.lean,
+                               session_store=session_store, snapshot_dir=args.snapshot_dir,
+                               navigation=args.navigation,
+                               page_load_strategy='none' if args.tabs > 1 else 'normal',
+                               capture_network=args.capture_network)
+    
+    try:
+        logger.info("🚀 Instagram Profile Crawler")
+        
+        if usernames or journal:
+            cache = open_cache(args, crawler.crawl_profile)
+            try:
+                run_batch(crawler, usernames, login=args.login, sink=sink, journal=journal,
+                          cache=cache, tabs=args.tabs)
+            finally:
+                close_cache(cache)
+            return
+        
+        if not prompt_login(crawler):
+            return
+        
+        # Get target profile username
+        target_username = input("\nEnter Instagram username to search: ").strip()
+        
+        if not target_username:
+            print("❌ No username provided")
+            return
+        
+        profile_info = crawler.crawl_profile(target_username)
+        if profile_info:
+            if sink:
+                sink.write(make_record(target_username, profile_info))
+            print_profile_info(profile_info)
+            
+            # If logged in, can potentially access more information
+            if crawler.is_logged_in:
+                print("\n💡 Logged in - you may have access to additional profile information")
+        
+        # Keep browser open for manual inspection
+        input("\nPress Enter to close the browser...")
+        
+    except KeyboardInterrupt:
+        logger.warning("⚠️ Crawler interrupted by user")
+    except Exception as e:
+        logger.exception(f"❌ Unexpected error: {e}")
+    finally:
+        crawler.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
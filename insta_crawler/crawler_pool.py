@@ -0,0 +1,129 @@
+# crawler_pool.py
+"""Run several headless InstagramCrawler workers over a shared username queue"""
+
+import logging
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .crawler import InstagramCrawler, DEFAULT_TIMEOUT, INSTAGRAM_URL
+
+logger = logging.getLogger(__name__)
+
+class CrawlerPool:
+    """Pool of browser workers, each with its own Chrome profile and session
+
+    Workers are threads: nearly all of a crawl is spent waiting on
+    chromedriver and the page, so threads scale with the number of browsers
+    without the cost of pickling results between processes.
+    """
+
+    def __init__(self, workers=4, timeout=DEFAULT_TIMEOUT, headless=True,
+                 base_url=INSTAGRAM_URL, credentials=None, profile_root=None,
+                 session_store=None):
+        self.workers = workers
+        self.timeout = timeout
+        self.headless = headless
+        self.base_url = base_url
+        self.credentials = credentials
+        self.session_store = session_store
+        self.profile_root = profile_root
+        self._owns_profile_root = profile_root is None
+        self.crawlers = []
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_crawler(self, index):
+        """Launch one worker browser and prepare its session"""
+        user_data_dir = os.path.join(self.profile_root, f"worker-{index}")
+        crawler = InstagramCrawler(timeout=self.timeout, headless=self.headless,
+                                   user_data_dir=user_data_dir, base_url=self.base_url,
+                                   session_store=self.session_store)
+
+        if self.credentials:
+            username, password = self.credentials
+            if crawler.login(username, password):
+                crawler.handle_login_challenges()
+            else:
+                logger.warning(f"⚠️ Worker {index} login failed. Continuing without login...")
+                crawler.visit_instagram()
+        else:
+            crawler.visit_instagram()
+
+        with self._lock:
+            self.crawlers.append(crawler)
+        return crawler
+
+    def start(self):
+        """Launch all worker browsers in parallel
+
+        If any worker fails to launch, the ones that started are closed and
+        the temporary profiles removed before the error is re-raised.
+        """
+        if self.crawlers:
+            return
+
+        if self.profile_root is None:
+            self.profile_root = tempfile.mkdtemp(prefix="insta_crawler_pool_")
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(self._start_crawler, range(self.workers)))
+        except BaseException:
+            # setup_driver exits the process when Chrome cannot start
+            self.close()
+            raise
+
+        logger.info(f"✅ Crawler pool started with {len(self.crawlers)} workers")
+
+    def _drain(self, crawler, work_queue, results):
+        """Feed one worker from the shared queue until it is empty"""
+        while True:
+            try:
+                index, username = work_queue.get_nowait()
+            except queue.Empty:
+                return
+
+            for _, profile_info in crawler.crawl_profiles([username]):
+                results[index] = profile_info
+
+    def crawl(self, usernames):
+        """Crawl all usernames across the pool
+
+        Returns the get_profile_info dicts in the same order as usernames,
+        with {} for profiles that could not be crawled.
+        """
+        self.start()
+
+        usernames = list(usernames)
+        results = [{} for _ in usernames]
+        work_queue = queue.Queue()
+        for item in enumerate(usernames):
+            work_queue.put(item)
+
+        with ThreadPoolExecutor(max_workers=len(self.crawlers)) as executor:
+            futures = [executor.submit(self._drain, crawler, work_queue, results)
+                       for crawler in self.crawlers]
+            for future in futures:
+                future.result()
+
+        return results
+
+    def close(self):
+        """Close every worker browser and remove temporary profiles"""
+        for crawler in self.crawlers:
+            crawler.close()
+        self.crawlers = []
+
+        if self._owns_profile_root and self.profile_root:
+            shutil.rmtree(self.profile_root, ignore_errors=True)
+            self.profile_root = None
@@ -0,0 +1,19 @@
+# defaults.py
+"""Settings shared by the browser crawler and the HTTP fetcher
+
+Kept free of imports so the HTTP fast path can use them without loading
+Selenium.
+"""
+
+# Site root; point this at a local fixture server for offline runs
+INSTAGRAM_URL = "https://www.instagram.com"
+
+# Default per-operation wait budget (seconds) for page loads and element lookups
+DEFAULT_TIMEOUT = 10
+
+class MissingProfile(dict):
+    """Empty profile_info for a handle that does not exist
+
+    Falsy like any failed lookup, but tells callers such as the crawl
+    journal that retrying will not help.
+    """
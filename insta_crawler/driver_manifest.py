@@ -0,0 +1,106 @@
+# driver_manifest.py
+"""Resolve the chromedriver binary once and reuse it on every start without the network"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import time
+
+# Points at a chromedriver binary and overrides everything else
+CHROMEDRIVER_ENV = "CHROMEDRIVER_PATH"
+
+# Overrides where the manifest is kept
+MANIFEST_ENV = "INSTA_CRAWLER_DRIVER_MANIFEST"
+
+DEFAULT_MANIFEST = os.path.join(os.path.expanduser("~"), ".cache", "insta_crawler", "chromedriver.json")
+
+def manifest_path():
+    """Location of the driver manifest"""
+    return os.environ.get(MANIFEST_ENV) or DEFAULT_MANIFEST
+
+def driver_version(path):
+    """Version string reported by a chromedriver binary"""
+    try:
+        output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10)
+        return output.stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def load_manifest(path=None):
+    """Return the recorded manifest, or None if there is none"""
+    path = path or manifest_path()
+    try:
+        with open(path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+def write_manifest(driver_path, path=None):
+    """Record driver_path and its version in the manifest"""
+    path = path or manifest_path()
+    manifest = {
+        'path': os.path.abspath(driver_path),
+        'version': driver_version(driver_path),
+        'installed_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+def install_chromedriver(path=None, driver_path=None):
+    """One-time setup: download (or adopt driver_path) and record it in the manifest
+
+    This is the only step that may use the network.
+    """
+    if driver_path is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+    return write_manifest(driver_path, path)
+
+def resolve_chromedriver(path=None):
+    """Find the chromedriver binary without touching the network
+
+    Checks CHROMEDRIVER_PATH, then the manifest, then a chromedriver on
+    PATH. Raises FileNotFoundError if none is usable.
+    """
+    override = os.environ.get(CHROMEDRIVER_ENV)
+    if override:
+        if os.path.isfile(override):
+            return override
+        raise FileNotFoundError(f"{CHROMEDRIVER_ENV} points to a missing file: {override}")
+
+    manifest = load_manifest(path)
+    if manifest and os.path.isfile(manifest.get('path', '')):
+        return manifest['path']
+
+    system_driver = shutil.which("chromedriver")
+    if system_driver:
+        return system_driver
+
+    raise FileNotFoundError(
+        "No chromedriver found. Run 'insta-crawler driver install' once, "
+        f"or set {CHROMEDRIVER_ENV}")
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Manage the cached chromedriver binary")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    install = subparsers.add_parser("install", help="download chromedriver and record it")
+    install.add_argument("--driver", help="record this existing binary instead of downloading")
+    subparsers.add_parser("show", help="print the driver crawler startup will use")
+    args = parser.parse_args(argv)
+
+    if args.command == "install":
+        manifest = install_chromedriver(driver_path=args.driver)
+        print(f"✅ Recorded {manifest['path']} ({manifest['version'] or 'unknown version'})")
+        print(f"   Manifest: {manifest_path()}")
+    else:
+        try:
+            print(resolve_chromedriver())
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+
+if __name__ == "__main__":
+    main()
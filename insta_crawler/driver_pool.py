@@ -0,0 +1,218 @@
+# driver_pool.py
+"""Keep pre-launched, warmed-up browsers ready instead of relaunching Chrome per job"""
+
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from .crawler import InstagramCrawler
+
+logger = logging.getLogger(__name__)
+
+# Launch attempts for a browser that replaces a recycled one
+RELAUNCH_ATTEMPTS = 3
+
+# Seconds acquire() waits between checks that the pool still has browsers
+ACQUIRE_POLL = 1.0
+
+def process_tree_rss(pid):
+    """Resident memory in MB of a process and all its descendants (Linux /proc)
+
+    Returns None where /proc is not available.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', encoding='utf-8') as file:
+                # Field 4 is the parent pid; the command name in field 2 may contain spaces
+                parent = int(file.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    total_kb = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, ()))
+        try:
+            with open(f'/proc/{current}/status', encoding='utf-8') as file:
+                for line in file:
+                    if line.startswith('VmRSS:'):
+                        total_kb += int(line.split()[1])
+                        break
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+def browser_rss(crawler):
+    """Memory in MB used by a crawler's chromedriver and Chrome processes, or None"""
+    try:
+        return process_tree_rss(crawler.driver.service.process.pid)
+    except AttributeError:
+        return None
+
+class DriverPool:
+    """Pool of warm InstagramCrawler browsers
+
+    size browsers are launched up front and warmed up on the home page. A
+    job leases one with browser() (or acquire/release). Between jobs its
+    extra tabs are closed and it is parked on about:blank, keeping the
+    session. A browser is recycled (quit and relaunched in the background)
+    once it has loaded max_pages pages or its process tree passes
+    max_rss_mb. Extra keyword arguments go to InstagramCrawler.
+
+    A browser that fails to launch is logged and left out; start() raises
+    RuntimeError if none came up, and acquire() raises it once no browser
+    is left or being launched instead of waiting forever.
+    """
+
+    def __init__(self, size=2, max_pages=200, max_rss_mb=1500, credentials=None,
+                 **crawler_options):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.credentials = credentials
+        self.crawler_options = crawler_options
+        self.idle = queue.Queue()
+        self.crawlers = set()
+        self.recycled = 0
+        self.launching = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _launch(self, attempts=1):
+        """Launch and warm up one browser, then make it available
+
+        The caller counts the launch in self.launching first. Failures
+        (including the SystemExit of a browser that cannot start) are logged.
+        """
+        try:
+            for attempt in range(1, attempts + 1):
+                try:
+                    crawler = self._warm_up()
+                    break
+                except BaseException as e:
+                    logger.error(f"❌ Browser launch failed ({attempt}/{attempts}): {e!r}")
+            else:
+                return
+
+            with self._lock:
+                if self._closed:
+                    crawler.close()
+                    return
+                self.crawlers.add(crawler)
+            self.idle.put(crawler)
+        finally:
+            with self._lock:
+                self.launching -= 1
+
+    def _warm_up(self):
+        crawler = InstagramCrawler(**self.crawler_options)
+        try:
+            if self.credentials and crawler.login(*self.credentials):
+                crawler.handle_login_challenges()
+            else:
+                crawler.visit_instagram()
+            crawler.reset_state()
+        except BaseException:
+            crawler.close()
+            raise
+        return crawler
+
+    def _start_launch(self, attempts=1, daemon=False):
+        with self._lock:
+            self.launching += 1
+        thread = threading.Thread(target=self._launch, args=(attempts,), daemon=daemon)
+        thread.start()
+        return thread
+
+    def start(self):
+        """Pre-launch every browser in parallel; raises RuntimeError if none came up"""
+        threads = [self._start_launch() for _ in range(self.size - len(self.crawlers))]
+        for thread in threads:
+            thread.join()
+        if not self.crawlers:
+            raise RuntimeError("No browser in the driver pool could be launched")
+        logger.info(f"✅ Driver pool ready with {len(self.crawlers)} warm browsers")
+
+    def acquire(self, timeout=None):
+        """Take a ready browser, waiting up to timeout seconds for one
+
+        Raises queue.Empty on timeout, and RuntimeError when the pool has
+        no browser left (all launches failed or it was closed).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                if not self.crawlers and not self.launching:
+                    raise RuntimeError("Driver pool has no browsers left")
+            wait = ACQUIRE_POLL if deadline is None else min(ACQUIRE_POLL, max(0.0, deadline - time.monotonic()))
+            try:
+                return self.idle.get(timeout=wait)
+            except queue.Empty:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise
+
+    def needs_recycling(self, crawler):
+        if crawler.pages_loaded >= self.max_pages:
+            return True
+        rss = browser_rss(crawler) if self.max_rss_mb else None
+        return rss is not None and rss > self.max_rss_mb
+
+    def _recycle(self, crawler):
+        with self._lock:
+            self.crawlers.discard(crawler)
+            self.recycled += 1
+        crawler.close()
+        if not self._closed:
+            self._start_launch(RELAUNCH_ATTEMPTS, daemon=True)
+
+    def release(self, crawler):
+        """Return a browser after a job: reset it, or recycle it if it is worn out"""
+        if not self._closed and not self.needs_recycling(crawler):
+            try:
+                crawler.reset_state()
+                self.idle.put(crawler)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Browser reset failed, recycling it: {e}")
+        self._recycle(crawler)
+
+    @contextmanager
+    def browser(self, timeout=None):
+        """Lease a browser for the duration of a with block"""
+        crawler = self.acquire(timeout)
+        try:
+            yield crawler
+        finally:
+            self.release(crawler)
+
+    def crawl_profile(self, username):
+        """Crawl one profile on a pooled browser"""
+        with self.browser() as crawler:
+            return crawler.crawl_profile(username)
+
+    def close(self):
+        """Quit every browser in the pool"""
+        with self._lock:
+            self._closed = True
+            crawlers = list(self.crawlers)
+            self.crawlers.clear()
+        for crawler in crawlers:
+            crawler.close()
@@ -0,0 +1,150 @@
+# http_fetcher.py
+"""Fetch public profiles over plain HTTP, falling back to the browser crawler"""
+
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .defaults import DEFAULT_TIMEOUT, INSTAGRAM_URL, MissingProfile
+from .metrics import METRICS
+from .profile_parser import parse_profile_html, parse_profile_json
+
+logging.getLogger('urllib3').setLevel(logging.WARNING)
+
+logger = logging.getLogger(__name__)
+
+# Public app id the Instagram web client sends with its API requests
+WEB_APP_ID = "936619743392459"
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+class ProfileFetcher:
+    """Look up public profiles with a pooled requests.Session
+
+    Tries the web_profile_info JSON endpoint, then the profile page's
+    embedded JSON and meta tags. A 404 from both means the profile does not
+    exist. Only when the page loaded but could not be parsed is a Selenium
+    InstagramCrawler started (once, lazily) to crawl the profile.
+    """
+
+    def __init__(self, base_url=INSTAGRAM_URL, timeout=DEFAULT_TIMEOUT, pool_size=10,
+                 use_browser_fallback=True):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.use_browser_fallback = use_browser_fallback
+        self.crawler = None
+
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'X-IG-App-ID': WEB_APP_ID,
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def fetch_api(self, username):
+        """Fetch a profile from the web_profile_info JSON endpoint (a MissingProfile on 404)"""
+        response = self.session.get(
+            f"{self.base_url}/api/v1/users/web_profile_info/",
+            params={'username': username}, timeout=self.timeout)
+        if response.status_code == 404:
+            return MissingProfile()
+        if response.status_code != 200:
+            return None
+        try:
+            return parse_profile_json(response.json())
+        except ValueError:
+            return None
+
+    def fetch_page(self, username):
+        """Fetch a profile page and parse its embedded JSON or meta tags
+
+        Returns {} if the page loaded but could not be parsed, a
+        MissingProfile on 404 and None for any other status.
+        """
+        response = self.session.get(f"{self.base_url}/{username}/", timeout=self.timeout)
+        if response.status_code == 404:
+            return MissingProfile()
+        if response.status_code != 200:
+            return None
+        return parse_profile_html(response.text) or {}
+
+    @METRICS.timed('http_fetch')
+    def fetch_profile(self, username):
+        """Fetch a profile over HTTP only
+
+        Returns the profile, a MissingProfile if both the API and the page
+        answered 404, {} if the page loaded but could not be parsed, or None
+        if no request got through.
+        """
+        results = []
+        for fetch in (self.fetch_api, self.fetch_page):
+            try:
+                profile_info = fetch(username)
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ HTTP fetch failed for '{username}': {e}")
+                profile_info = None
+            if profile_info and profile_info.get('followers'):
+                return profile_info
+            results.append(profile_info)
+
+        api, page = results
+        if isinstance(api, MissingProfile) and isinstance(page, MissingProfile):
+            return page
+        if page is not None and not isinstance(page, MissingProfile):
+            return {}
+        return None
+
+    def get_profile_info(self, username):
+        """Return profile info, using the browser only if the page could not be parsed
+
+        A missing profile gives a MissingProfile, and {} is returned when
+        the HTTP requests failed.
+        """
+        profile_info = self.fetch_profile(username)
+        if isinstance(profile_info, MissingProfile):
+            logger.warning(f"❌ Profile '{username}' not found")
+            return profile_info
+        if profile_info is None or profile_info or not self.use_browser_fallback:
+            return profile_info or {}
+
+        logger.info(f"🔄 Falling back to browser for '{username}'...")
+        if self.crawler is None:
+            from .crawler import InstagramCrawler
+            self.crawler = InstagramCrawler(timeout=self.timeout, headless=True,
+                                            base_url=self.base_url)
+            self.crawler.visit_instagram()
+        return self.crawler.crawl_profile(username)
+
+    def crawl_profiles(self, usernames):
+        """Yield (username, profile_info) for each handle, like InstagramCrawler.crawl_profiles"""
+        for username in usernames:
+            username = username.strip().lstrip('@')
+            if not username:
+                continue
+            try:
+                profile_info = self.get_profile_info(username)
+            except Exception as e:
+                logger.error(f"❌ Error fetching profile '{username}': {e}")
+                profile_info = {}
+            yield username, profile_info
+
+    def close(self):
+        """Close pooled connections and the fallback browser if it was started"""
+        self.session.close()
+        if self.crawler:
+            self.crawler.close()
+            self.crawler = None
@@ -1,12 +1,46 @@
 # login_utils.py
 """Utility functions for handling Instagram login securely"""
 
+import argparse
 import json
 import os
 import getpass
-from cryptography.fernet import Fernet
+import logging
+import tempfile
+import time
 import base64
 
+logger = logging.getLogger(__name__)
+
+# Set on the current document before navigating; a new document does not have it
+STALE_DOCUMENT_SCRIPT = "window.__staleDocument = true;"
+IS_STALE_DOCUMENT_SCRIPT = "return window.__staleDocument === true;"
+
+def load_document(driver, url, timeout=10.0, poll_interval=0.05):
+    """driver.get(url), returning only once the new document replaced the old one
+
+    With page_load_strategy 'none', get returns before the navigation
+    commits, so cookies, storage and element lookups would still hit the
+    previous page. The new document may still be loading. Raises
+    TimeoutError if it did not commit within timeout seconds.
+    """
+    try:
+        driver.execute_script(STALE_DOCUMENT_SCRIPT)
+    except Exception:
+        pass
+    driver.get(url)
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if not driver.execute_script(IS_STALE_DOCUMENT_SCRIPT):
+                return
+        except Exception:
+            # The old document is being torn down
+            pass
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"{url} did not load within {timeout} s")
+        time.sleep(poll_interval)
+
 class SecureCredentials:
     """Handle secure storage and retrieval of login credentials"""
     
@@ -16,6 +50,7 @@ class SecureCredentials:
     
     def generate_key(self):
         """Generate a new encryption key"""
+        from cryptography.fernet import Fernet
         key = Fernet.generate_key()
         with open(self.key_file, 'wb') as key_file:
             key_file.write(key)
@@ -31,6 +66,7 @@ class SecureCredentials:
     
     def save_credentials(self, username, password):
         """Save credentials securely"""
+        from cryptography.fernet import Fernet
         try:
             key = self.load_key()
             f = Fernet(key)
@@ -55,6 +91,7 @@ class SecureCredentials:
     
     def load_credentials(self):
         """Load saved credentials"""
+        from cryptography.fernet import Fernet
         try:
             if not os.path.exists(self.credentials_file):
                 return None, None
@@ -86,6 +123,119 @@ class SecureCredentials:
         except Exception as e:
             print(f"❌ Error deleting credentials: {e}")
 
+class SessionStore:
+    """Persist an authenticated browser session, encrypted with the credentials key"""
+    
+    # Cookie that carries the Instagram login
+    SESSION_COOKIE = 'sessionid'
+    
+    def __init__(self, session_file="session.enc", secure_credentials=None):
+        self.session_file = session_file
+        self.secure_credentials = secure_credentials or SecureCredentials()
+    
+    def save_session(self, driver, username):
+        """Save the driver's cookies and local storage for username"""
+        from cryptography.fernet import Fernet
+        try:
+            key = self.secure_credentials.load_key()
+            f = Fernet(key)
+            
+            session = {
+                'username': username,
+                'saved_at': time.time(),
+                'cookies': driver.get_cookies(),
+                'local_storage': driver.execute_script(
+                    "return Object.assign({}, window.localStorage);") or {},
+            }
+            
+            # Encrypt and replace the file atomically so concurrent workers never read half a file;
+            # each save gets its own temp file because pool workers are threads of one process
+            encrypted_data = f.encrypt(json.dumps(session).encode())
+            session_dir = os.path.dirname(os.path.abspath(self.session_file))
+            fd, temp_file = tempfile.mkstemp(dir=session_dir, prefix=f"{os.path.basename(self.session_file)}.",
+                                             suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(encrypted_data)
+                os.replace(temp_file, self.session_file)
+            except BaseException:
+                os.unlink(temp_file)
+                raise
+            
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving session: {e}")
+            return False
+    
+    def load_session(self, username):
+        """Load the saved session for username, or None if missing or expired"""
+        from cryptography.fernet import Fernet
+        try:
+            if not os.path.exists(self.session_file):
+                return None
+            
+            key = self.secure_credentials.load_key()
+            f = Fernet(key)
+            
+            with open(self.session_file, 'rb') as file:
+                encrypted_data = file.read()
+            
+            session = json.loads(f.decrypt(encrypted_data).decode())
+            
+        except Exception as e:
+            logger.error(f"❌ Error loading session: {e}")
+            return None
+        
+        if session.get('username') != username:
+            return None
+        
+        # Skip the browser round-trip when the login cookie has already expired
+        now = time.time()
+        for cookie in session.get('cookies', []):
+            if cookie.get('name') == self.SESSION_COOKIE:
+                if cookie.get('expiry') and cookie['expiry'] <= now:
+                    return None
+                return session
+        return None
+    
+    def restore_session(self, driver, base_url, username, timeout=10.0):
+        """Load the saved session for username into driver
+        
+        Returns True if a session was restored. The caller still has to check
+        that the server accepts it. timeout bounds the wait for base_url.
+        """
+        session = self.load_session(username)
+        if not session:
+            return False
+        
+        try:
+            # Cookies and local storage can only be set on a page of the same origin
+            load_document(driver, base_url, timeout)
+            driver.delete_all_cookies()
+            for cookie in session['cookies']:
+                cookie = {k: v for k, v in cookie.items() if k != 'sameSite' or v in ('Strict', 'Lax', 'None')}
+                if 'expiry' in cookie:
+                    cookie['expiry'] = int(cookie['expiry'])
+                driver.add_cookie(cookie)
+            
+            driver.execute_script(
+                "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }",
+                session.get('local_storage', {}))
+            return True
+            
+        except Exception as e:
+            logger.error(f"❌ Error restoring session: {e}")
+            return False
+    
+    def delete_session(self):
+        """Delete the saved session"""
+        try:
+            if os.path.exists(self.session_file):
+                os.remove(self.session_file)
+        except Exception as e:
+            logger.error(f"❌ Error deleting session: {e}")
+
 def get_login_credentials():
     """Get login credentials from user with option to save"""
     secure_creds = SecureCredentials()
@@ -212,4 +362,33 @@ class LoginStrategies:
             
         except Exception as e:
             print(f"Slow login failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+def main(argv=None, prog=None):
+    """Manage the saved login credentials and browser session"""
+    parser = argparse.ArgumentParser(prog=prog, description="Manage saved Instagram credentials")
+    parser.add_argument("action", choices=["save", "show", "delete", "forget-session"],
+                        help="save new credentials, show the saved username, delete them, "
+                             "or delete the saved browser session")
+    args = parser.parse_args(argv)
+    
+    secure_creds = SecureCredentials()
+    if args.action == "save":
+        username = input("Username: ").strip()
+        password = getpass.getpass("Password: ")
+        is_valid, message = validate_credentials(username, password)
+        if is_valid:
+            secure_creds.save_credentials(username, password)
+        else:
+            print(f"❌ {message}")
+    elif args.action == "show":
+        username, _ = secure_creds.load_credentials()
+        print(f"👤 Saved username: {username}" if username else "No saved credentials")
+    elif args.action == "delete":
+        secure_creds.delete_credentials()
+    else:
+        SessionStore(secure_credentials=secure_creds).delete_session()
+        print("✅ Saved session deleted")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+# metrics.py
+"""Per-phase timing spans, outcome counters and structured logging for crawls"""
+
+import functools
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = 'success'
+FAILURE = 'failure'
+TIMEOUT = 'timeout'
+
+# Quantiles reported for every phase
+QUANTILES = (0.5, 0.95, 0.99)
+
+class Histogram:
+    """Duration samples for one phase, kept in a bounded reservoir"""
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self.samples = []
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            # Reservoir sampling keeps a uniform sample of every observation
+            index = random.randrange(self.count)
+            if index < self.max_samples:
+                self.samples[index] = value
+
+    def quantile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'max': self.max,
+            **{f"p{int(q * 100)}": self.quantile(q) for q in QUANTILES},
+        }
+
+class Metrics:
+    """Thread-safe registry of phase histograms, (phase, outcome) counters and gauges"""
+
+    def __init__(self, namespace="insta_crawler"):
+        self.namespace = namespace
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+        self._active = threading.local()
+
+    def observe(self, phase, seconds):
+        with self._lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, phase, outcome=SUCCESS, amount=1):
+        with self._lock:
+            key = (phase, outcome)
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Set a current value, e.g. the re-crawl schedule's expected freshness"""
+        with self._lock:
+            self.gauges[name] = value
+
+    def record(self, phase, seconds, outcome):
+        """Record one finished span and log it as a structured event"""
+        self.observe(phase, seconds)
+        self.increment(phase, outcome)
+        logger.debug("span %s %s in %.1f ms", phase, outcome, seconds * 1000,
+                     extra={'event': 'span', 'phase': phase, 'outcome': outcome,
+                            'duration_ms': round(seconds * 1000, 1)})
+
+    @contextmanager
+    def span(self, phase):
+        """Time a block; exceptions count as timeout or failure and are re-raised
+
+        The yielded dict can set 'outcome' to override the result, for code
+        that reports failure by return value instead of raising.
+        """
+        result = {'outcome': SUCCESS}
+        stack = self._active.__dict__.setdefault('spans', [])
+        stack.append(result)
+        start = time.perf_counter()
+        try:
+            yield result
+        except BaseException as e:
+            result['outcome'] = TIMEOUT if 'Timeout' in type(e).__name__ else FAILURE
+            raise
+        finally:
+            stack.pop()
+            self.record(phase, time.perf_counter() - start, result['outcome'])
+
+    def set_outcome(self, outcome):
+        """Set the outcome of the innermost open span in this thread
+
+        For code that catches a TimeoutException itself and returns a
+        fallback value, so the span still counts as a timeout.
+        """
+        stack = getattr(self._active, 'spans', None)
+        if stack:
+            stack[-1]['outcome'] = outcome
+
+    def timed(self, phase):
+        """Decorator form of span(); a falsy return value counts as a failure"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(phase) as result:
+                    value = func(*args, **kwargs)
+                    if not value and value is not None and result['outcome'] == SUCCESS:
+                        result['outcome'] = FAILURE
+                    return value
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """Phase latency percentiles (seconds), outcome counts and gauges as a dict"""
+        with self._lock:
+            phases = {phase: histogram.summary() for phase, histogram in self.histograms.items()}
+            counters = {}
+            for (phase, outcome), count in self.counters.items():
+                counters.setdefault(phase, {})[outcome] = count
+            gauges = dict(self.gauges)
+        return {'phases': phases, 'counters': counters, 'gauges': gauges}
+
+    def reset(self):
+        """Forget every sample and counter, e.g. between benchmark runs"""
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Render metrics in the Prometheus text exposition format"""
+        name = f"{self.namespace}_phase_duration_seconds"
+        counter_name = f"{self.namespace}_phase_total"
+        summary = self.summary()
+
+        lines = [f"# HELP {name} Duration of crawler phases.", f"# TYPE {name} summary"]
+        for phase, stats in sorted(summary['phases'].items()):
+            for q in QUANTILES:
+                lines.append(f'{name}{{phase="{phase}",quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {stats["sum"]:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {stats["count"]}')
+
+        lines += [f"# HELP {counter_name} Crawler phase outcomes.", f"# TYPE {counter_name} counter"]
+        for phase, outcomes in sorted(summary['counters'].items()):
+            for outcome, count in sorted(outcomes.items()):
+                lines.append(f'{counter_name}{{phase="{phase}",outcome="{outcome}"}} {count}')
+
+        for gauge, value in sorted(summary['gauges'].items()):
+            lines += [f"# TYPE {self.namespace}_{gauge} gauge", f"{self.namespace}_{gauge} {value:g}"]
+        return '\n'.join(lines) + '\n'
+
+    def serve_prometheus(self, port, host="0.0.0.0"):
+        """Serve /metrics in the background; returns the server (call shutdown() to stop)"""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                body = metrics.to_prometheus().encode('utf-8')
+                self.send_response(200 if self.path.startswith('/metrics') else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+# Process-wide registry used by the crawler modules
+METRICS = Metrics()
+
+# Attributes every LogRecord has; anything else was passed through extra=
+STANDARD_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class StructuredFormatter(logging.Formatter):
+    """Log lines with extra= fields appended as key=value, or whole records as JSON"""
+
+    def __init__(self, json_lines=False):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self.json_lines = json_lines
+
+    def format(self, record):
+        fields = {key: value for key, value in vars(record).items()
+                  if key not in STANDARD_RECORD_ATTRS}
+        if self.json_lines:
+            entry = {
+                'time': self.formatTime(record),
+                'level': record.levelname,
+                'logger': record.name,
+                'message': record.getMessage(),
+                **fields,
+            }
+            if record.exc_info:
+                entry['exception'] = self.formatException(record.exc_info)
+            return json.dumps(entry, ensure_ascii=False, default=str)
+
+        line = super().format(record)
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+def configure_logging(verbosity=0, json_lines=False, stream=None):
+    """Set up structured logging: -1 quiet (warnings), 0 info, 1+ debug (spans)"""
+    level = logging.WARNING if verbosity < 0 else logging.INFO if verbosity == 0 else logging.DEBUG
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(StructuredFormatter(json_lines))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level)
+
+    # Keep third-party chatter out even in debug mode
+    for noisy in ('selenium', 'urllib3', 'WDM'):
+        logging.getLogger(noisy).setLevel(logging.WARNING)
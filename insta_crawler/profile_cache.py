@@ -0,0 +1,235 @@
+# profile_cache.py
+"""TTL + LRU cache in front of the profile lookup"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class SqliteCacheStore:
+    """On-disk second cache level shared across processes and runs"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS profile_cache (
+                    username TEXT PRIMARY KEY,
+                    profile_info TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )""")
+
+    def get(self, username):
+        """Return (profile_info, expires_at) or None"""
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT profile_info, expires_at FROM profile_cache WHERE username = ?",
+                (username,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, username, profile_info, expires_at):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO profile_cache (username, profile_info, expires_at) "
+                "VALUES (?, ?, ?)",
+                (username, json.dumps(profile_info, ensure_ascii=False), expires_at))
+
+    def delete(self, username):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM profile_cache WHERE username = ?", (username,))
+
+    def clear(self):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM profile_cache")
+
+    def summary(self, now=None):
+        """Number of cached profiles and how many are still fresh"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries, fresh = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at > ?), 0) FROM profile_cache",
+                (now,)).fetchone()
+        return {'entries': entries, 'fresh': fresh}
+
+    def close(self):
+        self.connection.close()
+
+class ProfileCache:
+    """Cache profile lookups in an LRU with per-entry TTLs
+
+    lookup is any callable taking a username and returning the profile dict
+    (InstagramCrawler.crawl_profile, ProfileFetcher.get_profile_info, ...).
+    Lookups are serialised because a browser can only do one at a time.
+    Empty results are not cached. With stale_while_revalidate, an expired
+    entry younger than ttl + max_stale is returned at once while a
+    background thread refreshes it.
+    """
+
+    def __init__(self, lookup, max_entries=1024, ttl=3600.0, store=None,
+                 stale_while_revalidate=False, max_stale=None, clock=time.time):
+        self.lookup = lookup
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.store = store
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_stale = max_stale if max_stale is not None else ttl
+        self.clock = clock
+
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'stale_hits': 0, 'evictions': 0, 'refreshes': 0}
+        self._lock = threading.Lock()
+        self._lookup_lock = threading.Lock()
+        self._refreshing = set()
+
+    def _remember(self, username, profile_info, expires_at):
+        """Insert into the LRU, evicting the least recently used entries"""
+        with self._lock:
+            self.entries[username] = (profile_info, expires_at)
+            self.entries.move_to_end(username)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def _cached(self, username):
+        """Return (profile_info, expires_at) from memory or the store, or None"""
+        with self._lock:
+            entry = self.entries.get(username)
+            if entry is not None:
+                self.entries.move_to_end(username)
+                return entry
+
+        if self.store is not None:
+            entry = self.store.get(username)
+            if entry is not None:
+                self._remember(username, *entry)
+                return entry
+        return None
+
+    def put(self, username, profile_info, ttl=None):
+        """Cache profile_info for username for ttl seconds (default: the cache ttl)"""
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        self._remember(username, profile_info, expires_at)
+        if self.store is not None:
+            self.store.set(username, profile_info, expires_at)
+
+    def fetch(self, username, ttl=None):
+        """Look username up bypassing the cache, and cache a non-empty result"""
+        with self._lookup_lock:
+            profile_info = self.lookup(username)
+        if profile_info:
+            self.put(username, profile_info, ttl)
+        return profile_info
+
+    def _refresh(self, username, ttl):
+        try:
+            self.fetch(username, ttl)
+            with self._lock:
+                self.stats['refreshes'] += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Background refresh failed for '{username}': {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(username)
+
+    def _revalidate(self, username, ttl):
+        """Start one background refresh per username"""
+        with self._lock:
+            if username in self._refreshing:
+                return
+            self._refreshing.add(username)
+        threading.Thread(target=self._refresh, args=(username, ttl), daemon=True).start()
+
+    def get(self, username, ttl=None):
+        """Return the profile for username, from cache when fresh"""
+        username = username.strip().lstrip('@')
+        entry = self._cached(username)
+        now = self.clock()
+
+        if entry is not None:
+            profile_info, expires_at = entry
+            if now < expires_at:
+                with self._lock:
+                    self.stats['hits'] += 1
+                return profile_info
+            if self.stale_while_revalidate and now < expires_at + self.max_stale:
+                with self._lock:
+                    self.stats['stale_hits'] += 1
+                self._revalidate(username, ttl)
+                return profile_info
+
+        with self._lock:
+            self.stats['misses'] += 1
+        return self.fetch(username, ttl)
+
+    def crawl_profiles(self, usernames):
+        """Yield (username, profile_info) like InstagramCrawler.crawl_profiles, through the cache"""
+        for username in usernames:
+            username = username.strip().lstrip('@')
+            if not username:
+                continue
+            try:
+                profile_info = self.get(username)
+            except Exception as e:
+                logger.error(f"❌ Error crawling profile '{username}': {e}")
+                profile_info = {}
+            yield username, profile_info
+
+    def invalidate(self, username):
+        with self._lock:
+            self.entries.pop(username, None)
+        if self.store is not None:
+            self.store.delete(username)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+        if self.store is not None:
+            self.store.clear()
+
+    def stats_summary(self):
+        """Counters plus current size and hit ratio"""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self.entries)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        stats['hit_ratio'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        return stats
+
+def main(argv=None, prog=None):
+    """Query or clear an on-disk profile cache without starting a crawler"""
+    parser = argparse.ArgumentParser(prog=prog, description="Inspect a SQLite profile cache")
+    parser.add_argument("path", help="cache database (the crawler's --cache)")
+    parser.add_argument("usernames", nargs="*", help="print these cached profiles as JSON")
+    parser.add_argument("--clear", action="store_true", help="delete every cached profile")
+    args = parser.parse_args(argv)
+
+    store = SqliteCacheStore(args.path)
+    try:
+        if args.clear:
+            store.clear()
+        for username in args.usernames:
+            entry = store.get(username.strip().lstrip('@'))
+            if entry is None:
+                print(json.dumps({'username': username, 'cached': False}))
+            else:
+                profile_info, expires_at = entry
+                print(json.dumps({'username': username, 'cached': True, 'fresh': expires_at > time.time(),
+                                  'profile': profile_info}, ensure_ascii=False))
+        if not args.usernames:
+            print(json.dumps(store.summary()))
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,491 @@
+# profile_parser.py
+"""Parse Instagram profile data from HTML and JSON without a browser
+
+Everything here is pure Python: it works on saved snapshots and fixtures
+with no Chrome and no network.
+"""
+
+import argparse
+import glob
+import html
+import json
+import os
+import re
+from datetime import datetime, timezone
+from html.parser import HTMLParser
+
+from .selector_registry import field_selectors
+
+# Fields every parser fills, matching InstagramCrawler.get_profile_info
+PROFILE_KEYS = ('username', 'posts', 'followers', 'following', 'bio')
+
+# Declarative spec of the fields read from a rendered profile page.
+# selectors: candidate CSS selectors, first match wins (a single 'selector'
+# also works); index: which match to read (default 0);
+# attr: 'text' (default), 'exists' for a boolean flag, or an attribute name.
+PROFILE_FIELDS = {
+    'username': {'selectors': ["header h2", "h2"]},
+    'posts': {'selectors': ["header ul li span", "a span"], 'index': 0},
+    'followers': {'selectors': ["header ul li span", "a span"], 'index': 1},
+    'following': {'selectors': ["header ul li span", "a span"], 'index': 2},
+    'bio': {'selectors': ["div._aa_c span", "header section > div > span[dir='auto']"]},
+    'full_name': {'selectors': ["header h1", "header section span[dir='auto']"]},
+    'verified': {'selectors': ["header svg[aria-label='Verified']"], 'attr': 'exists'},
+    'external_link': {'selectors': ["header a[rel*='nofollow']",
+                                    "header a[href^='https://l.instagram.com']"], 'attr': 'href'},
+    'profile_pic_url': {'selectors': ["header img", "img[alt*='profile picture']"], 'attr': 'src'},
+}
+
+# Reads every field of a spec in one execute_script round-trip. Each field's
+# candidate selectors are tried in order; the first one that matches gives
+# the value (null when none does) and is reported in matched.
+EXTRACT_FIELDS_SCRIPT = """
+const spec = arguments[0];
+const values = {};
+const matched = {};
+for (const [name, field] of Object.entries(spec)) {
+    const attr = field.attr || 'text';
+    values[name] = attr === 'exists' ? false : null;
+    matched[name] = null;
+    for (const selector of field.selectors || [field.selector]) {
+        const node = document.querySelectorAll(selector)[field.index || 0];
+        if (!node) {
+            continue;
+        }
+        matched[name] = selector;
+        if (attr === 'exists') {
+            values[name] = true;
+        } else if (attr === 'text') {
+            values[name] = (node.innerText || node.textContent || '').trim();
+        } else {
+            values[name] = node.getAttribute(attr);
+        }
+        break;
+    }
+}
+return {values: values, matched: matched};
+"""
+
+META_TAG_PATTERN = re.compile(r'<meta\s+[^>]*>', re.IGNORECASE)
+META_ATTR_PATTERN = re.compile(r'([\w:-]+)\s*=\s*"([^"]*)"')
+JSON_SCRIPT_PATTERN = re.compile(
+    r'<script[^>]*type="application/(?:ld\+)?json"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL)
+
+# "1,234 Followers, 56 Following, 78 Posts - See Instagram photos and videos from Name (@user)"
+META_COUNTS_PATTERN = re.compile(
+    r'([\d.,]+[KMB]?)\s+Followers,\s*([\d.,]+[KMB]?)\s+Following,\s*([\d.,]+[KMB]?)\s+Posts',
+    re.IGNORECASE)
+META_USERNAME_PATTERN = re.compile(r'\(@([\w.]+)\)')
+META_BIO_PATTERN = re.compile(r'on Instagram:\s*"(.*)"\s*$', re.DOTALL)
+
+def _find_user(data):
+    """Find the first dict that looks like an Instagram user object"""
+    if isinstance(data, dict):
+        if 'edge_followed_by' in data and 'username' in data:
+            return data
+        for value in data.values():
+            user = _find_user(value)
+            if user is not None:
+                return user
+    elif isinstance(data, list):
+        for value in data:
+            user = _find_user(value)
+            if user is not None:
+                return user
+    return None
+
+def parse_profile_json(data):
+    """Extract profile fields from a web_profile_info/GraphQL JSON payload
+
+    Returns None if the payload contains no user object.
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+
+    user = _find_user(data)
+    if user is None:
+        return None
+
+    return {
+        'username': user.get('username', ''),
+        'posts': str(user.get('edge_owner_to_timeline_media', {}).get('count', '')),
+        'followers': str(user.get('edge_followed_by', {}).get('count', '')),
+        'following': str(user.get('edge_follow', {}).get('count', '')),
+        'bio': user.get('biography') or '',
+        'full_name': user.get('full_name') or '',
+        'verified': bool(user.get('is_verified')),
+        'external_link': user.get('external_url') or '',
+        'profile_pic_url': user.get('profile_pic_url') or '',
+    }
+
+def _iter_media(data):
+    """Yield every dict that looks like a post (GraphQL node or v1 API item)"""
+    if isinstance(data, dict):
+        if 'shortcode' in data and ('taken_at_timestamp' in data or 'edge_liked_by' in data
+                                    or 'edge_media_preview_like' in data):
+            yield data
+            return
+        if 'code' in data and 'taken_at' in data:
+            yield data
+            return
+        for value in data.values():
+            yield from _iter_media(value)
+    elif isinstance(data, list):
+        for value in data:
+            yield from _iter_media(value)
+
+def _edge_count(media, *keys):
+    for key in keys:
+        value = media.get(key)
+        if isinstance(value, dict) and 'count' in value:
+            return value['count']
+        if isinstance(value, int):
+            return value
+    return None
+
+def parse_posts_json(data):
+    """Extract post records from a GraphQL or v1 feed JSON payload
+
+    Records match InstagramCrawler.iter_posts (without the username key).
+    """
+    if isinstance(data, (str, bytes)):
+        data = json.loads(data)
+
+    posts = []
+    for media in _iter_media(data):
+        shortcode = media.get('shortcode') or media.get('code')
+        taken_at = media.get('taken_at_timestamp') or media.get('taken_at')
+
+        caption = media.get('caption')
+        if isinstance(caption, dict):
+            caption = caption.get('text')
+        if caption is None:
+            edges = media.get('edge_media_to_caption', {}).get('edges') or []
+            caption = edges[0]['node'].get('text') if edges else None
+
+        is_reel = media.get('product_type') == 'clips'
+        posts.append({
+            'shortcode': shortcode,
+            'type': 'reel' if is_reel else 'post',
+            'url': f"https://www.instagram.com/{'reel' if is_reel else 'p'}/{shortcode}/",
+            'caption': caption,
+            'taken_at': (datetime.fromtimestamp(taken_at, timezone.utc).isoformat()
+                         if isinstance(taken_at, (int, float)) else None),
+            'likes': _edge_count(media, 'edge_liked_by', 'edge_media_preview_like', 'like_count'),
+            'comments': _edge_count(media, 'edge_media_to_comment', 'comment_count'),
+        })
+    return posts
+
+def _meta_tags(page_html):
+    """Map meta property/name to content for every meta tag in the page"""
+    tags = {}
+    for tag in META_TAG_PATTERN.findall(page_html):
+        attrs = dict(META_ATTR_PATTERN.findall(tag))
+        key = attrs.get('property') or attrs.get('name')
+        if key and 'content' in attrs:
+            tags.setdefault(key, html.unescape(attrs['content']))
+    return tags
+
+def parse_profile_meta(page_html):
+    """Extract profile fields from the og:description/description meta tags
+
+    Returns None if the page has no profile counts in its meta tags.
+    """
+    tags = _meta_tags(page_html)
+    description = tags.get('og:description') or tags.get('description') or ''
+
+    counts = META_COUNTS_PATTERN.search(description)
+    if not counts:
+        return None
+
+    username = META_USERNAME_PATTERN.search(description)
+    bio = META_BIO_PATTERN.search(tags.get('description', ''))
+
+    return {
+        'username': username.group(1) if username else '',
+        'posts': counts.group(3),
+        'followers': counts.group(1),
+        'following': counts.group(2),
+        'bio': bio.group(1) if bio else '',
+    }
+
+def parse_profile_html(page_html):
+    """Extract profile fields from a profile page's embedded JSON or meta tags
+
+    Returns None if neither source has the profile counts.
+    """
+    for script in JSON_SCRIPT_PATTERN.findall(page_html):
+        try:
+            profile_info = parse_profile_json(script)
+        except ValueError:
+            continue
+        if profile_info:
+            return profile_info
+
+    return parse_profile_meta(page_html)
+
+# Elements that never have children or an end tag
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'))
+
+# Open elements closed implicitly when the given element starts (<li>a<li>b)
+IMPLICITLY_CLOSED = {
+    'li': ('li',), 'p': ('p',), 'option': ('option',),
+    'tr': ('tr', 'td', 'th'), 'td': ('td', 'th'), 'th': ('td', 'th'),
+}
+
+# Elements whose text is not part of the rendered page text
+HIDDEN_TEXT_ELEMENTS = frozenset(('script', 'style', 'template', 'noscript'))
+
+class Node:
+    """Minimal DOM element built by DomBuilder"""
+
+    __slots__ = ('tag', 'attrs', 'parent', 'children')
+
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []
+
+    def iter(self):
+        """Yield every descendant element in document order"""
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+                yield from child.iter()
+
+    def text(self):
+        """Rendered text of the element with whitespace collapsed"""
+        parts = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                parts.append(node)
+            elif node.tag not in HIDDEN_TEXT_ELEMENTS:
+                stack.extend(reversed(node.children))
+        return ' '.join(''.join(parts).split())
+
+class DomBuilder(HTMLParser):
+    """Build a Node tree from HTML, tolerating unclosed tags"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Node('#document')
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        while self.current.tag in IMPLICITLY_CLOSED.get(tag, ()):
+            self.current = self.current.parent
+        node = Node(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        node = Node(tag, {name: value or '' for name, value in attrs}, self.current)
+        self.current.children.append(node)
+
+    def handle_endtag(self, tag):
+        # Close up to the nearest open element with this tag; ignore stray end tags
+        node = self.current
+        while node is not self.root and node.tag != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.children.append(data)
+
+def parse_dom(page_html):
+    """Parse HTML into a Node tree"""
+    builder = DomBuilder()
+    builder.feed(page_html)
+    builder.close()
+    return builder.root
+
+SELECTOR_PART_PATTERN = re.compile(
+    r'(?P<tag>[\w*-]+)?(?P<rest>(?:\.[\w-]+|#[\w-]+|\[[^\]]+\])*)$')
+SELECTOR_QUALIFIER_PATTERN = re.compile(r'\.([\w-]+)|#([\w-]+)|\[([^\]]+)\]')
+ATTRIBUTE_PATTERN = re.compile(
+    r'\s*([\w:-]+)\s*(?:([~^$*|]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s\'"]+)))?\s*$')
+
+def _split_selector(selector):
+    """Split one selector into (combinator, compound) steps, outside brackets"""
+    steps, token, combinator, depth, quote = [], '', ' ', 0, None
+    for char in selector.strip() + ' ':
+        if quote:
+            token += char
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+            token += char
+        elif char == '[':
+            depth += 1
+            token += char
+        elif char == ']':
+            depth -= 1
+            token += char
+        elif depth == 0 and (char.isspace() or char == '>'):
+            if token:
+                steps.append((combinator, token))
+                token, combinator = '', ' '
+            if char == '>':
+                combinator = '>'
+        else:
+            token += char
+    return steps
+
+def _compile_compound(compound):
+    """Compile a compound selector like a.cls[href*='x'] into a predicate"""
+    match = SELECTOR_PART_PATTERN.match(compound)
+    if not match:
+        raise ValueError(f"Unsupported selector: {compound}")
+
+    tag = match.group('tag')
+    checks = []
+    for class_name, element_id, attribute in SELECTOR_QUALIFIER_PATTERN.findall(match.group('rest')):
+        if class_name:
+            checks.append(lambda node, c=class_name: c in node.attrs.get('class', '').split())
+        elif element_id:
+            checks.append(lambda node, i=element_id: node.attrs.get('id') == i)
+        else:
+            parts = ATTRIBUTE_PATTERN.match(attribute)
+            if not parts:
+                raise ValueError(f"Unsupported attribute selector: [{attribute}]")
+            name, operator = parts.group(1), parts.group(2)
+            value = next((v for v in parts.group(3, 4, 5) if v is not None), '')
+            checks.append(lambda node, n=name, o=operator, v=value: _match_attribute(node, n, o, v))
+
+    def predicate(node):
+        if tag and tag != '*' and node.tag != tag.lower():
+            return False
+        return all(check(node) for check in checks)
+    return predicate
+
+def _match_attribute(node, name, operator, value):
+    if name not in node.attrs:
+        return False
+    actual = node.attrs[name]
+    if operator is None:
+        return True
+    if operator == '=':
+        return actual == value
+    if operator == '*=':
+        return bool(value) and value in actual
+    if operator == '^=':
+        return bool(value) and actual.startswith(value)
+    if operator == '$=':
+        return bool(value) and actual.endswith(value)
+    if operator == '~=':
+        return value in actual.split()
+    if operator == '|=':
+        return actual == value or actual.startswith(value + '-')
+    return False
+
+def compile_selector(selector):
+    """Compile a CSS selector (groups, descendant and child combinators) into a predicate"""
+    alternatives = []
+    for group in selector.split(','):
+        steps = [(combinator, _compile_compound(compound))
+                 for combinator, compound in _split_selector(group)]
+        if steps:
+            alternatives.append(steps)
+
+    def matches(node, steps):
+        combinator, predicate = steps[-1]
+        if not predicate(node):
+            return False
+        if len(steps) == 1:
+            return True
+        ancestor = node.parent
+        while ancestor is not None and ancestor.tag != '#document':
+            if matches(ancestor, steps[:-1]):
+                return True
+            if combinator == '>':
+                return False
+            ancestor = ancestor.parent
+        return False
+
+    return lambda node: any(matches(node, steps) for steps in alternatives)
+
+def select(root, selector):
+    """Return the elements under root matching selector, in document order"""
+    predicate = compile_selector(selector)
+    return [node for node in root.iter() if predicate(node)]
+
+def extract_fields(root, fields=PROFILE_FIELDS):
+    """Apply a field spec to a parsed page, mirroring EXTRACT_FIELDS_SCRIPT"""
+    result = {}
+    for name, field in fields.items():
+        attr = field.get('attr', 'text')
+        index = field.get('index', 0)
+        result[name] = False if attr == 'exists' else None
+        for selector in field_selectors(field):
+            nodes = select(root, selector)
+            if index >= len(nodes):
+                continue
+            if attr == 'exists':
+                result[name] = True
+            elif attr == 'text':
+                result[name] = nodes[index].text()
+            else:
+                result[name] = nodes[index].attrs.get(attr)
+            break
+    return result
+
+def parse_profile_page(page_html, fields=PROFILE_FIELDS):
+    """Build the get_profile_info dict from page HTML (e.g. driver.page_source)
+
+    Fields missing from the rendered DOM are filled from the page's embedded
+    JSON or meta tags when those have them; anything still missing is
+    "Not found", as in the live crawler.
+    """
+    values = extract_fields(parse_dom(page_html), fields)
+
+    if any(values.get(key) is None for key in PROFILE_KEYS):
+        embedded = parse_profile_html(page_html) or {}
+        for key, value in embedded.items():
+            if key in values and values[key] is None and value != '':
+                values[key] = value
+
+    return {name: "Not found" if value is None else value for name, value in values.items()}
+
+def _parse_snapshot(path):
+    with open(path, encoding='utf-8', errors='replace') as file:
+        return path, parse_profile_page(file.read())
+
+def parse_snapshot_dir(directory, pattern="*.html", workers=None, chunksize=64):
+    """Parse every saved page in directory on a process pool
+
+    Yields (path, profile_info) in sorted path order. workers=1 parses in
+    this process, which is handy for debugging selectors.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, '**', pattern), recursive=True))
+
+    if workers == 1:
+        yield from map(_parse_snapshot, paths)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_parse_snapshot, paths, chunksize=chunksize)
+
+def main(argv=None, prog=None):
+    """Parse a directory of saved profile pages and print one JSON object per page"""
+    parser = argparse.ArgumentParser(prog=prog, description="Extract profiles from saved HTML snapshots")
+    parser.add_argument("directory", help="directory of saved profile pages")
+    parser.add_argument("--pattern", default="*.html", help="snapshot file glob")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes")
+    args = parser.parse_args(argv)
+
+    for path, profile_info in parse_snapshot_dir(args.directory, args.pattern, args.workers):
+        print(json.dumps({'source': path, **profile_info}, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+# scheduler.py
+"""Adaptive re-crawl scheduling: revisit profiles as often as they actually change"""
+
+import argparse
+import heapq
+import json
+import logging
+import math
+import sqlite3
+import time
+
+from .metrics import METRICS, FAILURE
+
+logger = logging.getLogger(__name__)
+
+# Profile fields whose change makes a re-crawl worthwhile
+CHANGE_FIELDS = ('posts', 'followers', 'following', 'bio')
+
+# Outcomes of a re-crawl, counted under the 'recrawl' phase
+FIRST_VISIT = 'first_visit'
+CHANGED = 'changed'
+UNCHANGED = 'unchanged'
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+# Revisits per profile the change rate is estimated from
+HISTORY_SIZE = 20
+
+def fingerprint(profile_info, fields=CHANGE_FIELDS):
+    """The part of a profile that is compared between visits"""
+    return json.dumps({name: profile_info.get(name) for name in fields},
+                      ensure_ascii=False, sort_keys=True)
+
+def estimate_change_rate(history, prior_interval=DAY):
+    """Maximum-likelihood Poisson change rate (per second) from revisits
+
+    history holds (gap in seconds, changed) pairs. A revisit only tells
+    whether at least one change happened in its gap, so the rate solves
+    sum(gap / (exp(rate * gap) - 1) over changed) = sum(gap over unchanged),
+    found by bisection on a log scale. One changed and one unchanged
+    pseudo-revisit of prior_interval keep the estimate finite and start a
+    new profile at about one change per prior_interval.
+    """
+    history = [*history, (prior_interval, True), (prior_interval, False)]
+    unchanged = sum(gap for gap, changed in history if not changed)
+    low, high = math.log(1e-9), 0.0
+    for _ in range(60):
+        middle = (low + high) / 2
+        rate = math.exp(middle)
+        if sum(gap / math.expm1(rate * gap) for gap, changed in history if changed) > unchanged:
+            low = middle
+        else:
+            high = middle
+    return math.exp((low + high) / 2)
+
+class RecrawlScheduler:
+    """Priority queue of next-visit times, spaced by each profile's change rate
+
+    Changes are modelled as a Poisson process per profile, its rate
+    estimated from the last HISTORY_SIZE revisits (estimate_change_rate).
+    The next visit is due when the chance of a change since the last one
+    reaches target, clamped to [min_interval, max_interval]. At most
+    budget_per_hour crawls are handed out per hour (a token bucket); when
+    more profiles are due, the ones most likely to have changed go first
+    and the rest stay due.
+
+    History is kept in SQLite and committed on every visit, so the learnt
+    rates survive restarts.
+    """
+
+    def __init__(self, path=':memory:', budget_per_hour=60, target=0.5,
+                 min_interval=HOUR, max_interval=7 * DAY, prior_interval=DAY,
+                 fields=CHANGE_FIELDS, clock=time.time, sleep=time.sleep):
+        if budget_per_hour < 1:
+            raise ValueError(f"budget_per_hour must be at least 1, got {budget_per_hour}")
+        self.path = path
+        self.budget_per_hour = budget_per_hour
+        self.target = target
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.prior_interval = prior_interval
+        self.fields = fields
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = float(budget_per_hour)
+        self.refilled_at = clock()
+        self.stats = {FIRST_VISIT: 0, CHANGED: 0, UNCHANGED: 0, FAILURE: 0}
+
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS recrawl_schedule (
+                    username TEXT PRIMARY KEY,
+                    next_visit_at REAL NOT NULL,
+                    last_visit_at REAL,
+                    visits INTEGER NOT NULL DEFAULT 0,
+                    rate REAL NOT NULL,
+                    history TEXT NOT NULL DEFAULT '[]',
+                    fingerprint TEXT
+                )""")
+
+        # username -> schedule row; the heap holds (next_visit_at, username)
+        # and entries that no longer match the row are skipped when popped
+        self.profiles = {}
+        for row in self.connection.execute(
+                "SELECT username, next_visit_at, last_visit_at, visits, rate, history, "
+                "fingerprint FROM recrawl_schedule"):
+            username, *values = row
+            profile = self.profiles[username] = dict(zip(
+                ('next_visit_at', 'last_visit_at', 'visits', 'rate', 'history', 'fingerprint'),
+                values))
+            profile['history'] = json.loads(profile['history'])
+        self.heap = [(profile['next_visit_at'], username) for username, profile in self.profiles.items()]
+        heapq.heapify(self.heap)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def add(self, usernames):
+        """Track usernames, due at once; handles already tracked keep their schedule"""
+        now = self.clock()
+        for username in usernames:
+            username = username.strip().lstrip('@')
+            if username and username not in self.profiles:
+                self.profiles[username] = {'next_visit_at': now, 'last_visit_at': None, 'visits': 0,
+                                           'rate': estimate_change_rate([], self.prior_interval),
+                                           'history': [], 'fingerprint': None}
+                heapq.heappush(self.heap, (now, username))
+                self._save(username)
+
+    def _save(self, username):
+        profile = self.profiles[username]
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO recrawl_schedule (username, next_visit_at, last_visit_at, "
+                "visits, rate, history, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, profile['next_visit_at'], profile['last_visit_at'], profile['visits'],
+                 profile['rate'], json.dumps(profile['history']), profile['fingerprint']))
+
+    def change_rate(self, username):
+        """Estimated changes per second"""
+        return self.profiles[username]['rate']
+
+    def change_probability(self, username, now=None):
+        """Chance the profile changed since its last visit (1.0 if never visited)"""
+        profile = self.profiles[username]
+        if profile['last_visit_at'] is None:
+            return 1.0
+        now = self.clock() if now is None else now
+        return -math.expm1(-self.change_rate(username) * max(0.0, now - profile['last_visit_at']))
+
+    def _refill(self, now):
+        self.tokens = min(float(self.budget_per_hour),
+                          self.tokens + (now - self.refilled_at) * self.budget_per_hour / HOUR)
+        self.refilled_at = now
+
+    def _schedule(self, username, next_visit_at):
+        self.profiles[username]['next_visit_at'] = next_visit_at
+        heapq.heappush(self.heap, (next_visit_at, username))
+        self._save(username)
+
+    def due(self, now=None):
+        """Usernames to crawl now, most likely changed first, within the crawl budget"""
+        now = self.clock() if now is None else now
+        self._refill(now)
+
+        ready = []
+        while self.heap and self.heap[0][0] <= now:
+            next_visit_at, username = heapq.heappop(self.heap)
+            if self.profiles[username]['next_visit_at'] == next_visit_at:
+                ready.append(username)
+        ready.sort(key=lambda username: self.change_probability(username, now), reverse=True)
+
+        allowed = min(len(ready), int(self.tokens))
+        self.tokens -= allowed
+        for username in ready[allowed:]:
+            heapq.heappush(self.heap, (self.profiles[username]['next_visit_at'], username))
+        if len(ready) > allowed:
+            logger.debug(f"⏳ {len(ready) - allowed} due profiles wait for the crawl budget")
+        return ready[:allowed]
+
+    def next_wake_at(self, now=None):
+        """When due() can next return something, or None if nothing is tracked"""
+        while self.heap and self.profiles[self.heap[0][1]]['next_visit_at'] != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        now = self.clock() if now is None else now
+        self._refill(now)
+        token_at = now + max(0.0, 1 - self.tokens) * HOUR / self.budget_per_hour
+        return max(self.heap[0][0], token_at)
+
+    def record(self, username, profile_info, now=None):
+        """Update a profile's history with a crawl result and schedule its next visit"""
+        now = self.clock() if now is None else now
+        profile = self.profiles[username]
+
+        if not profile_info:
+            outcome = FAILURE
+            self.stats[outcome] += 1
+            METRICS.increment('recrawl', outcome)
+            self._schedule(username, now + self.min_interval)
+            return outcome
+
+        current = fingerprint(profile_info, self.fields)
+        if profile['last_visit_at'] is None or profile['fingerprint'] is None:
+            outcome = FIRST_VISIT
+        else:
+            outcome = CHANGED if current != profile['fingerprint'] else UNCHANGED
+            gap = max(0.0, now - profile['last_visit_at'])
+            profile['history'] = [*profile['history'], (gap, outcome == CHANGED)][-HISTORY_SIZE:]
+            profile['rate'] = estimate_change_rate(profile['history'], self.prior_interval)
+
+        profile['last_visit_at'] = now
+        profile['visits'] += 1
+        profile['fingerprint'] = current
+        self.stats[outcome] += 1
+        METRICS.increment('recrawl', outcome)
+
+        interval = -math.log1p(-self.target) / self.change_rate(username)
+        self._schedule(username, now + min(self.max_interval, max(self.min_interval, interval)))
+        return outcome
+
+    def crawl(self, crawl_profiles, usernames=(), forever=False):
+        """Crawl due profiles within the budget, recording each result as it arrives
+
+        crawl_profiles has the InstagramCrawler.crawl_profiles contract. Without
+        forever, returns once nothing is due; with it, sleeps until the next
+        visit or budget token and keeps going. Yields the same pairs as
+        crawl_profiles.
+        """
+        self.add(usernames)
+
+        while True:
+            batch = self.due()
+            if not batch:
+                wake_at = self.next_wake_at()
+                if wake_at is None or not forever:
+                    return
+                self.sleep(max(0.0, wake_at - self.clock()))
+                continue
+
+            for username, profile_info in crawl_profiles(batch):
+                self.record(username, profile_info)
+                yield username, profile_info
+            self.publish_metrics()
+
+    def stats_summary(self, now=None):
+        """Crawl cost (visits per outcome) against freshness
+
+        expected_freshness is the mean chance that a stored profile is still
+        current; change_yield is the share of re-crawls that found a change.
+        """
+        now = self.clock() if now is None else now
+        visited = [username for username, profile in self.profiles.items()
+                   if profile['last_visit_at'] is not None]
+        revisits = self.stats[CHANGED] + self.stats[UNCHANGED]
+        return {
+            **self.stats,
+            'tracked': len(self.profiles),
+            'due': sum(profile['next_visit_at'] <= now for profile in self.profiles.values()),
+            'change_yield': self.stats[CHANGED] / revisits if revisits else 0.0,
+            'expected_freshness': (sum(1 - self.change_probability(username, now) for username in visited)
+                                   / len(visited) if visited else 0.0),
+        }
+
+    def publish_metrics(self, now=None):
+        """Export tracked/due counts, change yield and expected freshness as gauges"""
+        summary = self.stats_summary(now)
+        for name in ('tracked', 'due', 'change_yield', 'expected_freshness'):
+            METRICS.set_gauge(f"recrawl_{name}", summary[name])
+        return summary
+
+    def upcoming(self, limit=None):
+        """(username, next_visit_at, change rate per day) by next visit"""
+        ordered = sorted(self.profiles.items(), key=lambda item: item[1]['next_visit_at'])
+        return [(username, profile['next_visit_at'], self.change_rate(username) * DAY)
+                for username, profile in ordered[:limit]]
+
+    def close(self):
+        self.connection.close()
+
+def main(argv=None, prog=None):
+    """Show a re-crawl schedule without starting a crawler"""
+    parser = argparse.ArgumentParser(prog=prog, description="Inspect a re-crawl schedule")
+    parser.add_argument("path", help="schedule database (the crawler's --recrawl)")
+    parser.add_argument("--limit", type=int, default=20, help="upcoming visits to list")
+    args = parser.parse_args(argv)
+
+    with RecrawlScheduler(args.path) as scheduler:
+        print(json.dumps(scheduler.stats_summary()))
+        for username, next_visit_at, rate in scheduler.upcoming(args.limit):
+            print(json.dumps({'username': username, 'next_visit_at': next_visit_at,
+                              'changes_per_day': round(rate, 3)}))
+
+if __name__ == "__main__":
+    main()
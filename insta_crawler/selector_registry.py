@@ -0,0 +1,123 @@
+# selector_registry.py
+"""Candidate selectors per logical field, with selectors that stopped matching tried last"""
+
+import json
+import os
+import threading
+
+# Consecutive misses after which a selector is tried after the others
+MAX_MISSES = 5
+
+# Every this many lookups of a field the declared order is used, so a
+# demoted selector is checked again and recovers on its first hit
+RECHECK_EVERY = 10
+
+# Returns [element, selector] for the first candidate in arguments[0] with a
+# matching element (displayed and enabled when arguments[1] is true), or null.
+# Every candidate is checked in the same round-trip.
+FIND_FIRST_SCRIPT = """
+const [selectors, interactable] = arguments;
+for (const selector of selectors) {
+    for (const node of document.querySelectorAll(selector)) {
+        if (!interactable || (node.getClientRects().length > 0 && !node.disabled)) {
+            return [node, selector];
+        }
+    }
+}
+return null;
+"""
+
+def field_selectors(field):
+    """Candidate selectors of a field spec entry ('selectors' list or a single 'selector')"""
+    return list(field.get('selectors') or [field['selector']])
+
+class SelectorRegistry:
+    """Learn which selectors stopped working for each field and try them last
+
+    Candidates are tried in declared order, as earlier ones are the more
+    precise selectors. Only a selector that missed max_misses lookups in a
+    row (markup changed) is moved behind the others; every recheck_every
+    lookups the declared order is used again, and a hit puts the selector
+    back in its place. A loose fallback therefore never takes over a field
+    just because a few profiles lacked the element. Hit and miss counts are
+    kept for export. Safe to share between threads.
+    """
+
+    def __init__(self, max_misses=MAX_MISSES, recheck_every=RECHECK_EVERY):
+        self.max_misses = max_misses
+        self.recheck_every = recheck_every
+        self.lookups = {}
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def order(self, field, candidates):
+        """Return candidates in declared order, failing ones last unless it is a recheck"""
+        with self._lock:
+            lookups = self.lookups[field] = self.lookups.get(field, 0) + 1
+            stats = self.stats.get(field, {})
+            failing = {selector for selector in candidates
+                       if stats.get(selector, {}).get('streak', 0) >= self.max_misses}
+        if not failing or lookups % self.recheck_every == 0:
+            return list(candidates)
+        return ([selector for selector in candidates if selector not in failing]
+                + [selector for selector in candidates if selector in failing])
+
+    def record(self, field, tried, matched):
+        """Record a lookup: tried in order, matched is the selector that hit (or None)
+
+        Candidates tried before matched missed; the ones after it were not
+        needed and are left alone.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(field, {})
+            for selector in tried:
+                hit = selector == matched
+                counts = stats.setdefault(selector, {'hits': 0, 'misses': 0, 'streak': 0})
+                counts['hits' if hit else 'misses'] += 1
+                counts['streak'] = 0 if hit else counts['streak'] + 1
+                if hit:
+                    break
+
+    def order_fields(self, fields):
+        """Copy a field spec with each field's candidates in 'selectors', best first"""
+        return {name: {**field, 'selectors': self.order(name, field_selectors(field))}
+                for name, field in fields.items()}
+
+    def stats_summary(self):
+        """Per field and selector: hits, misses, hit_rate and streak (misses in a row)"""
+        with self._lock:
+            summary = {}
+            for field, stats in self.stats.items():
+                summary[field] = {}
+                for selector, counts in stats.items():
+                    lookups = counts['hits'] + counts['misses']
+                    summary[field][selector] = {
+                        **counts,
+                        'hit_rate': counts['hits'] / lookups if lookups else 0.0,
+                    }
+        return summary
+
+    def save(self, path):
+        """Write stats so the next run knows which selectors stopped working"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(self.stats_summary(), file, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def load(self, path):
+        """Restore what save() wrote; a missing or unreadable file is ignored"""
+        try:
+            with open(path, encoding='utf-8') as file:
+                saved = json.load(file)
+        except (OSError, ValueError):
+            return False
+        with self._lock:
+            for field, selectors in saved.items():
+                for selector, entry in selectors.items():
+                    self.stats.setdefault(field, {})[selector] = {
+                        'hits': entry['hits'], 'misses': entry['misses'],
+                        'streak': entry.get('streak', 0)}
+        return True
+
+# Process-wide registry, so every crawler in a pool learns from the others
+SELECTORS = SelectorRegistry()
@@ -0,0 +1,223 @@
+# sinks.py
+"""Stream crawl results to JSON Lines, CSV or SQLite as they are extracted"""
+
+import csv
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+
+from .profile_parser import PROFILE_FIELDS
+
+# Profile fields that hold counts and are stored as integers
+COUNT_FIELDS = ('posts', 'followers', 'following')
+
+# Column order for tabular sinks
+RECORD_FIELDS = ('source_username', 'crawled_at') + tuple(PROFILE_FIELDS)
+
+COUNT_PATTERN = re.compile(r'^([\d.,\s]+)\s*([KMB])?$', re.IGNORECASE)
+COUNT_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+def normalize_count(value):
+    """Turn a displayed count ("1.2M", "61,510", "10K") into an int, or None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+
+    match = COUNT_PATTERN.match(str(value).strip())
+    if not match:
+        return None
+
+    number, suffix = match.group(1), match.group(2)
+    number = number.replace(' ', '')
+    if suffix:
+        # Abbreviated counts use "," only as a decimal separator in some locales
+        number = number.replace(',', '.') if '.' not in number else number.replace(',', '')
+        try:
+            return round(float(number) * COUNT_MULTIPLIERS[suffix.upper()])
+        except ValueError:
+            return None
+
+    digits = number.replace(',', '').replace('.', '')
+    return int(digits) if digits.isdigit() else None
+
+def make_record(username, profile_info, crawled_at=None):
+    """Build an output record: source username, UTC crawl time and normalised fields"""
+    if crawled_at is None:
+        crawled_at = datetime.now(timezone.utc)
+
+    record = {
+        'source_username': username,
+        'crawled_at': crawled_at.isoformat(timespec='seconds'),
+    }
+    for key, value in profile_info.items():
+        if key in COUNT_FIELDS:
+            value = normalize_count(value)
+        elif value == "Not found":
+            value = None
+        record[key] = value
+    return record
+
+class ResultSink:
+    """Buffered record writer
+
+    Records are written in batches of batch_size, or sooner once
+    sync_interval seconds have passed since the last sync, and made
+    durable (fsync) at most every sync_interval seconds, plus once on
+    close. A slow crawl therefore never holds more than sync_interval
+    seconds of records in memory.
+    """
+
+    def __init__(self, batch_size=100, sync_interval=5.0):
+        self.batch_size = batch_size
+        self.sync_interval = sync_interval
+        self.buffer = []
+        self.written = 0
+        self._last_sync = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, record):
+        """Queue one record, writing the batch once it is full or the sync interval has passed"""
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size or self._sync_due():
+            self.flush()
+
+    def _sync_due(self):
+        return self.sync_interval is not None and time.monotonic() - self._last_sync >= self.sync_interval
+
+    def flush(self):
+        """Write buffered records, syncing if the sync interval has passed"""
+        if self.buffer:
+            self._write_batch(self.buffer)
+            self.written += len(self.buffer)
+            self.buffer = []
+
+        if self._sync_due():
+            self.sync()
+
+    def sync(self):
+        """Force written records to disk"""
+        self._sync()
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Write what is left, sync and release the underlying file"""
+        self.flush()
+        self.sync()
+        self._close()
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def _sync(self):
+        pass
+
+    def _close(self):
+        pass
+
+class FileSink(ResultSink):
+    """Base for sinks that append to a text file (or stdout for '-')"""
+
+    def __init__(self, path, **options):
+        super().__init__(**options)
+        self.path = path
+        # Remembered rather than compared with sys.stdout, which may be redirected later
+        self.to_stdout = path == '-'
+        if self.to_stdout:
+            self.file = sys.stdout
+        else:
+            self.file = open(path, 'a', encoding='utf-8', newline='')
+
+    def _sync(self):
+        self.file.flush()
+        if not self.to_stdout:
+            os.fsync(self.file.fileno())
+
+    def _close(self):
+        if not self.to_stdout:
+            self.file.close()
+
+class JsonlSink(FileSink):
+    """One JSON object per line"""
+
+    def _write_batch(self, records):
+        self.file.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+class CsvSink(FileSink):
+    """CSV with a header row; columns follow RECORD_FIELDS"""
+
+    def __init__(self, path, fields=RECORD_FIELDS, **options):
+        super().__init__(path, **options)
+        self.writer = csv.DictWriter(self.file, fieldnames=list(fields), extrasaction='ignore')
+        if self.to_stdout or self.file.tell() == 0:
+            self.writer.writeheader()
+
+    def _write_batch(self, records):
+        self.writer.writerows(records)
+
+class SqliteSink(ResultSink):
+    """Rows in a SQLite table, one column per record field
+
+    The database runs in WAL mode with synchronous=NORMAL, so each batch is
+    a cheap commit and sync() checkpoints the log to the main file.
+    """
+
+    def __init__(self, path, table='profiles', fields=RECORD_FIELDS, **options):
+        super().__init__(**options)
+        self.path = path
+        self.table = table
+        self.fields = list(fields)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        columns = ', '.join(f'"{field}"' for field in self.fields)
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({columns})')
+        self.insert_sql = (f'INSERT INTO "{table}" ({columns}) '
+                           f'VALUES ({", ".join("?" for _ in self.fields)})')
+
+    def _write_batch(self, records):
+        rows = [tuple(self._column_value(record.get(field)) for field in self.fields)
+                for record in records]
+        with self.connection:
+            self.connection.executemany(self.insert_sql, rows)
+
+    @staticmethod
+    def _column_value(value):
+        if isinstance(value, bool):
+            return int(value)
+        return value
+
+    def _sync(self):
+        self.connection.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def _close(self):
+        self.connection.close()
+
+SINK_FORMATS = {
+    'jsonl': JsonlSink,
+    'csv': CsvSink,
+    'sqlite': SqliteSink,
+}
+
+SINK_EXTENSIONS = {
+    '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.json': 'jsonl',
+    '.csv': 'csv',
+    '.db': 'sqlite', '.sqlite': 'sqlite', '.sqlite3': 'sqlite',
+}
+
+def open_sink(path, format=None, **options):
+    """Open a sink for path, picking the format from the extension if not given"""
+    if format is None:
+        format = SINK_EXTENSIONS.get(os.path.splitext(path)[1].lower(), 'jsonl')
+    if format not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format: {format}")
+    return SINK_FORMATS[format](path, **options)
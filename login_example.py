@@ -1,8 +1,8 @@
 # login_example.py
 """Example script demonstrating Instagram login functionality"""
 
-from instagram_crawler import InstagramCrawler
-from login_utils import get_login_credentials, validate_credentials, SecureCredentials
+from insta_crawler.crawler import InstagramCrawler
+from insta_crawler.login_utils import get_login_credentials, validate_credentials, SecureCredentials, SessionStore
 import time
 
 def demo_login():
@@ -10,7 +10,8 @@ def demo_login():
     print("🔐 Instagram Login Demo")
     print("=" * 40)
     
-    crawler = InstagramCrawler()
+    # Reuse the saved session when it is still valid; keep the window visible for the demo
+    crawler = InstagramCrawler(headless=False, session_store=SessionStore())
     
     try:
         # Method 1: Get credentials interactively
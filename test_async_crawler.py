@@ -0,0 +1,91 @@
+# test_async_crawler.py
+"""Tests for the asyncio front end, with a fake crawler instead of Chrome"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from insta_crawler import async_crawler
+from insta_crawler.async_crawler import AsyncInstagramCrawler
+
+class FakeCrawler:
+    """Stands in for InstagramCrawler; 'boom' raises, lookups track their overlap"""
+
+    lock = threading.Lock()
+
+    def __init__(self, **options):
+        self.is_logged_in = False
+        self.logins = []
+        self.closed = False
+        with FakeCrawler.lock:
+            FakeCrawler.launched.append(self)
+
+    def login(self, username, password):
+        self.logins.append(username)
+        self.is_logged_in = True
+        return True
+
+    def handle_login_challenges(self):
+        pass
+
+    def visit_instagram(self):
+        pass
+
+    def crawl_profile(self, username):
+        with FakeCrawler.lock:
+            FakeCrawler.active += 1
+            FakeCrawler.peak = max(FakeCrawler.peak, FakeCrawler.active)
+        try:
+            time.sleep(0.01)
+            if username == 'boom':
+                raise RuntimeError("browser crashed")
+            return {'username': username}
+        finally:
+            with FakeCrawler.lock:
+                FakeCrawler.active -= 1
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_crawler(monkeypatch):
+    monkeypatch.setattr(async_crawler, 'InstagramCrawler', FakeCrawler)
+    monkeypatch.setattr(FakeCrawler, 'launched', [], raising=False)
+    monkeypatch.setattr(FakeCrawler, 'active', 0, raising=False)
+    monkeypatch.setattr(FakeCrawler, 'peak', 0, raising=False)
+    return FakeCrawler
+
+def test_results_in_input_order_within_max_browsers(fake_crawler):
+    usernames = [f"user_{index}" for index in range(12)]
+    usernames.insert(5, 'boom')
+    results = async_crawler.crawl_profiles(usernames, max_browsers=3)
+
+    assert [username for username, _ in results] == usernames
+    assert [profile_info.get('username') for _, profile_info in results] == [
+        None if username == 'boom' else username for username in usernames]
+    assert len(fake_crawler.launched) <= 3 and fake_crawler.peak <= 3
+    assert all(crawler.closed for crawler in fake_crawler.launched)
+
+def test_login_logs_in_idle_browsers(fake_crawler):
+    async def run():
+        async with AsyncInstagramCrawler(max_browsers=2) as crawler:
+            await crawler.crawl_profiles(['a', 'b', 'c'])
+            assert await crawler.login('me', 'secret')
+            return crawler.crawlers
+
+    crawlers = asyncio.run(run())
+    assert len(crawlers) == 2
+    assert all(crawler.logins == ['me'] for crawler in crawlers)
+
+def test_instance_built_outside_the_event_loop(fake_crawler):
+    crawler = AsyncInstagramCrawler(max_browsers=2)
+
+    async def run():
+        try:
+            return await crawler.crawl_profiles(['a', 'b', 'c', 'd'])
+        finally:
+            await crawler.close()
+
+    assert [username for username, _ in asyncio.run(run())] == ['a', 'b', 'c', 'd']
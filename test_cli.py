@@ -0,0 +1,157 @@
+# test_cli.py
+"""Tests for the insta-crawler entry point"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from insta_crawler import cli
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def loaded_modules(*args):
+    """Modules a fresh interpreter has loaded after running cli.main(args)"""
+    probe = ("import sys, json\nfrom insta_crawler import cli\n"
+             "try:\n    cli.main(sys.argv[1:])\nexcept SystemExit:\n    pass\n"
+             "sys.stderr.write(json.dumps(sorted(sys.modules)))")
+    result = subprocess.run([sys.executable, "-c", probe, *args], cwd=HERE,
+                            capture_output=True, text=True, check=True)
+    return set(json.loads(result.stderr.strip().splitlines()[-1]))
+
+def test_light_commands_do_not_load_the_browser_stack(tmp_path):
+    for args in (["--help"], ["parse-offline", str(tmp_path)], ["cache", str(tmp_path / "cache.db")],
+                 ["creds", "--help"], ["schedule", str(tmp_path / "schedule.db")]):
+        modules = loaded_modules(*args)
+        assert not {'selenium', 'cryptography', 'requests'} & modules, args
+
+    # Browser commands only load the parts of selenium they need up front
+    modules = loaded_modules("crawl", "--help")
+    assert 'selenium.webdriver.support.expected_conditions' not in modules
+
+def test_cache_command_reports_entries(tmp_path, capsys):
+    from insta_crawler.profile_cache import SqliteCacheStore
+
+    path = str(tmp_path / "cache.db")
+    store = SqliteCacheStore(path)
+    store.set('alice', {'username': 'alice'}, expires_at=4102444800)
+    store.close()
+
+    argv = list(sys.argv)
+    cli.main(["cache", path])
+    cli.main(["cache", path, "alice"])
+    assert sys.argv == argv
+    summary, entry = capsys.readouterr().out.splitlines()
+    assert json.loads(summary) == {'entries': 1, 'fresh': 1}
+    assert json.loads(entry)['profile'] == {'username': 'alice'}
+
+def test_http_fetcher_does_not_load_selenium():
+    probe = "import sys, json\nimport insta_crawler.http_fetcher\nsys.stderr.write(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=HERE,
+                            capture_output=True, text=True, check=True)
+    modules = set(json.loads(result.stderr.strip().splitlines()[-1]))
+    assert not {'selenium', 'insta_crawler.crawler'} & modules
+
+def test_records_on_stdout_are_not_mixed_with_status_lines(capsys):
+    """With '-o -' every stdout line is a record; status goes to the log"""
+    from insta_crawler.crawler import print_batch
+    from insta_crawler.sinks import open_sink
+
+    sink = open_sink('-', 'jsonl')
+    print_batch([('alice', {'username': 'alice'}), ('ghost', {})], sink)
+    sink.close()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)['source_username'] for line in lines] == ['alice']
+
+def test_recrawl_budget_below_one_is_rejected(capsys):
+    from insta_crawler.crawler import parse_args
+
+    assert parse_args(["--recrawl", "schedule.db", "--recrawl-budget", "1"], batch=True).recrawl_budget == 1
+    with pytest.raises(SystemExit):
+        parse_args(["--recrawl", "schedule.db", "--recrawl-budget", "0"], batch=True)
+    assert "--recrawl-budget must be at least 1" in capsys.readouterr().err
+
+def test_journal_retry_options():
+    from insta_crawler.crawler import parse_args
+
+    args = parse_args(["--journal", "journal.db"], batch=True)
+    assert (args.retry_backoff, args.wait_retries) == (30.0, True)
+    args = parse_args(["--journal", "journal.db", "--retry-backoff", "5", "--no-wait-retries"], batch=True)
+    assert (args.retry_backoff, args.wait_retries) == (5.0, False)
+
+class LoginCrawler:
+    """Records which login path prompt_login took"""
+
+    def __init__(self, saved_sessions=()):
+        self.saved_sessions = set(saved_sessions)
+        self.calls = []
+
+    def restore_session(self, username):
+        self.calls.append(('restore', username))
+        return username in self.saved_sessions
+
+    def login(self, username, password):
+        self.calls.append(('login', username, password))
+        return True
+
+    def handle_login_challenges(self):
+        self.calls.append(('challenges',))
+
+def test_prompt_login_only_asks_for_the_password_without_a_saved_session(monkeypatch):
+    from insta_crawler import crawler
+
+    answers = iter(["y", "alice", "y", "bob"])
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(answers))
+    passwords = []
+    monkeypatch.setattr(crawler.getpass, 'getpass', lambda prompt="": passwords.append(prompt) or "secret")
+
+    fake = LoginCrawler(saved_sessions={'alice'})
+    assert crawler.prompt_login(fake)
+    assert fake.calls == [('restore', 'alice')] and passwords == []
+
+    fake.calls.clear()
+    assert crawler.prompt_login(fake)
+    assert fake.calls == [('restore', 'bob'), ('login', 'bob', 'secret'), ('challenges',)]
+    assert len(passwords) == 1
+
+class InteractiveCrawler:
+    """Stands in for InstagramCrawler in the interactive mode"""
+
+    is_logged_in = False
+
+    def __init__(self, **options):
+        pass
+
+    def visit_instagram(self):
+        pass
+
+    def crawl_profile(self, username):
+        return {'username': username, 'followers': '10'}
+
+    def close(self):
+        pass
+
+def test_interactive_mode_keeps_prompts_off_stdout_records(monkeypatch, capsys):
+    from insta_crawler import crawler
+
+    monkeypatch.setattr(crawler, 'InstagramCrawler', InteractiveCrawler)
+    monkeypatch.setattr(crawler, 'configure_logging', lambda *args, **kwargs: None)
+    answers = iter(["n", "alice", ""])
+
+    def fake_input(prompt=""):
+        # Like input(), the prompt goes to whatever sys.stdout is
+        sys.stdout.write(prompt)
+        return next(answers)
+
+    monkeypatch.setattr('builtins.input', fake_input)
+    crawler.main(["-o", "-", "--no-session-cache"])
+    captured = capsys.readouterr()
+    assert [json.loads(line)['username'] for line in captured.out.splitlines()] == ['alice']
+    assert "PROFILE INFORMATION" in captured.err and "Press Enter" in captured.err
+
+def test_subcommand_usage_names_the_command(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["schedule", "--help"])
+    assert capsys.readouterr().out.startswith("usage: insta-crawler schedule")
@@ -0,0 +1,68 @@
+# test_crawl_state.py
+"""Tests for the resumable crawl journal"""
+
+from insta_crawler.crawl_state import CrawlJournal, DONE, FAILED, MISSING, PENDING
+from insta_crawler.defaults import MissingProfile
+
+def test_restart_skips_completed_usernames(tmp_path):
+    """A rerun after an interruption only crawls the unfinished tail"""
+    path = str(tmp_path / 'journal.db')
+    crawled = []
+
+    def crawl_profiles(usernames):
+        for username in usernames:
+            crawled.append(username)
+            if username == 'c':
+                raise KeyboardInterrupt
+            yield username, {'username': username}
+
+    with CrawlJournal(path) as journal:
+        try:
+            list(journal.crawl(crawl_profiles, ['a', 'b', 'c', 'd']))
+        except KeyboardInterrupt:
+            pass
+        assert journal.counts() == {PENDING: 2, DONE: 2, FAILED: 0, MISSING: 0}
+
+    crawled.clear()
+    with CrawlJournal(path) as journal:
+        results = list(journal.crawl(lambda names: ((n, {'username': n}) for n in names),
+                                     ['a', 'b', 'c', 'd']))
+        assert [username for username, _ in results] == ['c', 'd']
+        assert [username for username, _ in journal.results()] == ['a', 'b', 'c', 'd']
+
+def test_failures_are_retried_with_backoff(tmp_path, clock):
+    """Empty results are retried after an exponentially growing delay, up to max_attempts"""
+    attempts = []
+
+    def crawl_profiles(usernames):
+        for username in usernames:
+            attempts.append(clock.now)
+            yield username, ({'username': username} if username == 'ok' else {})
+
+    with CrawlJournal(str(tmp_path / 'journal.db'), max_attempts=3, backoff=10,
+                      clock=clock.time, sleep=clock.sleep) as journal:
+        list(journal.crawl(crawl_profiles, ['ok', 'broken']))
+        assert journal.counts() == {PENDING: 0, DONE: 1, FAILED: 1, MISSING: 0}
+
+    # ok once, then broken at t, t+10, t+30
+    assert [when - attempts[1] for when in attempts[1:]] == [0, 10, 30]
+
+def test_missing_profiles_are_not_retried(tmp_path, clock):
+    """A handle that does not exist is final; without waiting, failures are left for a rerun"""
+    crawled = []
+
+    def crawl_profiles(usernames):
+        for username in usernames:
+            crawled.append(username)
+            yield username, MissingProfile() if username == 'gone' else {}
+
+    path = str(tmp_path / 'journal.db')
+    with CrawlJournal(path, wait_for_retries=False, clock=clock.time, sleep=clock.sleep) as journal:
+        list(journal.crawl(crawl_profiles, ['gone', 'flaky']))
+        assert journal.counts() == {PENDING: 0, DONE: 0, FAILED: 1, MISSING: 1}
+    assert crawled == ['gone', 'flaky'] and clock.now == 1000.0
+
+    clock.sleep(60)
+    with CrawlJournal(path, clock=clock.time, sleep=clock.sleep) as journal:
+        list(journal.crawl(crawl_profiles))
+    assert crawled[2:] == ['flaky', 'flaky']
@@ -0,0 +1,60 @@
+# test_crawler_pool.py
+"""Tests for the multi-browser crawler pool, with a fake crawler instead of Chrome"""
+
+import os
+
+import pytest
+
+from insta_crawler import crawler_pool
+from insta_crawler.crawler_pool import CrawlerPool
+
+class FakeCrawler:
+    """Stands in for InstagramCrawler; a 'worker-<fail_worker>' profile fails to launch"""
+
+    fail_worker = None
+    launched = []
+
+    def __init__(self, user_data_dir=None, **options):
+        if user_data_dir.endswith(f"worker-{FakeCrawler.fail_worker}"):
+            # What InstagramCrawler.setup_driver does when Chrome cannot start
+            raise SystemExit(1)
+        os.makedirs(user_data_dir)
+        self.closed = False
+        FakeCrawler.launched.append(self)
+
+    def visit_instagram(self):
+        pass
+
+    def crawl_profiles(self, usernames):
+        for username in usernames:
+            yield username, {} if username.startswith('broken') else {'username': username}
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_crawler(monkeypatch):
+    monkeypatch.setattr(crawler_pool, 'InstagramCrawler', FakeCrawler)
+    monkeypatch.setattr(FakeCrawler, 'fail_worker', None)
+    monkeypatch.setattr(FakeCrawler, 'launched', [])
+    return FakeCrawler
+
+def test_results_keep_input_order(fake_crawler):
+    usernames = [f"user_{index}" for index in range(20)] + ['broken_1']
+    with CrawlerPool(workers=3) as pool:
+        results = pool.crawl(usernames)
+        profile_root = pool.profile_root
+    assert [result.get('username') for result in results] == usernames[:-1] + [None]
+    assert all(crawler.closed for crawler in fake_crawler.launched)
+    assert not os.path.exists(profile_root)
+
+def test_failed_launch_closes_the_started_workers(fake_crawler):
+    fake_crawler.fail_worker = 1
+    pool = CrawlerPool(workers=3)
+    with pytest.raises(SystemExit):
+        with pool:
+            pass
+    # Worker 2 may be cancelled before it starts; whatever started is closed
+    assert fake_crawler.launched
+    assert all(crawler.closed for crawler in fake_crawler.launched)
+    assert pool.crawlers == [] and pool.profile_root is None
@@ -0,0 +1,54 @@
+# test_driver_manifest.py
+"""Tests for offline chromedriver resolution"""
+
+import os
+import stat
+
+import pytest
+
+from insta_crawler.driver_manifest import (CHROMEDRIVER_ENV, MANIFEST_ENV, load_manifest, resolve_chromedriver,
+                             write_manifest)
+
+def fake_driver(directory, name="chromedriver"):
+    """An executable that answers --version like chromedriver"""
+    directory.mkdir(exist_ok=True)
+    path = directory / name
+    path.write_text("#!/bin/sh\necho 'ChromeDriver 124.0.6367.91'\n")
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
+
+@pytest.fixture
+def drivers(tmp_path, monkeypatch):
+    """Override, manifest and PATH drivers, with the environment pointing at none of them yet"""
+    monkeypatch.delenv(CHROMEDRIVER_ENV, raising=False)
+    monkeypatch.setenv(MANIFEST_ENV, str(tmp_path / "manifest.json"))
+    on_path = fake_driver(tmp_path / "bin")
+    monkeypatch.setenv("PATH", str(tmp_path / "bin"))
+    return {'override': fake_driver(tmp_path / "override"), 'manifest': fake_driver(tmp_path / "cache"),
+            'path': on_path}
+
+def test_precedence_is_override_then_manifest_then_path(drivers, monkeypatch):
+    assert resolve_chromedriver() == drivers['path']
+
+    manifest = write_manifest(drivers['manifest'])
+    assert manifest['version'] == 'ChromeDriver 124.0.6367.91'
+    assert load_manifest() == manifest
+    assert resolve_chromedriver() == drivers['manifest']
+
+    monkeypatch.setenv(CHROMEDRIVER_ENV, drivers['override'])
+    assert resolve_chromedriver() == drivers['override']
+
+def test_missing_override_raises(drivers, monkeypatch, tmp_path):
+    write_manifest(drivers['manifest'])
+    monkeypatch.setenv(CHROMEDRIVER_ENV, str(tmp_path / "deleted"))
+    with pytest.raises(FileNotFoundError):
+        resolve_chromedriver()
+
+def test_manifest_with_deleted_binary_falls_back_to_path(drivers, monkeypatch, tmp_path):
+    write_manifest(drivers['manifest'])
+    os.remove(drivers['manifest'])
+    assert resolve_chromedriver() == drivers['path']
+
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+    with pytest.raises(FileNotFoundError):
+        resolve_chromedriver()
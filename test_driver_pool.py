@@ -0,0 +1,70 @@
+# test_driver_pool.py
+"""Tests for the warm browser pool, with a fake crawler instead of Chrome"""
+
+import itertools
+
+import pytest
+
+from insta_crawler import driver_pool
+from insta_crawler.driver_pool import DriverPool
+
+class FakeCrawler:
+    """Stands in for InstagramCrawler; launches fail while fail_launches is set"""
+
+    ids = itertools.count()
+    fail_launches = False
+
+    def __init__(self, **options):
+        if FakeCrawler.fail_launches:
+            # What InstagramCrawler.setup_driver does when Chrome cannot start
+            raise SystemExit(1)
+        self.id = next(FakeCrawler.ids)
+        self.pages_loaded = 0
+        self.closed = False
+
+    def visit_instagram(self):
+        self.pages_loaded += 1
+
+    def reset_state(self):
+        pass
+
+    def crawl_profile(self, username):
+        self.pages_loaded += 1
+        return {'username': username, 'browser': self.id}
+
+    def close(self):
+        self.closed = True
+
+@pytest.fixture
+def fake_crawler(monkeypatch):
+    monkeypatch.setattr(driver_pool, 'InstagramCrawler', FakeCrawler)
+    monkeypatch.setattr(driver_pool, 'ACQUIRE_POLL', 0.01)
+    monkeypatch.setattr(FakeCrawler, 'fail_launches', False)
+    return FakeCrawler
+
+def test_worn_out_browser_is_recycled(fake_crawler):
+    with DriverPool(size=1, max_pages=3, max_rss_mb=0) as pool:
+        first = pool.crawl_profile('alice')['browser']
+        # The warm-up visit and two profiles reach max_pages
+        assert pool.crawl_profile('bob')['browser'] == first
+        assert pool.crawl_profile('carol')['browser'] != first
+        assert pool.recycled == 1
+        assert len(pool.crawlers) == 1
+
+def test_start_raises_when_no_browser_launches(fake_crawler):
+    fake_crawler.fail_launches = True
+    pool = DriverPool(size=2, max_rss_mb=0)
+    with pytest.raises(RuntimeError):
+        pool.start()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+def test_failed_relaunch_does_not_block_acquire(fake_crawler):
+    with DriverPool(size=1, max_pages=2, max_rss_mb=0) as pool:
+        crawler = pool.acquire()
+        fake_crawler.fail_launches = True
+        crawler.pages_loaded = 2
+        pool.release(crawler)
+        assert crawler.closed
+        with pytest.raises(RuntimeError):
+            pool.acquire()
@@ -0,0 +1,81 @@
+# test_fixture_server.py
+"""Tests for the canned pages, login flow and record/replay of the fixture server"""
+
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from fixture_server import FOLLOW_PAGE_SIZE, POST_PAGE_SIZE, FixtureServer
+from insta_crawler.profile_parser import parse_posts_json
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args):
+        return None
+
+def request(url, form=None):
+    """Return (status, headers, body) without following redirects"""
+    data = urllib.parse.urlencode(form).encode() if form is not None else None
+    opener = urllib.request.build_opener(NoRedirect)
+    try:
+        with opener.open(url, data) as response:
+            return response.status, response.headers, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read().decode()
+
+def test_login_challenge_and_prompts():
+    with FixtureServer(challenge_users={'fixture_user'}) as server:
+        status, _, body = request(f"{server.url}/accounts/login/",
+                                  {'username': 'fixture_user', 'password': 'wrong'})
+        assert status == 200 and 'login-error-message' in body
+
+        status, headers, _ = request(f"{server.url}/accounts/login/",
+                                     {'username': 'fixture_user', 'password': 'fixture_pass'})
+        assert status == 302 and headers['Location'] == "/challenge/"
+        assert headers['Set-Cookie'].startswith("sessionid=")
+
+        status, headers, _ = request(f"{server.url}/challenge/", {'verificationCode': '123456'})
+        assert headers['Location'] == "/accounts/onetap/"
+        assert 'Not Now' in request(f"{server.url}/accounts/onetap/")[2]
+        assert 'Turn on Notifications' in request(f"{server.url}/?prompt=notifications")[2]
+
+def test_follow_dialog_pages_and_not_found():
+    with FixtureServer(follow_count=30, missing={'ghost'}) as server:
+        assert "role=\"dialog\"" in request(f"{server.url}/alice/followers/")[2]
+
+        first = json.loads(request(f"{server.url}/api/v1/friendships/alice/followers/?max_id=0")[2])
+        last = json.loads(request(f"{server.url}/api/v1/friendships/alice/followers/?max_id=24")[2])
+        assert len(first['users']) == FOLLOW_PAGE_SIZE and first['next_max_id'] == '24'
+        assert [user['username'] for user in last['users']][-1] == "alice_followers_29"
+        assert last['next_max_id'] is None
+
+        assert request(f"{server.url}/ghost/")[0] == 404
+
+def test_post_grid_feed_pages():
+    with FixtureServer(post_count=20, pinned_posts=2) as server:
+        assert 'class="post-grid" data-username="alice" data-total="20"' in request(f"{server.url}/alice/")[2]
+
+        first = json.loads(request(f"{server.url}/api/v1/feed/user/alice/?max_id=0")[2])
+        last = json.loads(request(f"{server.url}/api/v1/feed/user/alice/?max_id=12")[2])
+        assert len(first['items']) == POST_PAGE_SIZE and first['next_max_id'] == '12'
+        assert not last['more_available'] and len(last['items']) == 8
+
+        posts = parse_posts_json(first) + parse_posts_json(last)
+        assert [post['shortcode'] for post in posts[:3]] == ['alice_pin_0', 'alice_pin_1', 'alice_0']
+        # Pinned posts are older than the newest ones below them
+        assert posts[0]['taken_at'] < posts[2]['taken_at'] > posts[3]['taken_at']
+
+def test_record_then_replay(tmp_path):
+    cassette = str(tmp_path / "cassette")
+    with FixtureServer(profiles={'alice': {'username': 'alice', 'full_name': 'Recorded Alice',
+                                           'posts': '1', 'followers': '2', 'following': '3',
+                                           'bio': 'live'}}) as upstream:
+        with FixtureServer(cassette=cassette, record_from=upstream.url) as recorder:
+            recorded = request(f"{recorder.url}/alice/")
+        assert 'Recorded Alice' in recorded[2]
+
+    # Upstream is gone: the recording is served, other paths fall back to canned pages
+    with FixtureServer(cassette=cassette) as replay:
+        status, _, body = request(f"{replay.url}/alice/")
+        assert status == 200 and body == recorded[2]
+        assert 'Recorded Alice' not in request(f"{replay.url}/bob/")[2]
@@ -0,0 +1,37 @@
+# test_http_fetcher.py
+"""Tests for the HTTP fast path against the fixture server"""
+
+from insta_crawler.defaults import MissingProfile
+from fixture_server import FixtureServer
+from insta_crawler.http_fetcher import ProfileFetcher
+
+class FakeCrawler:
+    def __init__(self):
+        self.crawled = []
+
+    def crawl_profile(self, username):
+        self.crawled.append(username)
+        return {'username': username, 'followers': '1'}
+
+def test_missing_profile_does_not_start_the_browser():
+    with FixtureServer(missing={'ghost'}) as server, ProfileFetcher(base_url=server.url) as fetcher:
+        assert fetcher.get_profile_info('alice')['username'] == 'alice'
+        profile_info = fetcher.get_profile_info('ghost')
+        assert isinstance(profile_info, MissingProfile) and not profile_info
+        assert fetcher.crawler is None
+
+def test_browser_fallback_only_for_unparsed_pages(monkeypatch):
+    fetcher = ProfileFetcher(base_url="http://fixture.invalid")
+    fetcher.crawler = FakeCrawler()
+    monkeypatch.setattr(fetcher, 'fetch_api', lambda username: None)
+
+    # Page loaded but could not be parsed (e.g. a login wall)
+    monkeypatch.setattr(fetcher, 'fetch_page', lambda username: {})
+    assert fetcher.get_profile_info('alice') == {'username': 'alice', 'followers': '1'}
+
+    # No request got through: nothing is learnt by launching a browser
+    monkeypatch.setattr(fetcher, 'fetch_page', lambda username: None)
+    assert fetcher.get_profile_info('bob') == {}
+    assert fetcher.crawler.crawled == ['alice']
+    fetcher.crawler = None
+    fetcher.close()
@@ -0,0 +1,93 @@
+# test_login_utils.py
+"""Tests for the encrypted session store and session restore"""
+
+import threading
+
+import pytest
+
+from insta_crawler.login_utils import (IS_STALE_DOCUMENT_SCRIPT, STALE_DOCUMENT_SCRIPT, SecureCredentials,
+                         SessionStore, load_document)
+
+class FakeDriver:
+    """Just enough of a WebDriver to save a session"""
+
+    def __init__(self, username):
+        self.username = username
+
+    def get_cookies(self):
+        return [{'name': 'sessionid', 'value': self.username}]
+
+    def execute_script(self, script):
+        return {}
+
+class NoWaitDriver:
+    """A driver under page_load_strategy 'none': get() returns before the new document commits"""
+
+    def __init__(self, commit_after=3):
+        self.commit_after = commit_after
+        self.document = {'url': "about:blank"}
+        self.pending = None
+        self.cookies = []
+
+    def get(self, url):
+        self.pending, self.polls = url, 0
+
+    def execute_script(self, script, *args):
+        if self.pending:
+            self.polls += 1
+            if self.polls > self.commit_after:
+                self.document, self.pending = {'url': self.pending}, None
+        if script == STALE_DOCUMENT_SCRIPT:
+            self.document['stale'] = True
+        elif script == IS_STALE_DOCUMENT_SCRIPT:
+            return self.document.get('stale', False)
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def add_cookie(self, cookie):
+        if not self.document['url'].startswith("https://www.instagram.com"):
+            raise ValueError("invalid cookie domain")
+        self.cookies.append(cookie)
+
+def test_concurrent_saves_from_threads(tmp_path):
+    """Pool workers are threads of one process; their saves must not clash"""
+    credentials = SecureCredentials(str(tmp_path / "credentials.enc"))
+    credentials.key_file = str(tmp_path / "key.key")
+    credentials.generate_key()
+    store = SessionStore(str(tmp_path / "session.enc"), credentials)
+
+    results = []
+    barrier = threading.Barrier(8)
+
+    def save(index):
+        for _ in range(20):
+            barrier.wait()
+            results.append(store.save_session(FakeDriver(f"user_{index}"), f"user_{index}"))
+
+    threads = [threading.Thread(target=save, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 160
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['key.key', 'session.enc']
+    saved = [store.load_session(f"user_{index}") for index in range(8)]
+    assert sum(session is not None for session in saved) == 1
+
+def test_restore_waits_for_the_new_document(tmp_path):
+    credentials = SecureCredentials(str(tmp_path / "credentials.enc"))
+    credentials.key_file = str(tmp_path / "key.key")
+    credentials.generate_key()
+    store = SessionStore(str(tmp_path / "session.enc"), credentials)
+    assert store.save_session(FakeDriver("alice"), "alice")
+
+    driver = NoWaitDriver()
+    assert store.restore_session(driver, "https://www.instagram.com", "alice", timeout=1)
+    assert driver.cookies == [{'name': 'sessionid', 'value': 'alice'}]
+
+def test_load_document_times_out_when_nothing_commits():
+    driver = NoWaitDriver(commit_after=10 ** 6)
+    with pytest.raises(TimeoutError):
+        load_document(driver, "https://www.instagram.com", timeout=0.1, poll_interval=0.01)
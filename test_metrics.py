@@ -0,0 +1,70 @@
+# test_metrics.py
+"""Tests for phase timing spans and metrics export"""
+
+import io
+import json
+import logging
+
+import pytest
+
+from insta_crawler.metrics import FAILURE, SUCCESS, TIMEOUT, Metrics, configure_logging
+
+class TimeoutException(Exception):
+    pass
+
+def test_spans_count_outcomes():
+    """Exceptions, falsy results and set_outcome all show up in the counters"""
+    metrics = Metrics()
+
+    @metrics.timed('search')
+    def search(found):
+        return found
+
+    @metrics.timed('search')
+    def search_timing_out():
+        metrics.set_outcome(TIMEOUT)
+        return False
+
+    search(True)
+    search(False)
+    search_timing_out()
+    with pytest.raises(TimeoutException):
+        with metrics.span('page_load'):
+            raise TimeoutException()
+
+    summary = metrics.summary()
+    assert summary['counters'] == {
+        'search': {SUCCESS: 1, FAILURE: 1, TIMEOUT: 1},
+        'page_load': {TIMEOUT: 1},
+    }
+    assert summary['phases']['search']['count'] == 3
+
+def test_percentiles_and_prometheus_export():
+    metrics = Metrics()
+    for value in range(1, 101):
+        metrics.observe('extract_profile', value / 100)
+    metrics.increment('extract_profile')
+    metrics.set_gauge('recrawl_expected_freshness', 0.75)
+
+    stats = metrics.summary()['phases']['extract_profile']
+    assert stats['p50'] == pytest.approx(0.51)
+    assert stats['p99'] == pytest.approx(1.0)
+
+    text = metrics.to_prometheus()
+    assert 'insta_crawler_phase_duration_seconds{phase="extract_profile",quantile="0.95"} 0.960000' in text
+    assert 'insta_crawler_phase_duration_seconds_count{phase="extract_profile"} 100' in text
+    assert 'insta_crawler_phase_total{phase="extract_profile",outcome="success"} 1' in text
+    assert 'insta_crawler_recrawl_expected_freshness 0.75' in text
+
+def test_json_log_lines_carry_extra_fields():
+    stream = io.StringIO()
+    configure_logging(0, json_lines=True, stream=stream)
+    try:
+        logging.getLogger('crawler').info("Saved profile", extra={'username': 'alice'})
+    finally:
+        logging.getLogger().handlers.clear()
+
+    entry = json.loads(stream.getvalue())
+    assert entry['message'] == "Saved profile"
+    assert entry['username'] == 'alice'
+    assert entry['level'] == 'INFO'
@@ -0,0 +1,66 @@
+# test_profile_cache.py
+"""Tests for the profile lookup cache"""
+
+import time
+
+from insta_crawler.profile_cache import ProfileCache, SqliteCacheStore
+
+class CountingLookup:
+    """Fake profile lookup that counts how often it is called"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, username):
+        self.calls.append(username)
+        return {'username': username, 'followers': str(len(self.calls))}
+
+def test_ttl_and_lru_eviction(clock):
+    """Fresh entries are hits, expired ones are re-fetched, and the LRU stays bounded"""
+    lookup = CountingLookup()
+    cache = ProfileCache(lookup, max_entries=2, ttl=10, clock=clock)
+
+    cache.get('a')
+    cache.get('a')
+    assert lookup.calls == ['a']
+
+    cache.get('b', ttl=100)
+    cache.get('c')
+    assert 'a' not in cache.entries
+
+    clock.sleep(50)
+    cache.get('b')
+    cache.get('c')
+    assert lookup.calls == ['a', 'b', 'c', 'c']
+
+    stats = cache.stats_summary()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (2, 4, 1)
+
+def test_disk_store_survives_new_cache(tmp_path):
+    """A second cache over the same store is served from disk"""
+    path = str(tmp_path / 'cache.db')
+    lookup = CountingLookup()
+
+    store = SqliteCacheStore(path)
+    ProfileCache(lookup, store=store).get('natgeo')
+    store.close()
+
+    store = SqliteCacheStore(path)
+    assert ProfileCache(lookup, store=store).get('natgeo')['username'] == 'natgeo'
+    store.close()
+    assert lookup.calls == ['natgeo']
+
+def test_stale_while_revalidate(clock):
+    """An expired entry is served immediately and refreshed in the background"""
+    lookup = CountingLookup()
+    cache = ProfileCache(lookup, ttl=10, stale_while_revalidate=True, clock=clock)
+
+    assert cache.get('a')['followers'] == '1'
+    clock.sleep(15)
+    assert cache.get('a')['followers'] == '1'
+
+    deadline = time.time() + 5
+    while cache.stats_summary()['refreshes'] == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert cache.get('a')['followers'] == '2'
+    assert cache.stats_summary()['stale_hits'] == 1
@@ -0,0 +1,107 @@
+# test_profile_parser.py
+"""Tests for browser-free profile parsing"""
+
+import json
+
+from fixture_server import PROFILE_PAGE, SEARCH_BOX, make_profile
+from insta_crawler.profile_parser import (parse_dom, parse_posts_json, parse_profile_html, parse_profile_json,
+                            parse_profile_meta, parse_profile_page, parse_snapshot_dir, select)
+
+PROFILE_JSON = {'data': {'user': {
+    'username': 'natgeo',
+    'biography': 'Experience the world',
+    'edge_owner_to_timeline_media': {'count': 30000},
+    'edge_followed_by': {'count': 280000000},
+    'edge_follow': {'count': 150},
+}}}
+
+META_PAGE = """<html><head>
+<meta property="og:description" content="280M Followers, 150 Following, 30K Posts - See Instagram photos and videos from National Geographic (@natgeo)">
+<meta name="description" content="280M Followers, 150 Following, 30K Posts - National Geographic (@natgeo) on Instagram: &quot;Experience the world&quot;">
+</head><body></body></html>"""
+
+def test_parse_profile_json():
+    """web_profile_info payloads map onto the get_profile_info fields"""
+    assert parse_profile_json(PROFILE_JSON) == {
+        'username': 'natgeo',
+        'posts': '30000',
+        'followers': '280000000',
+        'following': '150',
+        'bio': 'Experience the world',
+        'full_name': '',
+        'verified': False,
+        'external_link': '',
+        'profile_pic_url': '',
+    }
+    assert parse_profile_json({'data': {}}) is None
+
+def test_parse_profile_meta():
+    """Meta description counts and bio are parsed from the page head"""
+    assert parse_profile_meta(META_PAGE) == {
+        'username': 'natgeo',
+        'posts': '30K',
+        'followers': '280M',
+        'following': '150',
+        'bio': 'Experience the world',
+    }
+    assert parse_profile_meta("<html></html>") is None
+
+def test_parse_profile_html_prefers_embedded_json():
+    """Embedded JSON wins over meta tags when both are present"""
+    page = META_PAGE.replace(
+        "</body>",
+        f'<script type="application/json">{json.dumps(PROFILE_JSON)}</script></body>')
+    assert parse_profile_html(page)['followers'] == '280000000'
+    assert parse_profile_html(META_PAGE)['followers'] == '280M'
+
+def test_select_supports_crawler_selectors():
+    """Descendant, child, class and attribute selectors match like the browser"""
+    root = parse_dom(
+        '<header><div class="_aa_c x"><span>bio</span></div>'
+        '<a rel="me nofollow" href="/out"><span>1</span></a>'
+        '<ul><li>one<li>two</ul><svg aria-label="Verified"/></header>')
+    assert [node.text() for node in select(root, "div._aa_c span")] == ['bio']
+    assert [node.text() for node in select(root, "a span")] == ['1']
+    assert select(root, "header a[rel*='nofollow']")[0].attrs['href'] == '/out'
+    assert len(select(root, "header svg[aria-label='Verified']")) == 1
+    assert [node.text() for node in select(root, "ul > li")] == ['one', 'two']
+    assert select(root, "div > span, li")[0].text() == 'bio'
+
+def test_parse_profile_page_matches_fixture():
+    """The offline parser reads the same fields the crawler reads from the fixture page"""
+    page = PROFILE_PAGE.format(search_box=SEARCH_BOX, **make_profile('fixture_user'))
+    profile_info = parse_profile_page(page)
+    assert profile_info['username'] == 'fixture_user'
+    assert profile_info['followers'] == make_profile('fixture_user')['followers']
+    assert profile_info['bio'] == 'Fixture bio for fixture_user'
+    assert profile_info['verified'] is False
+    assert parse_profile_page("<html><body></body></html>")['username'] == "Not found"
+
+def test_parse_snapshot_dir(tmp_path):
+    """Snapshots in a directory are parsed in sorted path order"""
+    for username in ('bob', 'alice'):
+        page = PROFILE_PAGE.format(search_box=SEARCH_BOX, **make_profile(username))
+        (tmp_path / f"{username}.html").write_text(page, encoding='utf-8')
+
+    results = list(parse_snapshot_dir(str(tmp_path), workers=1))
+    assert [profile_info['username'] for _, profile_info in results] == ['alice', 'bob']
+    assert list(parse_snapshot_dir(str(tmp_path), workers=2)) == results
+
+def test_parse_posts_json():
+    """GraphQL timeline nodes and v1 feed items both become post records"""
+    graphql = {'data': {'user': {'edge_owner_to_timeline_media': {'edges': [{'node': {
+        'shortcode': 'ABC123',
+        'taken_at_timestamp': 1700000000,
+        'edge_liked_by': {'count': 10},
+        'edge_media_to_comment': {'count': 2},
+        'edge_media_to_caption': {'edges': [{'node': {'text': 'hello'}}]},
+    }}]}}}}
+    feed = {'items': [{'code': 'XYZ', 'taken_at': 1700000000, 'like_count': 5,
+                       'comment_count': 1, 'caption': {'text': 'reel'}, 'product_type': 'clips'}]}
+
+    post, = parse_posts_json(graphql)
+    assert (post['shortcode'], post['likes'], post['comments'], post['caption']) == ('ABC123', 10, 2, 'hello')
+    assert post['taken_at'] == '2023-11-14T22:13:20+00:00'
+
+    reel, = parse_posts_json(json.dumps(feed))
+    assert (reel['type'], reel['likes'], reel['url']) == ('reel', 5, 'https://www.instagram.com/reel/XYZ/')
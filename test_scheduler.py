@@ -0,0 +1,77 @@
+# test_scheduler.py
+"""Tests for the adaptive re-crawl scheduler"""
+
+import pytest
+
+from insta_crawler.scheduler import CHANGED, DAY, FIRST_VISIT, HOUR, UNCHANGED, RecrawlScheduler
+
+def test_visits_follow_change_rate_at_a_fraction_of_fixed_cadence(clock):
+    """Hot profiles are revisited every few hours, cold ones drift towards the max interval"""
+    start = clock.now
+    hot = ['hot_0', 'hot_1']
+    cold = [f"cold_{index}" for index in range(18)]
+    visits = {username: 0 for username in hot + cold}
+
+    def crawl_profiles(usernames):
+        for username in usernames:
+            visits[username] += 1
+            # Hot profiles gain a post every three hours
+            posts = int((clock.now - start) // (3 * HOUR)) if username in hot else 7
+            yield username, {'username': username, 'posts': str(posts)}
+
+    scheduler = RecrawlScheduler(budget_per_hour=100, clock=clock.time, sleep=clock.sleep)
+    scheduler.add(hot + cold)
+    hours = 7 * 24
+    for _ in range(hours):
+        list(scheduler.crawl(crawl_profiles))
+        clock.sleep(HOUR)
+
+    # An hourly fixed cadence would have loaded every profile every hour
+    assert sum(visits.values()) < 0.1 * hours * len(visits)
+    assert min(visits[username] for username in hot) >= 30
+    assert max(visits[username] for username in cold) <= 5
+    # By the end a hot profile is revisited within its change period
+    assert scheduler.profiles['hot_0']['next_visit_at'] - clock.now <= 3 * HOUR
+    assert scheduler.change_rate('hot_0') > 20 * scheduler.change_rate('cold_0')
+
+    summary = scheduler.stats_summary()
+    assert summary[FIRST_VISIT] == 20
+    assert summary['change_yield'] > 0.2
+    assert 0 < summary['expected_freshness'] <= 1
+
+def test_budget_goes_to_profiles_most_likely_changed(clock):
+    scheduler = RecrawlScheduler(budget_per_hour=3, clock=clock.time, sleep=clock.sleep)
+    scheduler.add(['a', 'b', 'c', 'd'])
+    assert scheduler.due() == ['a', 'b', 'c']
+    for username in ('a', 'b', 'c'):
+        assert scheduler.record(username, {'posts': '1'}) == FIRST_VISIT
+    assert scheduler.due() == []
+
+    # Never visited goes first; 'c' is deferred and gets the next token
+    clock.sleep(DAY)
+    assert scheduler.due() == ['d', 'a', 'b']
+    scheduler.record('d', {'posts': '1'})
+    assert scheduler.record('a', {'posts': '2'}) == CHANGED
+    assert scheduler.record('b', {'posts': '1'}) == UNCHANGED
+    assert scheduler.change_probability('a') == 0.0
+    assert scheduler.next_wake_at() == clock.now + 20 * 60
+
+    # A day on, 'a' (changed last time) comes before 'd' (no history) and 'b' is not due
+    clock.sleep(DAY)
+    assert scheduler.due() == ['c', 'a', 'd']
+
+    with pytest.raises(ValueError):
+        RecrawlScheduler(budget_per_hour=0)
+
+def test_schedule_survives_restart(tmp_path, clock):
+    path = str(tmp_path / "schedule.db")
+    with RecrawlScheduler(path, clock=clock.time) as scheduler:
+        scheduler.add(['@alice'])
+        scheduler.record('alice', {'posts': '1'})
+        next_visit_at = scheduler.profiles['alice']['next_visit_at']
+
+    with RecrawlScheduler(path, clock=clock.time) as scheduler:
+        assert scheduler.profiles['alice']['next_visit_at'] == next_visit_at
+        assert scheduler.due() == []
+        clock.sleep(next_visit_at - clock.now)
+        assert scheduler.due() == ['alice']
@@ -0,0 +1,57 @@
+# test_selector_registry.py
+"""Tests for demoting fallback selectors that stopped matching"""
+
+from insta_crawler.profile_parser import PROFILE_FIELDS, extract_fields, parse_dom
+from insta_crawler.selector_registry import SelectorRegistry
+
+CANDIDATES = ["header h2", "h2"]
+FULL_NAME = ["header h1", "header section span[dir='auto']"]
+
+def lookup(registry, field, candidates, matches):
+    """Record one lookup the way the crawler does; matches is what the page has"""
+    ordered = registry.order(field, candidates)
+    matched = next((selector for selector in ordered if selector in matches), None)
+    registry.record(field, ordered, matched)
+    return matched
+
+def test_one_profile_without_the_element_keeps_the_declared_order():
+    registry = SelectorRegistry()
+    # No <h1> on this profile: the loose fallback answers once
+    assert lookup(registry, 'full_name', FULL_NAME, FULL_NAME[1:]) == FULL_NAME[1]
+    for _ in range(20):
+        assert lookup(registry, 'full_name', FULL_NAME, FULL_NAME) == FULL_NAME[0]
+
+def test_fallback_moves_to_front_after_misses_and_back_on_recheck():
+    registry = SelectorRegistry(max_misses=3, recheck_every=5)
+    # Markup changed: the first candidate keeps missing, the fallback hits
+    for _ in range(3):
+        assert lookup(registry, 'username', CANDIDATES, ["h2"]) == "h2"
+    assert registry.order('username', CANDIDATES) == ["h2", "header h2"]
+    assert registry.stats_summary()['username']["header h2"]['streak'] == 3
+
+    # The declared order comes back for the recheck lookup, and the old
+    # selector hitting again puts it back in front
+    assert lookup(registry, 'username', CANDIDATES, CANDIDATES) == "header h2"
+    assert registry.order('username', CANDIDATES) == CANDIDATES
+    stats = registry.stats_summary()['username']
+    assert (stats["header h2"]['hits'], stats["header h2"]['misses'], stats["header h2"]['streak']) == (1, 3, 0)
+    assert (stats["h2"]['hits'], stats["h2"]['hit_rate']) == (3, 1.0)
+
+def test_state_survives_save_and_load(tmp_path):
+    registry = SelectorRegistry(max_misses=1)
+    registry.record('bio', ["div._aa_c span", "span"], "span")
+    path = str(tmp_path / "selectors.json")
+    registry.save(path)
+
+    restored = SelectorRegistry(max_misses=1)
+    assert restored.load(path)
+    assert restored.stats_summary() == registry.stats_summary()
+    assert restored.order('bio', ["div._aa_c span", "span"]) == ["span", "div._aa_c span"]
+    assert not SelectorRegistry().load(str(tmp_path / "missing.json"))
+
+def test_ordered_spec_extracts_the_same_fields():
+    html = "<header><h2>alice</h2><ul><li><span>1</span></li></ul></header>"
+    registry = SelectorRegistry(max_misses=1)
+    registry.record('username', CANDIDATES, None)
+    spec = registry.order_fields(PROFILE_FIELDS)
+    assert extract_fields(parse_dom(html), spec)['username'] == "alice"
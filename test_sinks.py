@@ -0,0 +1,73 @@
+# test_sinks.py
+"""Tests for structured result sinks"""
+
+import csv
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from insta_crawler.sinks import make_record, normalize_count, open_sink
+
+PROFILE_INFO = {
+    'username': 'natgeo',
+    'posts': '30K',
+    'followers': '1.2M',
+    'following': '1,234',
+    'bio': 'Experience the world',
+    'verified': True,
+    'external_link': "Not found",
+}
+
+CRAWLED_AT = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+def test_normalize_count():
+    """Displayed counts become integers; anything else becomes None"""
+    assert normalize_count("1.2M") == 1200000
+    assert normalize_count("61,510") == 61510
+    assert normalize_count("10K") == 10000
+    assert normalize_count("1,5k") == 1500
+    assert normalize_count("2B") == 2000000000
+    assert normalize_count(42) == 42
+    assert normalize_count("Not found") is None
+
+def test_make_record():
+    """Records carry the source username, crawl time and normalised fields"""
+    record = make_record('natgeo', PROFILE_INFO, crawled_at=CRAWLED_AT)
+    assert record['source_username'] == 'natgeo'
+    assert record['crawled_at'] == '2025-01-02T03:04:05+00:00'
+    assert record['followers'] == 1200000
+    assert record['following'] == 1234
+    assert record['external_link'] is None
+
+def test_sinks_round_trip(tmp_path):
+    """Every format writes the records it was given, in batches"""
+    record = make_record('natgeo', PROFILE_INFO, crawled_at=CRAWLED_AT)
+
+    for name in ('out.jsonl', 'out.csv', 'out.db'):
+        with open_sink(str(tmp_path / name), batch_size=2) as sink:
+            for _ in range(3):
+                sink.write(record)
+            assert sink.written == 2
+
+    lines = (tmp_path / 'out.jsonl').read_text(encoding='utf-8').splitlines()
+    assert [json.loads(line)['followers'] for line in lines] == [1200000] * 3
+
+    with open(tmp_path / 'out.csv', newline='', encoding='utf-8') as file:
+        rows = list(csv.DictReader(file))
+    assert [row['posts'] for row in rows] == ['30000'] * 3
+
+    connection = sqlite3.connect(str(tmp_path / 'out.db'))
+    rows = connection.execute("SELECT source_username, followers, verified FROM profiles").fetchall()
+    connection.close()
+    assert rows == [('natgeo', 1200000, 1)] * 3
+
+def test_slow_writes_reach_disk_within_the_sync_interval(tmp_path):
+    """A partial batch is written once sync_interval has passed, not only when full"""
+    path = tmp_path / 'out.jsonl'
+    with open_sink(str(path), batch_size=100, sync_interval=0.1) as sink:
+        sink.write(make_record('a', PROFILE_INFO, CRAWLED_AT))
+        assert path.read_text() == ''
+        time.sleep(0.15)
+        sink.write(make_record('b', PROFILE_INFO, CRAWLED_AT))
+        assert [json.loads(line)['source_username'] for line in path.read_text().splitlines()] == ['a', 'b']